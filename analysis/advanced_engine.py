@@ -3,7 +3,7 @@ import math
 import random
 from collections import Counter
 from django.db.models import Q, Sum, Avg
-from data_manager.models import Standing, Fixture, Player, BilyonerBulletin
+from data_manager.models import Standing, Fixture, Player, BilyonerBulletin, NEWEST_FIRST
 
 class AdvancedMatchAnalyzer:
     """
@@ -18,17 +18,23 @@ class AdvancedMatchAnalyzer:
         self.away_team = match.away_team
         
         # Data Containers
-        self.home_data = self._gather_team_full_data(self.home_team)
-        self.away_data = self._gather_team_full_data(self.away_team)
+        self.home_data = self._gather_team_full_data(self.home_team, match.home_team_ref_id)
+        self.away_data = self._gather_team_full_data(self.away_team, match.away_team_ref_id)
         
         # Results
         self.simulation_results = self._run_monte_carlo_simulation()
 
-    def _gather_team_full_data(self, team_name):
+    def _gather_team_full_data(self, team_name, team_id=None):
         """
         Aggregates data from Standings, Fixtures, and Players.
-        Uses robust name matching.
+        Uses the Team FKs when the bulletin row is linked, robust name matching otherwise.
         """
+        if team_id:
+            standing = Standing.objects.filter(team_ref_id=team_id).first()
+            recent_fixtures = Fixture.objects.last_results(team_id, 6)
+            players = Player.objects.filter(team_ref_id=team_id).order_by('-starts')[:15]
+            return self._team_data(team_name, team_id, standing, recent_fixtures, players)
+
         # 1. Standing (Base Strength) & Name Cleaning
         standing = None
         all_teams_in_db = Standing.objects.filter(country=self.country).values_list('team', flat=True)
@@ -55,12 +61,14 @@ class AdvancedMatchAnalyzer:
         # Use Clean Name
         recent_fixtures = Fixture.objects.filter(
             Q(country=self.country) & (Q(home_team__icontains=clean_team_name) | Q(away_team__icontains=clean_team_name))
-        ).order_by('-id')[:6]
+        ).filter(played=True).order_by(*NEWEST_FIRST)[:6]
         
         # 3. Player Power (Top 15 players by starts)
         # Use Clean Name
         players = Player.objects.filter(country=self.country, team_name__icontains=clean_team_name).order_by('-starts')[:15]
-        
+        return self._team_data(team_name, None, standing, recent_fixtures, players)
+
+    def _team_data(self, team_name, team_id, standing, recent_fixtures, players):
         team_goals_from_players = 0
         squad_experience = 0
         if players:
@@ -69,6 +77,7 @@ class AdvancedMatchAnalyzer:
             
         return {
             "name": team_name,
+            "team_id": team_id,
             "standing": standing,
             "fixtures": recent_fixtures,
             "players": players,
@@ -98,17 +107,19 @@ class AdvancedMatchAnalyzer:
         a_def_base = a_st.goals_against / max(1, a_st.played)
         
         # B. Form Weighting (Last 3 games matter 2x more)
-        def calc_form_score(fixtures, team_name):
+        def calc_form_score(fixtures, team_name, team_id=None):
             score = 0
             total_w = 0
             for i, f in enumerate(fixtures):
                 weight = 1.0 + (0.1 * (6-i)) # Older games have less weight? No, 6-i means recent (index 0) is 6.
-                is_home = team_name.lower() in f.home_team.lower()
+                if team_id:
+                    is_home = f.home_team_ref_id == team_id
+                else:
+                    is_home = team_name.lower() in f.home_team.lower()
                 
-                # Parse Score "2-1"
+                # Goals are parsed at ingest (data_manager.fixtures)
                 try:
-                    parts = f.score.split('-')
-                    h_s, a_s = int(parts[0]), int(parts[1])
+                    h_s, a_s = int(f.home_goals), int(f.away_goals)
                     if is_home:
                         g_for, g_against = h_s, a_s
                     else:
@@ -126,8 +137,8 @@ class AdvancedMatchAnalyzer:
                     pass
             return score / max(1, total_w)
 
-        h_form = calc_form_score(h_stats['fixtures'], self.home_team)
-        a_form = calc_form_score(a_stats['fixtures'], self.away_team)
+        h_form = calc_form_score(h_stats['fixtures'], self.home_team, h_stats['team_id'])
+        a_form = calc_form_score(a_stats['fixtures'], self.away_team, a_stats['team_id'])
         
         # C. Squad Value / Player Metric Adjustment
         # If one team has significantly more player goals/experience, boost them
@@ -0,0 +1,128 @@
+"""
+Batch analysis of many bulletin rows.
+
+MatchAnalyzer looks every team up on its own (team list, standing, last five
+results), which is ~6 queries per match. LeagueIndex loads the standings and
+the played fixtures the whole batch needs up front and answers the same
+lookups from memory; MatchAnalyzer(match, league_index) then computes exactly
+what MatchAnalyzer(match) would. The per-match icontains lookups (standing
+fallback, recent results by name) are answered in Python over the same rows,
+with the database's case rules (icontains_matcher), so the query count does not
+grow with the number of matches.
+"""
+from collections import defaultdict
+from django.db import connections, router
+from django.db.models import Q
+
+from data_manager.models import Standing, Fixture, NEWEST_FIRST
+from .engine import MatchAnalyzer, resolve_standing_name
+
+RECENT_MATCHES = 5
+
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def icontains_matcher(vendor):
+    """
+    field__icontains=name evaluated in Python with the database's case rules, so preloaded
+    rows match exactly what the per-match queries match: SQLite's LIKE folds ASCII letters
+    only ('BEŞİKTAŞ' does not contain 'beşiktaş'); PostgreSQL compares UPPER() of both sides.
+    """
+    if vendor == 'sqlite':
+        fold = lambda text: text.translate(_ASCII_LOWER)
+    else:
+        fold = str.upper
+
+    def icontains(value, name):
+        return fold(name) in fold(value or "")
+    return icontains
+
+
+class LeagueIndex:
+    """
+    Standings and recent results of every team of `matches`, loaded with a fixed number of queries.
+    """
+    def __init__(self, matches):
+        matches = list(matches)
+        icontains = icontains_matcher(connections[router.db_for_read(Standing)].vendor)
+        countries = {m.country for m in matches}
+        team_ids = {team_id for m in matches for team_id in (m.home_team_ref_id, m.away_team_ref_id) if team_id}
+        names = {(m.country, name) for m in matches
+                 for name, team_id in ((m.home_team, m.home_team_ref_id), (m.away_team, m.away_team_ref_id)) if not team_id}
+
+        # Standings: teams of the countries (name matching) and the linked teams (any country)
+        self.teams = defaultdict(list)           # country -> team names, in Standing order
+        self.standings = defaultdict(list)       # country -> Standing rows, in Standing order
+        self.standing_by_name = {}               # (country, team) -> Standing
+        self.standing_by_ref = {}                # team_ref_id -> first Standing
+        standing_filter = Q(country__in=countries) | Q(team_ref_id__in=team_ids) if team_ids else Q(country__in=countries)
+        for row in Standing.objects.filter(standing_filter):
+            if row.country in countries:
+                self.teams[row.country].append(row.team)
+                self.standings[row.country].append(row)
+                self.standing_by_name[(row.country, row.team)] = row
+            if row.team_ref_id in team_ids:
+                self.standing_by_ref.setdefault(row.team_ref_id, row)
+
+        # Name matching: resolved names, or the first 'team icontains name' row as in MatchAnalyzer
+        self.resolved = {}                       # (country, bulletin name) -> (Standing | None, clean name)
+        for country, name in names:
+            best_match = resolve_standing_name(name, self.teams[country])
+            if best_match:
+                self.resolved[(country, name)] = (self.standing_by_name[(country, best_match)], best_match)
+            else:
+                fallback = next((row for row in self.standings[country] if icontains(row.team, name)), None)
+                self.resolved[(country, name)] = (fallback, name)
+
+        # Recent results of linked teams
+        self.recent_by_ref = defaultdict(list)
+        if team_ids:
+            played = Fixture.objects.filter(played=True).filter(Q(home_team_ref_id__in=team_ids) | Q(away_team_ref_id__in=team_ids))
+            for fixture in played.order_by(*NEWEST_FIRST):
+                for team_id in {fixture.home_team_ref_id, fixture.away_team_ref_id} & team_ids:
+                    if len(self.recent_by_ref[team_id]) < RECENT_MATCHES:
+                        self.recent_by_ref[team_id].append(fixture)
+
+        # Recent results of name-matched teams (home/away icontains the clean name):
+        # the played fixtures of their countries, read once
+        self.recent_by_name = defaultdict(list)
+        clean_names = defaultdict(set)
+        for (country, _), (_, clean) in self.resolved.items():
+            clean_names[country].add(clean)
+        if clean_names:
+            played = Fixture.objects.filter(played=True, country__in=list(clean_names))
+            for fixture in played.order_by(*NEWEST_FIRST):
+                for clean in clean_names[fixture.country]:
+                    key = (fixture.country, clean)
+                    if len(self.recent_by_name[key]) < RECENT_MATCHES and (
+                            icontains(fixture.home_team, clean) or icontains(fixture.away_team, clean)):
+                        self.recent_by_name[key].append(fixture)
+
+    def team_stats(self, country, team_name, team_id=None):
+        """
+        Same result as MatchAnalyzer._get_team_stats, from the preloaded data.
+        """
+        if team_id:
+            standing = self.standing_by_ref.get(team_id)
+            return {
+                "standing": standing,
+                "recent_matches": self.recent_by_ref.get(team_id, []),
+                "clean_name": standing.team if standing else team_name,
+                "team_id": team_id
+            }
+        standing, clean_team_name = self.resolved[(country, team_name)]
+        return {
+            "standing": standing,
+            "recent_matches": self.recent_by_name.get((country, clean_team_name), []),
+            "clean_name": clean_team_name
+        }
+
+
+def analyze_matches(matches):
+    """
+    MatchAnalyzer for every row of `matches` (same order), sharing one LeagueIndex.
+    """
+    matches = list(matches)
+    index = LeagueIndex(matches)
+    return [MatchAnalyzer(match, index) for match in matches]
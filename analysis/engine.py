@@ -1,46 +1,73 @@
 from difflib import get_close_matches
-from data_manager.models import Standing, Fixture, Player, CountryChoices, BilyonerBulletin
+from data_manager.models import Standing, Fixture, Player, CountryChoices, BilyonerBulletin, NEWEST_FIRST
 from django.db.models import Q
 
+def resolve_standing_name(team_name, all_teams_in_db):
+    """
+    Uses robust 'Reverse Containment' matching to handle dirty prefixes
+    (e.g., finding 'Bologna' inside 'İtalya Serie A Paz 1 Bologna'), then fuzzy matching.
+    Returns the matching standings team name or None.
+    """
+    best_match = None
+    max_len = 0
+    
+    search_name = team_name.lower().strip()
+    
+    # 1. Exact/Substring Match
+    for db_team in all_teams_in_db:
+        clean_db = db_team.lower().strip()
+        # Check if DB name is inside the messy Bilyoner name OR vice versa
+        if clean_db in search_name or search_name in clean_db:
+            if len(clean_db) > max_len:
+                max_len = len(clean_db)
+                best_match = db_team
+    
+    # 2. Fuzzy Match if strict failed
+    if not best_match and all_teams_in_db:
+        matches = get_close_matches(team_name, all_teams_in_db, n=1, cutoff=0.6)
+        if matches:
+            best_match = matches[0]
+    return best_match
+
 class MatchAnalyzer:
-    def __init__(self, match: BilyonerBulletin):
+    def __init__(self, match: BilyonerBulletin, league_index=None):
+        """
+        `league_index` (analysis.batch.LeagueIndex) serves the team stats from preloaded data;
+        without it every team is looked up with its own queries.
+        """
         self.match = match
-        self.home_stats = self._get_team_stats(match.country, match.home_team)
-        self.away_stats = self._get_team_stats(match.country, match.away_team)
+        get_team_stats = league_index.team_stats if league_index is not None else self._get_team_stats
+        self.home_stats = get_team_stats(match.country, match.home_team, match.home_team_ref_id)
+        self.away_stats = get_team_stats(match.country, match.away_team, match.away_team_ref_id)
         self.prediction = self._calculate_prediction()
 
-    def _get_team_stats(self, country, team_name):
+    def _get_team_stats(self, country, team_name, team_id=None):
         """
         Fetches standings and recent form for a team.
-        Uses robust 'Reverse Containment' matching to handle dirty prefixes 
-        (e.g., finding 'Bologna' inside 'İtalya Serie A Paz 1 Bologna').
+        Bulletin rows linked to a Team (see data_manager.teams) use indexed FK lookups;
+        unlinked rows fall back to name matching.
+        """
+        if team_id:
+            standing = Standing.objects.filter(team_ref_id=team_id).first()
+            recent_fixtures = Fixture.objects.last_results(team_id, 5)
+            return {
+                "standing": standing,
+                "recent_matches": recent_fixtures,
+                "clean_name": standing.team if standing else team_name,
+                "team_id": team_id
+            }
+        return self._get_team_stats_by_name(country, team_name)
+
+    def _get_team_stats_by_name(self, country, team_name):
+        """
+        Name-matched stats for bulletin rows without a team link (see resolve_standing_name).
         """
         # 1. Standings - Robust Match
         standing = None
         
         # Strategy A: Check if any DB team is inside the Bilyoner team string
-        # Fetch all teams for this country to minimize DB hits later? 
         all_teams_in_db = list(Standing.objects.filter(country=country).values_list('team', flat=True))
-        
-        best_match = None
-        max_len = 0
-        
-        search_name = team_name.lower().strip()
-        
-        # 1. Exact/Substring Match
-        for db_team in all_teams_in_db:
-            clean_db = db_team.lower().strip()
-            # Check if DB name is inside the messy Bilyoner name OR vice versa
-            if clean_db in search_name or search_name in clean_db:
-                if len(clean_db) > max_len:
-                    max_len = len(clean_db)
-                    best_match = db_team
-        
-        # 2. Fuzzy Match if strict failed
-        if not best_match and all_teams_in_db:
-            matches = get_close_matches(team_name, all_teams_in_db, n=1, cutoff=0.6)
-            if matches:
-                best_match = matches[0]
+        best_match = resolve_standing_name(team_name, all_teams_in_db)
 
         if best_match:
              standing = Standing.objects.filter(country=country, team=best_match).first()
@@ -55,7 +82,7 @@ class MatchAnalyzer:
         # Use the Cleaned Name if found, otherwise original
         recent_fixtures = Fixture.objects.filter(
             Q(country=country) & (Q(home_team__icontains=clean_team_name) | Q(away_team__icontains=clean_team_name))
-        ).exclude(score__isnull=True).exclude(score='').order_by('-id')[:5]
+        ).filter(played=True).order_by(*NEWEST_FIRST)[:5]
         
         return {
             "standing": standing,
@@ -63,20 +90,22 @@ class MatchAnalyzer:
             "clean_name": clean_team_name
         }
 
-    def _calculate_form_score(self, fixtures, team_name):
+    def _calculate_form_score(self, fixtures, team_name, team_id=None):
         points = 0
         if not fixtures: return 0
         
         for f in fixtures:
             try:
-                # Check if score exists and is valid format "H-A"
-                if not f.score or '-' not in f.score: continue
+                # Goals are parsed at ingest (data_manager.fixtures)
+                if f.home_goals is None or f.away_goals is None: continue
                 
-                parts = f.score.split('-')
-                h_goals = int(parts[0])
-                a_goals = int(parts[1])
+                h_goals = f.home_goals
+                a_goals = f.away_goals
                 
-                is_home = team_name.lower() in f.home_team.lower()
+                if team_id:
+                    is_home = f.home_team_ref_id == team_id
+                else:
+                    is_home = team_name.lower() in f.home_team.lower()
                 
                 if is_home:
                     if h_goals > a_goals: points += 3
@@ -109,8 +138,8 @@ class MatchAnalyzer:
         a_ppm = a_stand.points / max(1, a_stand.played)
         
         # Recent Form Impact (Deep Analysis)
-        h_form = self._calculate_form_score(self.home_stats.get('recent_matches'), self.home_stats.get('clean_name'))
-        a_form = self._calculate_form_score(self.away_stats.get('recent_matches'), self.away_stats.get('clean_name'))
+        h_form = self._calculate_form_score(self.home_stats.get('recent_matches'), self.home_stats.get('clean_name'), self.home_stats.get('team_id'))
+        a_form = self._calculate_form_score(self.away_stats.get('recent_matches'), self.away_stats.get('clean_name'), self.away_stats.get('team_id'))
         
         # Weighted Total Score
         # PPM: 40% importance
@@ -1,3 +1,82 @@
+from datetime import date, timedelta
 from django.test import TestCase
 
-# Create your tests here.
+from data_manager.models import Team, Standing, Fixture, BilyonerBulletin
+from .batch import analyze_matches
+from .engine import MatchAnalyzer
+
+TEAMS = ['Galatasaray', 'Fenerbahçe', 'Beşiktaş', 'Başakşehir', 'Kasımpaşa', 'Göztepe']
+# Only in the fixtures: its bulletin names go through the icontains fallbacks
+PROMOTED = 'Göztepe'
+
+# Bulletin spellings: exact, dirty prefix, Turkish upper/lower case, ASCII-fied, unknown
+VARIANTS = [
+    lambda n: n,
+    lambda n: f"Türkiye Süper Lig {n}",
+    lambda n: n.upper(),
+    lambda n: n.replace('i', 'İ').upper(),  # Turkish upper case: 'BEŞİKTAŞ'
+    lambda n: n.lower(),
+    lambda n: n.replace('ş', 's').replace('ç', 'c').replace('ö', 'o').replace('ı', 'i'),
+    lambda n: n[:4],
+    lambda n: 'Bilinmeyen FK',
+]
+
+
+def snapshot(analyzer):
+    stats = []
+    for side in (analyzer.home_stats, analyzer.away_stats):
+        standing = side['standing']
+        stats.append((standing.pk if standing else None, [f.pk for f in side['recent_matches']],
+                      side['clean_name'], side.get('team_id')))
+    return stats, analyzer.prediction
+
+
+class BatchAnalysisTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teams = {}
+        for rank, name in enumerate(TEAMS, start=1):
+            team = Team.objects.create(country='TURKEY', name=name)
+            teams[name] = team
+            if name == PROMOTED:
+                continue
+            Standing.objects.create(country='TURKEY', team=name, rank=rank, played=4, won=4 - rank % 4,
+                                    drawn=rank % 3, points=3 * (4 - rank % 4) + rank % 3,
+                                    team_ref=team if rank % 2 else None)
+        day = 0
+        for home in TEAMS:
+            for away in TEAMS:
+                if home == away:
+                    continue
+                day += 1
+                played = day % 3 != 0
+                Fixture.objects.create(
+                    country='TURKEY', season='2025/2026', home_team=home, away_team=away,
+                    home_team_ref=teams[home], away_team_ref=teams[away],
+                    played=played, home_goals=day % 4 if played else None, away_goals=day % 3 if played else None,
+                    match_date=date(2025, 8, 1) + timedelta(days=day) if day % 7 else None,
+                )
+        rows = []
+        for i, (home, away) in enumerate((h, a) for h in TEAMS for a in TEAMS if h != a):
+            rows.append(BilyonerBulletin(
+                country='TURKEY', unique_key=f"k{i}", match_time='20:00',
+                home_team=VARIANTS[i % len(VARIANTS)](home), away_team=VARIANTS[(i * 3) % len(VARIANTS)](away),
+                home_team_ref=teams[home] if i % 4 == 0 else None, odds_1=2, odds_x=3, odds_2=4,
+            ))
+        BilyonerBulletin.objects.bulk_create(rows)
+
+    def test_batch_matches_per_match_analysis(self):
+        matches = list(BilyonerBulletin.objects.order_by('id'))
+        names = {m.home_team for m in matches} | {m.away_team for m in matches}
+        self.assertTrue({'BEŞİKTAŞ', 'beşiktaş', 'GÖZTEPE', 'göztepe'} <= names)
+        single = [snapshot(MatchAnalyzer(match)) for match in matches]
+        batch = [snapshot(analyzer) for analyzer in analyze_matches(matches)]
+        for match, expected, got in zip(matches, single, batch):
+            self.assertEqual(got, expected, f"{match.home_team} - {match.away_team}")
+
+    def test_query_count_does_not_depend_on_bulletin_size(self):
+        matches = list(BilyonerBulletin.objects.order_by('id'))
+        with self.assertNumQueries(3):
+            analyze_matches(matches[:5])
+        with self.assertNumQueries(3):
+            analyze_matches(matches)
@@ -7,6 +7,8 @@ urlpatterns = [
     path('analyze/advanced/<str:unique_key>/', views.analyze_match_advanced, name='analyze_match_advanced'),
     path('ask-ai/<str:unique_key>/', views.ask_gemini_analysis, name='ask_gemini_analysis'),
     path('api/push-bulletin/', views.receive_external_bulletin, name='push_bulletin'),
+    path('api/push-dataset/', views.receive_scraped_dataset, name='push_dataset'),
+    path('api/sync-bulletin/', views.sync_bulletin, name='sync_bulletin'),
     path('scrape-local-push/', views.scrape_local_and_push_view, name='scrape_local_push'),
     path('sync-center/', views.sync_center_view, name='sync_center'),
 ]
@@ -2,23 +2,27 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from data_manager.models import BilyonerBulletin
 from .engine import MatchAnalyzer
+from .batch import analyze_matches
 from .advanced_engine import AdvancedMatchAnalyzer
-import requests
+from data_manager.odds import match_drift
 import json
 from scraper.bilyoner import BilyonerScraper
 from django.http import JsonResponse
 from django.contrib.auth.decorators import user_passes_test
+from league_system.routers import use_replica
 
 @login_required
+@use_replica()
 def analysis_dashboard(request):
     """
     Shows the bulletin matches with a quick analysis overview.
     """
-    matches = BilyonerBulletin.objects.all().order_by('match_time')
+    matches = BilyonerBulletin.objects.all().order_by('kickoff_at', 'match_time')
     analysis_results = []
     
-    for match in matches:
-        analyzer = MatchAnalyzer(match)
+    # League data is loaded once for the whole bulletin (see analysis.batch)
+    for analyzer in analyze_matches(matches):
+        match = analyzer.match
         res = analyzer.prediction
         
         # Determine Value Bet (Simple Logic)
@@ -27,7 +31,7 @@ def analysis_dashboard(request):
             # Check if implied odd prob < calculated prob
             # Implied = 1 / Odd
             # Value = (Prob * Odd) > 1
-            odd_1 = float(match.ms_1) if match.ms_1 != '-' else 0
+            odd_1 = float(match.odds_1) if match.odds_1 else 0
             if odd_1 > 1 and (res['home_win_prob']/100 * odd_1) > 1.1: # 10% value margin
                  value_bet = "MS 1 Değerli"
         except:
@@ -45,12 +49,14 @@ def analysis_dashboard(request):
     return render(request, 'analysis/dashboard.html', context)
 
 @login_required
+@use_replica()
 def analyze_match(request, unique_key):
     match = get_object_or_404(BilyonerBulletin, unique_key=unique_key)
     analyzer = MatchAnalyzer(match)
     return render(request, 'analysis/detail.html', {'res': analyzer.prediction, 'match': match})
 
 @login_required
+@use_replica()
 def analyze_match_advanced(request, unique_key):
     match = get_object_or_404(BilyonerBulletin, unique_key=unique_key)
     analyzer = AdvancedMatchAnalyzer(match)
@@ -58,7 +64,8 @@ def analyze_match_advanced(request, unique_key):
     
     return render(request, 'analysis/detail_advanced.html', {
         'report': report,
-        'match': match
+        'match': match,
+        'odds_drift': match_drift(match.unique_key, match.match_date),
     })
 
 from django.http import JsonResponse
@@ -106,7 +113,37 @@ def ask_gemini_analysis(request, unique_key):
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
-from data_manager.models import BilyonerBulletin
+from data_manager.models import BilyonerBulletin, BulletinVersion
+from data_manager.bulletin import (
+    SOURCE_FIELDS, publish_bulletin, bulletin_manifest, diff_manifest, apply_bulletin_delta, StaleBulletinVersion,
+)
+from scraper.bulletin_sync import decode_body, push_bulletin_delta, SyncError, PayloadTooLarge
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+
+def _read_push_payload(request):
+    """
+    Decoded JSON of a push/sync request. Oversized bodies are rejected before they are
+    read (Content-Length) and before they are decompressed; raises PayloadTooLarge.
+    """
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length > settings.SYNC_MAX_BODY_BYTES:
+        raise PayloadTooLarge(f"Body larger than {settings.SYNC_MAX_BODY_BYTES} bytes")
+    try:
+        body = request.body
+    except RequestDataTooBig as e:
+        raise PayloadTooLarge(str(e))
+    if len(body) > settings.SYNC_MAX_BODY_BYTES:
+        raise PayloadTooLarge(f"Body larger than {settings.SYNC_MAX_BODY_BYTES} bytes")
+    return decode_body(body, request.headers.get('Content-Encoding'), max_size=settings.SYNC_MAX_DECODED_BYTES)
+
+def _payload_too_large(logger, request, e):
+    remote_ip = request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')
+    logger.warning(f"❌ PAYLOAD TOO LARGE from {remote_ip}: {e}")
+    return JsonResponse({"success": False, "error": "Payload too large"}, status=413)
 
 @csrf_exempt
 def receive_external_bulletin(request):
@@ -115,24 +152,16 @@ def receive_external_bulletin(request):
     Bypasses AWS IP blocks by allowing the user to scrape locally and push here.
     """
     import logging
-    import sys
     
-    # Configure logger to output to stdout for Docker logs
-    logger = logging.getLogger('api_receiver')
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    if not logger.handlers:
-        logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    # Routed through the queued 'automation' handlers (settings.LOGGING)
+    logger = logging.getLogger('automation.api_receiver')
 
     if request.method == 'POST':
         try:
             remote_ip = request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')
             logger.info(f"🚀 INCOMING PUSH REQUEST from {remote_ip}")
             
-            data = json.loads(request.body)
+            data = _read_push_payload(request)
             secret = data.get('secret')
             
             # Authenticate
@@ -152,44 +181,123 @@ def receive_external_bulletin(request):
             first_match = matches[0]
             logger.info(f"🔍 Sample Data (First Match): {first_match.get('home_team')} vs {first_match.get('away_team')} @ {first_match.get('match_time')}")
 
-            # Database Operation
-            logger.info("🗑️ Clearing existing BilyonerBulletin table...")
-            del_count, _ = BilyonerBulletin.objects.all().delete()
-            logger.info(f"✅ Deleted {del_count} old records.")
-            
-            bulk_list = []
-            for m in matches:
-                bulk_list.append(BilyonerBulletin(
-                    unique_key=m.get('unique_key'),
-                    country=m.get('country', 'TURKEY'),
-                    league=m.get('league', '-'),
-                    match_date=m.get('match_date', ''),
-                    match_time=m.get('match_time', '00:00'),
-                    home_team=m.get('home_team', 'Unknown'),
-                    away_team=m.get('away_team', 'Unknown'),
-                    ms_1=m.get('ms_1', '-'),
-                    ms_x=m.get('ms_x', '-'),
-                    ms_2=m.get('ms_2', '-'),
-                    under_2_5=m.get('under_2_5', '-'),
-                    over_2_5=m.get('over_2_5', '-')
-                ))
-            
-            logger.info(f"✍️ Bulk creating {len(bulk_list)} new records...")
-            objs = BilyonerBulletin.objects.bulk_create(bulk_list)
-            logger.info(f"✅ SUCCESSFULLY INSERTED {len(objs)} records into DB.")
-            
-            # Verify DB state immediately
-            final_count = BilyonerBulletin.objects.count()
-            logger.info(f"📊 Final DB Count: {final_count}")
+            # Database Operation: new snapshot version, switched in with one pointer update
+            version = publish_bulletin(matches, BulletinVersion.Source.PUSH)
+            logger.info(f"✅ Published bulletin v{version.id} with {version.row_count} records.")
 
-            return JsonResponse({"success": True, "count": len(objs)})
+            return JsonResponse({"success": True, "count": version.row_count, "version": version.id})
             
+        except PayloadTooLarge as e:
+            return _payload_too_large(logger, request, e)
         except Exception as e:
             logger.error(f"❌ CRITICAL ERROR: {str(e)}", exc_info=True)
             return JsonResponse({"success": False, "error": str(e)}, status=500)
             
     return JsonResponse({"success": False, "error": "Method not allowed"}, status=405)
 
+@csrf_exempt
+def sync_bulletin(request):
+    """
+    Delta sync endpoint (scraper.bulletin_sync). Gzip JSON bodies:
+    - {"secret", "action": "handshake", "manifest": {unique_key: row_hash}}
+      -> {"version", "need": [keys to send], "remove": [keys the server drops]}
+    - {"secret", "action": "apply", "base_version", "token", "upserts": [rows], "removals": [keys]}
+      -> {"version", "inserted", "changed", "removed", "unchanged", "timings"}
+    """
+    import time
+    import logging
+
+    logger = logging.getLogger('automation.api_receiver')
+
+    if request.method != 'POST':
+        return JsonResponse({"success": False, "error": "Method not allowed"}, status=405)
+
+    started = time.time()
+    timings = {}
+    try:
+        data = _read_push_payload(request)
+        timings['decode_ms'] = round((time.time() - started) * 1000)
+        if data.get('secret') != "WFM_PRO_2026_SECURE_SYNC":
+            remote_ip = request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')
+            logger.warning(f"❌ UNAUTHORIZED SYNC ATTEMPT from {remote_ip}")
+            return JsonResponse({"success": False, "error": "Unauthorized"}, status=403)
+
+        action = data.get('action')
+        if action == 'handshake':
+            version, server = bulletin_manifest()
+            need, remove = diff_manifest(server, data.get('manifest') or {})
+            timings['total_ms'] = round((time.time() - started) * 1000)
+            logger.info(f"🤝 Sync handshake: base v{version}, need {len(need)}, remove {len(remove)} ({timings['total_ms']} ms)")
+            return JsonResponse({"success": True, "version": version, "need": need, "remove": remove, "timings": timings})
+
+        if action == 'apply':
+            write_started = time.time()
+            try:
+                version, stats = apply_bulletin_delta(
+                    data.get('base_version'), data.get('upserts') or [], data.get('removals') or [], data.get('token') or ""
+                )
+            except StaleBulletinVersion as e:
+                return JsonResponse({"success": False, "error": f"stale: {e}"}, status=409)
+            timings['write_ms'] = round((time.time() - write_started) * 1000)
+            timings['total_ms'] = round((time.time() - started) * 1000)
+            logger.info(f"✅ Sync applied: v{version.id} {stats} ({timings['total_ms']} ms)")
+            return JsonResponse({"success": True, "version": version.id, "count": version.row_count, "timings": timings, **stats})
+
+        return JsonResponse({"success": False, "error": f"Unknown action: {action}"}, status=400)
+
+    except PayloadTooLarge as e:
+        return _payload_too_large(logger, request, e)
+    except Exception as e:
+        logger.error(f"❌ Sync error: {str(e)}", exc_info=True)
+        return JsonResponse({"success": False, "error": str(e)}, status=500)
+
+@csrf_exempt
+def receive_scraped_dataset(request):
+    """
+    API Endpoint for the standalone scraper CLI (`python -m scraper --push ...`).
+    Payload: {"secret", "country", "data_type": standings|fixtures|squads|team_links, "data": [...]}
+    """
+    import logging
+    from automation.scraper_tasks import save_standings, save_fixtures, save_squads, save_team_links
+
+    logger = logging.getLogger('automation.api_receiver')
+
+    if request.method != 'POST':
+        return JsonResponse({"success": False, "error": "Method not allowed"}, status=405)
+
+    try:
+        data = _read_push_payload(request)
+        if data.get('secret') != "WFM_PRO_2026_SECURE_SYNC":
+            remote_ip = request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')
+            logger.warning(f"❌ UNAUTHORIZED DATASET PUSH from {remote_ip}")
+            return JsonResponse({"success": False, "error": "Unauthorized"}, status=403)
+
+        country = (data.get('country') or '').lower()
+        data_type = data.get('data_type')
+        rows = data.get('data') or []
+        if country not in ('turkey', 'england', 'spain', 'italy'):
+            return JsonResponse({"success": False, "error": f"Unknown country: {country}"}, status=400)
+        if not rows:
+            return JsonResponse({"success": False, "error": "No data provided"})
+
+        logger.info(f"📦 Dataset push: {country} {data_type} ({len(rows)} rows)")
+        if data_type == 'team_links':
+            save_team_links(country, rows)
+            success, msg = True, f"Saved {len(rows)} team links for {country}."
+        else:
+            savers = {'standings': save_standings, 'fixtures': save_fixtures, 'squads': save_squads}
+            if data_type not in savers:
+                return JsonResponse({"success": False, "error": f"Unknown data type: {data_type}"}, status=400)
+            success, msg = savers[data_type](country, rows)
+
+        return JsonResponse({"success": success, "count": len(rows), "message": msg, "error": None if success else msg})
+
+    except PayloadTooLarge as e:
+        return _payload_too_large(logger, request, e)
+    except Exception as e:
+        logger.error(f"❌ Dataset push error: {str(e)}", exc_info=True)
+        return JsonResponse({"success": False, "error": str(e)}, status=500)
+
 @login_required
 @login_required
 def sync_center_view(request):
@@ -239,24 +347,7 @@ def scrape_local_and_push_view(request):
                     return JsonResponse({'success': False, 'error': 'Bilyonerden veri çekilemedi (0 maç).'})
                 
                 # Save to DB (Local or Server DB, depending on where we are)
-                BilyonerBulletin.objects.all().delete()
-                bulk_list = []
-                for m in matches:
-                    bulk_list.append(BilyonerBulletin(
-                        unique_key=m.get('unique_key'),
-                        country=m.get('country', 'TURKEY'),
-                        league=m.get('league', '-'),
-                        match_date=m.get('match_date', ''),
-                        match_time=m.get('match_time', '00:00'),
-                        home_team=m.get('home_team', 'Unknown'),
-                        away_team=m.get('away_team', 'Unknown'),
-                        ms_1=m.get('ms_1', '-'),
-                        ms_x=m.get('ms_x', '-'),
-                        ms_2=m.get('ms_2', '-'),
-                        under_2_5=m.get('under_2_5', '-'),
-                        over_2_5=m.get('over_2_5', '-')
-                    ))
-                BilyonerBulletin.objects.bulk_create(bulk_list)
+                publish_bulletin(matches, BulletinVersion.Source.LOCAL_SCRAPE)
                 
                 msg = "SUNUCU veritabanı güncellendi." if is_cloud else "LOKAL veritabanı güncellendi."
                 return JsonResponse({'success': True, 'count': len(matches), 'msg': msg})
@@ -273,35 +364,17 @@ def scrape_local_and_push_view(request):
                 if not local_matches.exists():
                      return JsonResponse({'success': False, 'error': 'Veritabanı boş!'})
 
-                matches_payload = []
-                for m in local_matches:
-                    matches_payload.append({
-                        'unique_key': m.unique_key,
-                        'country': m.country,
-                        'league': m.league,
-                        'match_date': m.match_date,
-                        'match_time': m.match_time,
-                        'home_team': m.home_team,
-                        'away_team': m.away_team,
-                        'ms_1': m.ms_1,
-                        'ms_x': m.ms_x,
-                        'ms_2': m.ms_2,
-                        'under_2_5': m.under_2_5,
-                        'over_2_5': m.over_2_5,
-                    })
-
-                payload = { "secret": "WFM_PRO_2026_SECURE_SYNC", "matches": matches_payload }
-                
+                matches_payload = list(local_matches.values(*SOURCE_FIELDS))
+
                 try:
-                    resp = requests.post(target_url, json=payload, timeout=20)
-                    if resp.status_code == 200:
-                        remote_res = resp.json()
-                        if remote_res.get('success'):
-                            return JsonResponse({'success': True, 'count': len(matches_payload), 'msg': f"AWS Başarıyla Güncellendi: {remote_res.get('count')} Maç"})
-                        else:
-                            return JsonResponse({'success': False, 'error': f"AWS Hatası: {remote_res.get('error')}"})
-                    else:
-                        return JsonResponse({'success': False, 'error': f"AWS HTTP Hatası: {resp.status_code}"})
+                    # Delta sync: only new/changed/removed matches travel (gzip)
+                    result = push_bulletin_delta(target_url, matches_payload, "WFM_PRO_2026_SECURE_SYNC", timeout=20)
+                    msg = (f"AWS Başarıyla Güncellendi: {len(matches_payload)} Maç "
+                           f"({result.get('inserted', 0)} yeni, {result.get('changed', 0)} değişen, "
+                           f"{result.get('removed', 0)} silinen, {result.get('timings', {}).get('total_ms', 0)} ms)")
+                    return JsonResponse({'success': True, 'count': len(matches_payload), 'msg': msg})
+                except SyncError as sync_err:
+                    return JsonResponse({'success': False, 'error': f"AWS Hatası: {sync_err}"})
                 except Exception as net_err:
                     return JsonResponse({'success': False, 'error': f"AWS Bağlantı Hatası: {str(net_err)}"})
             
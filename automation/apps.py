@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class AutomationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'automation'
+
+    def ready(self):
+        from league_system.db import configure_sqlite
+        # WAL + pragmas for every SQLite connection (web, scheduler and worker threads)
+        connection_created.connect(configure_sqlite, dispatch_uid='configure_sqlite')
@@ -0,0 +1,164 @@
+import logging
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from scraper.detail_crawler import DetailCrawler, UrlFrontier, normalize_url
+from data_manager.models import Fixture, Player, CrawledPage, MatchStat, PlayerSeasonStat
+
+logger = logging.getLogger('automation')
+
+MATCH_STAT_FIELDS = [
+    f.name for f in MatchStat._meta.get_fields()
+    if f.name.startswith(('home_', 'away_'))
+]
+PLAYER_STAT_FIELDS = ('season', 'competition', 'team_name', 'appearances', 'minutes',
+                      'goals', 'assists', 'yellow_cards', 'red_cards')
+
+
+def _crawl_state(kind):
+    """
+    url -> (status, last_crawled, error_count) for every page of this kind crawled before.
+    """
+    return {
+        url: (status, last_crawled, errors)
+        for url, status, last_crawled, errors in CrawledPage.objects.filter(kind=kind)
+        .values_list('url', 'status', 'last_crawled', 'error_count')
+    }
+
+
+def _needs_crawl(state, changed_at=None, retry_empty=False):
+    """
+    New pages, failed pages under the error limit, pages whose source row changed
+    after the last crawl and, if retry_empty, pages that had no data yet.
+    """
+    if state is None:
+        return True
+    status, last_crawled, errors = state
+    if status == CrawledPage.Status.ERROR:
+        return errors < settings.DETAIL_CRAWL_MAX_ERRORS
+    if status == CrawledPage.Status.EMPTY and retry_empty:
+        return True
+    return bool(changed_at and last_crawled and changed_at > last_crawled)
+
+
+def build_detail_frontier(kinds=('match', 'player')):
+    """
+    Returns (frontier, meta) where meta maps each queued URL to the values
+    (country, names) its stat rows are saved with.
+    """
+    frontier = UrlFrontier()
+    meta = {}
+
+    if 'match' in kinds:
+        state = _crawl_state(CrawledPage.Kind.MATCH)
+        # Only played matches have a report; an empty one is retried until the stats are published
+        played = (Fixture.objects.exclude(match_url__isnull=True).exclude(match_url="")
+                  .exclude(score__isnull=True).exclude(score="")
+                  .values_list('match_url', 'country', 'home_team', 'away_team'))
+        for url, country, home, away in played.iterator():
+            url = normalize_url(url)
+            if _needs_crawl(state.get(url), retry_empty=True) and frontier.add(url, CrawledPage.Kind.MATCH):
+                meta[url] = {'country': country, 'home_team': home, 'away_team': away}
+
+    if 'player' in kinds:
+        state = _crawl_state(CrawledPage.Kind.PLAYER)
+        players = (Player.objects.exclude(profile_url__isnull=True).exclude(profile_url="")
+                   .values_list('profile_url', 'country', 'player_name', 'updated_at'))
+        for url, country, name, updated_at in players.iterator():
+            url = normalize_url(url)
+            if _needs_crawl(state.get(url), changed_at=updated_at) and frontier.add(url, CrawledPage.Kind.PLAYER):
+                meta[url] = {'country': country, 'player_name': name}
+
+    return frontier, meta
+
+
+def _save_match_stats(url, info, rows):
+    row = rows[0]
+    defaults = {'country': info['country']}
+    defaults['home_team'] = row.get('home_team') or info.get('home_team', '')
+    defaults['away_team'] = row.get('away_team') or info.get('away_team', '')
+    for field in MATCH_STAT_FIELDS:
+        if field in row:
+            defaults[field] = row[field]
+    MatchStat.objects.update_or_create(match_url=url, defaults=defaults)
+
+
+def _save_player_stats(url, info, rows):
+    PlayerSeasonStat.objects.filter(profile_url=url).delete()
+    PlayerSeasonStat.objects.bulk_create([
+        PlayerSeasonStat(
+            country=info['country'],
+            profile_url=url,
+            player_name=info.get('player_name', ''),
+            **{field: row[field] for field in PLAYER_STAT_FIELDS if field in row}
+        )
+        for row in rows
+    ])
+
+
+STAT_WRITERS = {
+    CrawledPage.Kind.MATCH: _save_match_stats,
+    CrawledPage.Kind.PLAYER: _save_player_stats,
+}
+
+
+def save_detail_result(result, meta):
+    """
+    Writes one crawler result. Returns 'changed', 'unchanged', 'empty' or 'error'.
+    """
+    url, kind = result['url'], result['kind']
+    now = timezone.now()
+    page, _ = CrawledPage.objects.get_or_create(url=url, defaults={'kind': kind})
+    page.last_crawled = now
+
+    if result['error']:
+        page.status = CrawledPage.Status.ERROR
+        page.error_count += 1
+        page.save()
+        return 'error'
+
+    page.error_count = 0
+    if not result['rows']:
+        page.status = CrawledPage.Status.EMPTY
+        page.save()
+        return 'empty'
+
+    page.status = CrawledPage.Status.OK
+    if page.content_hash == result['hash']:
+        page.save()
+        return 'unchanged'
+
+    with transaction.atomic():
+        STAT_WRITERS[kind](url, meta.get(url, {}), result['rows'])
+        page.content_hash = result['hash']
+        page.last_changed = now
+        page.save()
+    return 'changed'
+
+
+def crawl_detail_pages(kinds=('match', 'player')):
+    """
+    [VERİ ÇEKME] Maç detay ve oyuncu profil sayfalarını tarar.
+    Sadece yeni veya değişmiş sayfalar ziyaret edilir; sonuçlar MatchStat / PlayerSeasonStat tablolarına yazılır.
+    """
+    try:
+        frontier, meta = build_detail_frontier(kinds)
+        total = len(frontier)
+        if not total:
+            return True, "No new or changed detail pages to crawl."
+
+        crawler = DetailCrawler(workers=settings.DETAIL_CRAWL_WORKERS, per_host=settings.DETAIL_CRAWL_PER_HOST)
+        counts = Counter()
+        for result in crawler.crawl(frontier):
+            try:
+                counts[save_detail_result(result, meta)] += 1
+            except Exception as e:
+                logger.error(f"Detail result save failed for {result['url']}: {e}")
+                counts['error'] += 1
+
+        return True, (f"Crawled {total} detail pages: {counts['changed']} changed, "
+                      f"{counts['unchanged']} unchanged, {counts['empty']} empty, {counts['error']} errors.")
+    except Exception as e:
+        return False, str(e)
@@ -0,0 +1,94 @@
+import time
+import random
+import threading
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction, DatabaseError, OperationalError
+from automation.models import TaskLog
+from league_system.db import background_write, writer, thread_connection
+
+STRESS_TASK_NAME = 'db_stress'
+
+
+class Command(BaseCommand):
+    help = ('Concurrency stress test: threads write TaskLog rows (single saves, bulk inserts, deletes) '
+            'and read at the same time; fails if any "database is locked" error occurs')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--queue', action='store_true',
+                            help='Send the single-row writes through the background writer queue')
+
+    def handle(self, *args, **options):
+        deadline = time.time() + options['seconds']
+        counts = {'writes': 0, 'reads': 0, 'queued': 0, 'locked': 0, 'errors': 0}
+        lock = threading.Lock()
+        futures = []
+
+        def bump(key, n=1):
+            with lock:
+                counts[key] += n
+
+        def worker(seed):
+            rnd = random.Random(seed)
+            with thread_connection():
+                while time.time() < deadline:
+                    op = rnd.random()
+                    try:
+                        if op < 0.4:
+                            log = TaskLog(task_name=STRESS_TASK_NAME, status='RUNNING')
+                            if options['queue']:
+                                with lock:
+                                    futures.append(background_write(log.save))
+                                bump('queued')
+                            else:
+                                log.save()
+                                log.status = 'SUCCESS'
+                                log.save(update_fields=['status'])
+                                bump('writes', 2)
+                        elif op < 0.6:
+                            with transaction.atomic():
+                                TaskLog.objects.bulk_create([
+                                    TaskLog(task_name=STRESS_TASK_NAME, status='SUCCESS', output='x' * 200)
+                                    for _ in range(50)
+                                ])
+                            bump('writes')
+                        elif op < 0.7:
+                            with transaction.atomic():
+                                # Only bulk rows: single-saved rows are still being updated
+                                ids = list(TaskLog.objects.filter(task_name=STRESS_TASK_NAME, output__startswith='x')
+                                           .values_list('id', flat=True)[:20])
+                                TaskLog.objects.filter(id__in=ids).delete()
+                            bump('writes')
+                        else:
+                            TaskLog.objects.filter(task_name=STRESS_TASK_NAME, status='SUCCESS').count()
+                            bump('reads')
+                    except OperationalError as e:
+                        bump('locked' if 'locked' in str(e) else 'errors')
+                    except DatabaseError:
+                        bump('errors')
+
+        started = time.time()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.flush()
+        for future in futures:
+            try:
+                future.result(timeout=60)
+            except OperationalError as e:
+                bump('locked' if 'locked' in str(e) else 'errors')
+        elapsed = time.time() - started
+
+        TaskLog.objects.filter(task_name=STRESS_TASK_NAME).delete()
+
+        self.stdout.write(
+            f"{options['threads']} threads, {elapsed:.1f}s ({connection.vendor}): "
+            f"{counts['writes']} write transactions, {counts['queued']} queued writes, "
+            f"{counts['reads']} reads, {counts['locked']} lock errors, {counts['errors']} other errors"
+        )
+        if counts['locked'] or counts['errors']:
+            raise CommandError("Database errors under concurrent load.")
+        self.stdout.write(self.style.SUCCESS("No lock errors."))
@@ -3,7 +3,7 @@ from automation.models import Workflow
 from automation.runner import execute_workflow
 from django.utils import timezone
 import time
-from django.db import connection
+from django.db import close_old_connections
 
 class Command(BaseCommand):
     help = 'Runs the automation scheduler loop'
@@ -13,8 +13,8 @@ class Command(BaseCommand):
         
         while True:
             try:
-                # Close old connections to avoid timeout in long loop
-                connection.close()
+                # Drop the connection only if it broke or outlived CONN_MAX_AGE (pooled on PostgreSQL)
+                close_old_connections()
                 
                 now = timezone.now()
                 # Find due workflows
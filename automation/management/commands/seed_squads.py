@@ -0,0 +1,48 @@
+import os
+import glob
+import time
+from django.core.management.base import BaseCommand, CommandError
+from scraper.storage import data_path, iter_json_items, team_links_path
+from automation.scraper_tasks import seed_squads, save_team_links
+
+COUNTRIES = ('turkey', 'england', 'spain', 'italy')
+
+
+class Command(BaseCommand):
+    help = ('Seeds players from squad snapshot files (default: data/*_squads_flat.json and *_team_links.json). '
+            'Files are streamed item by item and written in batches; each country is replaced.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='<country>_squads_flat.json / <country>_team_links.json files')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or sorted(
+            glob.glob(data_path('*_squads_flat.json')) + glob.glob(data_path('*_team_links.json'))
+        )
+        if not paths:
+            raise CommandError("No snapshot files found.")
+
+        started = time.time()
+        for path in paths:
+            name = os.path.basename(path)
+            country = name.split('_')[0].lower()
+            if country not in COUNTRIES:
+                self.stderr.write(f"{name}: unknown country, skipped.")
+                continue
+
+            if name.endswith('_team_links.json'):
+                # Squad scrapers read the links from the data folder; copy only files from elsewhere
+                if os.path.abspath(path) != os.path.abspath(team_links_path(country)):
+                    save_team_links(country, list(iter_json_items(path)))
+                self.stdout.write(f"{name}: team links ready")
+                continue
+
+            file_started = time.time()
+            try:
+                count = seed_squads(country, iter_json_items(path), batch_size=options['batch_size'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"{name}: {count} players ({time.time() - file_started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Seeding finished in {time.time() - started:.2f}s."))
@@ -4,9 +4,13 @@ from .services import TASK_REGISTRY
 import time
 import datetime
 from django.utils import timezone
+from league_system.db import background_write
 
 logger = logging.getLogger('automation')
 
+# TaskLog rows are written through the single writer queue (league_system.db): task runs come
+# from the scheduler and from web-started threads at the same time
+
 def execute_workflow(workflow_id):
     """
     Executes all steps of a given workflow in order.
@@ -34,7 +38,7 @@ def execute_workflow(workflow_id):
                 task_name=step.task.name,
                 status='RUNNING'
             )
-            log.save()
+            background_write(log.save)
             
             task_start = time.time()
             
@@ -42,7 +46,7 @@ def execute_workflow(workflow_id):
                 log.status = 'FAILED'
                 log.output = f"Task function '{task_key}' not found in registry."
                 log.duration_seconds = time.time() - task_start
-                log.save()
+                background_write(log.save)
                 success_overall = False
                 break 
             
@@ -67,7 +71,7 @@ def execute_workflow(workflow_id):
                 break
             finally:
                 log.duration_seconds = time.time() - task_start
-                log.save()
+                background_write(log.save)
         
         # Schedule Next Run
         if workflow.interval_minutes > 0:
@@ -100,13 +104,13 @@ def execute_single_task(task_id):
             task_name=task_model.name,
             status='RUNNING'
         )
-        log.save()
+        background_write(log.save)
         
         if not task_func:
             log.status = 'FAILED'
             log.output = f"Task function '{task_key}' not found in registry."
             log.duration_seconds = time.time() - task_start
-            log.save()
+            background_write(log.save)
             logger.error(f"Task function not found in registry: {task_key}")
             return False
             
@@ -116,7 +120,7 @@ def execute_single_task(task_id):
             log.status = 'SUCCESS' if status else 'FAILED'
             log.output = str(output)
             log.duration_seconds = time.time() - task_start
-            log.save()
+            background_write(log.save)
             
             if status:
                 logger.info(f"Task {task_key} SUCCESS. Output len: {len(str(output))}")
@@ -129,7 +133,7 @@ def execute_single_task(task_id):
             log.status = 'FAILED'
             log.output = f"Exception: {str(e)}"
             log.duration_seconds = time.time() - task_start
-            log.save()
+            background_write(log.save)
             logger.exception(f"Task Exception in execute_single_task: {e}")
             return False
             
@@ -1,7 +1,12 @@
 import sys
 import os
+import json
+import logging
+from difflib import get_close_matches
 import django
 from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
 
 # Ensure scraper module is importable
 # Assuming standard structure: c:/Code/web_scraper_0/web_app/automation/scraper_tasks.py
@@ -11,7 +16,16 @@ if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
 from scraper.engine import ScraperManager
+from scraper.storage import team_links_path, save_json
 from data_manager.models import Standing, Fixture, Player, CountryChoices
+from data_manager.teams import same_team, link_team_refs
+from data_manager.fixtures import fixture_result_fields
+from data_manager.sync import sync_rows
+from data_manager.squads import sync_players, player_fields
+from data_manager.archive import archive_standings, archive_fixtures, archive_squads
+from data_manager.standings import update_standings, reconcile_standings, reconcile_due, fixture_team_ids
+
+logger = logging.getLogger('automation')
 
 def _get_country_code(country_name):
     country_name = country_name.lower()
@@ -23,24 +37,26 @@ def _get_country_code(country_name):
 
 # --- GENERIC FETCH FUNCTIONS ---
 
-def fetch_standings(country, **kwargs):
+def fetch_league_table(country, **kwargs):
+    """
+    One visit of the standings page -> {'standings': [...], 'team_links': [...]}.
+    """
     engine = ScraperManager()
-    data = []
     try:
-        url = kwargs.get('url') # Can be None
-        # Other potential kwargs
-        
-        if country == 'turkey': data = engine.scrape_turkey_standings(url)
-        elif country == 'england': data = engine.scrape_england_standings(url)
-        elif country == 'spain': data = engine.scrape_spain_standings(url)
-        elif country == 'italy': data = engine.scrape_italy_standings(url)
-        return data
+        return engine.scrape_league_table(country, kwargs.get('url'))
     except Exception as e:
-        print(f"Error fetching standings for {country}: {e}")
-        return []
+        print(f"Error fetching league table for {country}: {e}")
+        return {'standings': [], 'team_links': []}
     finally:
         engine.close()
 
+def fetch_standings(country, **kwargs):
+    # Standings and the squads' team links cache are fed from the same page visit
+    table = fetch_league_table(country, **kwargs)
+    if table['team_links']:
+        save_team_links(country, table['team_links'])
+    return table['standings']
+
 def fetch_fixtures(country, **kwargs):
     engine = ScraperManager()
     data = []
@@ -63,14 +79,19 @@ def fetch_fixtures(country, **kwargs):
         engine.close()
 
 def fetch_squads(country, **kwargs):
+    # Build the links cache from the league table if it was never written
+    if not os.path.exists(_team_links_path(country)):
+        fetch_standings(country)
+
     engine = ScraperManager()
     data = []
     try:
         url = kwargs.get('url')
-        if country == 'turkey': data = engine.scrape_turkey_squads(url)
-        elif country == 'england': data = engine.scrape_england_squads(url)
-        elif country == 'spain': data = engine.scrape_spain_squads(url)
-        elif country == 'italy': data = engine.scrape_italy_squads(url)
+        only_teams = kwargs.get('only_teams') # None = every team in the links file
+        if country == 'turkey': data = engine.scrape_turkey_squads(url, only_teams=only_teams)
+        elif country == 'england': data = engine.scrape_england_squads(url, only_teams=only_teams)
+        elif country == 'spain': data = engine.scrape_spain_squads(url, only_teams=only_teams)
+        elif country == 'italy': data = engine.scrape_italy_squads(url, only_teams=only_teams)
         return data
     except Exception as e:
         print(f"Error fetching squads for {country}: {e}")
@@ -86,7 +107,6 @@ def save_standings(country, data):
     
     try:
         with transaction.atomic():
-            Standing.objects.filter(country=country_code).delete()
             objects = []
             for row in data:
                 def safe_int(v):
@@ -106,8 +126,15 @@ def save_standings(country, data):
                     average=safe_int(row.get('average')),
                     points=safe_int(row.get('points'))
                 ))
-            Standing.objects.bulk_create(objects)
-        return True, f"Saved {len(objects)} standings for {country}."
+            changed_keys = []
+            created, updated, deleted, _ = sync_rows(Standing, country_code, objects, changed_keys)
+            # New canonical teams may also resolve rows written before them
+            link_team_refs(country_code)
+            mismatched = reconcile_standings(country_code)
+            archive_standings(country_code, teams={team for team, in changed_keys})
+        return True, (f"Saved {len(objects)} standings for {country} "
+                      f"({created} new, {updated} changed, {deleted} removed; "
+                      f"{len(mismatched)} differ from fixtures).")
     except Exception as e:
         return False, str(e)
 
@@ -117,7 +144,6 @@ def save_fixtures(country, data):
     
     try:
         with transaction.atomic():
-            Fixture.objects.filter(country=country_code).delete()
             objects = []
             for row in data:
                 # Handle possible key variations (Turkish vs English)
@@ -130,6 +156,7 @@ def save_fixtures(country, data):
                 home_val = row.get('home_team') or row.get('Ev Sahibi') or ''
                 score_val = row.get('score') or row.get('Skor') or ''
                 away_val = row.get('away_team') or row.get('Misafir') or ''
+                match_url = row.get('match_url') or row.get('Maç Linki') or None
 
                 objects.append(Fixture(
                     country=country_code,
@@ -138,54 +165,131 @@ def save_fixtures(country, data):
                     time=str(time_val),
                     home_team=str(home_val),
                     score=str(score_val),
-                    away_team=str(away_val)
+                    away_team=str(away_val),
+                    match_url=match_url
                 ))
-            Fixture.objects.bulk_create(objects)
-        return True, f"Saved {len(objects)} fixtures for {country}."
+            for obj, fields in zip(objects, fixture_result_fields((o.date, o.score) for o in objects)):
+                for field, value in fields.items():
+                    setattr(obj, field, value)
+            changed_keys = []
+            created, updated, deleted, _ = sync_rows(Fixture, country_code, objects, changed_keys)
+            link_team_refs(country_code, models=[Fixture])
+            archive_fixtures(country_code, keys=changed_keys)
+            # Results that arrived move only the teams involved in the derived table
+            teams = fixture_team_ids(country_code, {name for _, home, away in changed_keys for name in (home, away)})
+            update_standings(country_code, teams)
+        return True, (f"Saved {len(objects)} fixtures for {country} "
+                      f"({created} new, {updated} changed, {deleted} removed).")
     except Exception as e:
         import traceback
         traceback.print_exc()
         print(f"CRITICAL SAVE ERROR: {e}")
         return False, str(e)
 
-def save_squads(country, data):
+def save_squads(country, data, teams=None):
+    """
+    Upserts squad rows by comparing row hashes with what is stored.
+    Only new or changed players are written and only vanished players are deleted.
+    If `teams` is given, the refresh is limited to those teams' players.
+    """
     if not data: return False, "No data to save."
     country_code = _get_country_code(country)
     
     try:
         with transaction.atomic():
-            # For squads, we might want to be careful about deleting everything?
-            # For now, full replace is safer for sync
-            Player.objects.filter(country=country_code).delete()
-            objects = []
-            for row in data:
-                def safe_int(v):
-                    try: return int(v)
-                    except: return 0
-                
-                objects.append(Player(
-                    country=country_code,
-                    team_name=row.get('team_name', row.get('team', '')),
-                    jersey_number=safe_int(row.get('jersey_number', row.get('number', 0))),
-                    player_name=row.get('player_name', row.get('name', 'Unknown')),
-                    profile_url=row.get('profile_url', ''),
-                    position=row.get('position', ''),
-                    age=safe_int(row.get('age', 0)),
-                    matches_played=safe_int(row.get('matches_played', row.get('matches', 0))),
-                    starts=safe_int(row.get('starts', 0)),
-                    goals=safe_int(row.get('goals', 0)),
-                    assists=safe_int(row.get('assists', 0)),
-                    yellow_cards=safe_int(row.get('yellow_cards', row.get('yellow', 0))),
-                    red_cards=safe_int(row.get('red_cards', row.get('red', 0)))
-                ))
-            Player.objects.bulk_create(objects)
-        return True, f"Saved {len(objects)} players for {country}."
+            changed_keys = []
+            created, updated, deleted, unchanged = sync_players(country_code, data, teams=teams, changed_keys=changed_keys)
+            link_team_refs(country_code, models=[Player])
+            archive_squads(country_code, keys=changed_keys)
+
+        return True, (f"Saved squads for {country}: {created} new, {updated} changed, "
+                      f"{deleted} removed, {unchanged} unchanged.")
     except Exception as e:
         return False, str(e)
 
+def seed_squads(country, rows, batch_size=1000):
+    """
+    Makes the country's players equal to `rows` (any iterable, consumed batch by batch)
+    through the same upsert as save_squads. For seeding from snapshot files; scrapes use save_squads.
+    Returns the number of players in `rows`.
+    """
+    country_code = _get_country_code(country)
+    with transaction.atomic():
+        changed_keys = []
+        created, updated, _, unchanged = sync_players(country_code, rows, changed_keys=changed_keys, batch_size=batch_size)
+        link_team_refs(country_code, models=[Player])
+        archive_squads(country_code, keys=changed_keys)
+    return created + updated + unchanged
+
+# --- INCREMENTAL SQUAD REFRESH ---
+
+def _teams_played_since(country_code, since):
+    """
+    Returns team names (as written in fixtures) with a result on or after `since`.
+    Returns None when fixture dates are unknown, so the caller can fall back to a full refresh.
+    """
+    fixtures = Fixture.objects.filter(country=country_code)
+    if not fixtures.filter(match_date__isnull=False).exists():
+        return None
+
+    teams = set()
+    for home, away in fixtures.filter(played=True, match_date__gte=since).values_list('home_team', 'away_team'):
+        teams.add(home)
+        teams.add(away)
+    return teams
+
+def _team_links_path(country):
+    # Same location the *SquadsScraper classes read from
+    return team_links_path(country)
+
+def save_team_links(country, links):
+    path = save_json(os.path.basename(team_links_path(country)), links)
+    logger.info(f"Saved {len(links)} {country} team links to {path}")
+
+def _load_team_link_names(country):
+    path = _team_links_path(country)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [t.get("team") for t in json.load(f) if t.get("team")]
+
+def _squad_teams_to_refresh(country):
+    """
+    Picks the squad (link file) team names that played since the last squads refresh.
+    Returns None when a full refresh is needed.
+    """
+    country_code = _get_country_code(country)
+    last_refresh = Player.objects.filter(country=country_code).aggregate(last=Max('updated_at'))['last']
+    if last_refresh is None:
+        return None
+
+    played = _teams_played_since(country_code, timezone.localdate(last_refresh))
+    if played is None:
+        return None
+
+    link_names = _load_team_link_names(country)
+    if not link_names:
+        return None
+
+    selected = set()
+    for fixture_team in played:
+        matches = [n for n in link_names if same_team(fixture_team, n)]
+        if not matches:
+            matches = get_close_matches(fixture_team, link_names, n=1, cutoff=0.6)
+        if matches:
+            selected.update(matches)
+        else:
+            logger.warning(f"Squad refresh: no team link matches fixture team '{fixture_team}' ({country})")
+    return selected
+
 # --- SYNC WRAPPERS (Backward Compatibility) ---
 
 def sync_standings(country):
+    country_code = _get_country_code(country)
+    if not reconcile_due(country_code):
+        # Table follows from the stored fixture results; the scraped one is only used to reconcile
+        changed = update_standings(country_code)
+        return True, f"Standings for {country} derived from fixtures ({changed} rows changed)."
     data = fetch_standings(country)
     if not data: return False, f"No standings found for {country}"
     return save_standings(country, data)
@@ -196,9 +300,20 @@ def sync_fixtures(country):
     return save_fixtures(country, data)
 
 def sync_squads(country):
-    data = fetch_squads(country)
+    teams = _squad_teams_to_refresh(country)
+    if teams is not None and not teams:
+        return True, f"No {country} team played since the last squads refresh."
+
+    if teams is None:
+        logger.info(f"Full squads refresh for {country}")
+    else:
+        logger.info(f"Incremental squads refresh for {country}: {sorted(teams)}")
+
+    data = fetch_squads(country, only_teams=teams)
     if not data: return False, f"No squads found for {country}"
-    return save_squads(country, data)
+    # Scope the upsert to teams actually scraped so a failed page never wipes a squad
+    scraped_teams = {player_fields(row)['team_name'] for row in data}
+    return save_squads(country, data, teams=scraped_teams if teams is not None else None)
 
 # --- WRAPPERS FOR TASK REGISTRY ---
 
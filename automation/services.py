@@ -3,7 +3,8 @@ from io import StringIO
 import sys
 from django.core.management import call_command
 from django.conf import settings
-from data_manager.models import BilyonerBulletin, BilyonerBulletinStaging
+from data_manager.bulletin import publish_staging, rollback_bulletin, prune_bulletin_versions
+from data_manager.exports import EXPORTS, export_to_file, prune_exports
 from betting_engine.models import Coupon, BilyonerCredential
 from betting_engine.utils import generate_coupon
 from betting_engine.bot import BilyonerBot
@@ -36,36 +37,56 @@ def publish_staged_data():
     Eski bülten verilerini siler ve yenilerini yazar.
     """
     try:
-        staging_items = BilyonerBulletinStaging.objects.all()
-        count = staging_items.count()
+        count = publish_staging()
         if count == 0:
             return True, "No data in staging to publish."
-
-        # Clear Live
-        BilyonerBulletin.objects.all().delete()
-        
-        # Move
-        for s in staging_items:
-            BilyonerBulletin.objects.create(
-                unique_key=s.unique_key,
-                country=s.country,
-                league=s.league,
-                match_time=s.match_time,
-                home_team=s.home_team,
-                away_team=s.away_team,
-                ms_1=s.ms_1,
-                ms_x=s.ms_x,
-                ms_2=s.ms_2,
-                under_2_5=s.under_2_5,
-                over_2_5=s.over_2_5
-            )
-        
-        # Clear Staging
-        staging_items.delete()
         return True, f"Published {count} matches to Live Bulletin."
     except Exception as e:
         return False, str(e)
 
+def rollback_bulletin_version():
+    """
+    [YAYINLAMA] Canlı bülteni bir önceki yayınlanmış versiyona geri alır.
+    Sadece 'güncel versiyon' işaretçisi değişir; veri kopyalanmaz.
+    """
+    try:
+        version = rollback_bulletin()
+        if version is None:
+            return False, "No previous bulletin version to roll back to."
+        return True, f"Rolled back to bulletin v{version.id} ({version.row_count} matches)."
+    except Exception as e:
+        return False, str(e)
+
+def prune_old_bulletin_versions():
+    """
+    [BAKIM] Eski bülten versiyonlarını siler (güncel + son BULLETIN_KEEP_VERSIONS versiyon korunur).
+    """
+    try:
+        deleted = prune_bulletin_versions(keep=settings.BULLETIN_KEEP_VERSIONS)
+        return True, f"Pruned {deleted} old bulletin versions."
+    except Exception as e:
+        return False, str(e)
+
+def export_results():
+    """
+    [DIŞA AKTARMA] Tüm ana tabloları (puan durumu, fikstür, kadrolar, bülten, sezon arşivi,
+    kuponlar, görev logları) EXPORT_DIR altına sıkıştırılmış (gzip) EXPORT_FORMAT dosyası olarak yazar.
+    Her tablo için son EXPORT_KEEP_FILES dosya saklanır.
+    """
+    lines = []
+    failed = []
+    for name in EXPORTS:
+        try:
+            path, count = export_to_file(name, settings.EXPORT_FORMAT)
+            lines.append(f"{name}: {count} rows -> {path}")
+        except Exception as e:
+            failed.append(name)
+            lines.append(f"{name}: HATA {e}")
+    removed = prune_exports()
+    if removed:
+        lines.append(f"Pruned {removed} old export files.")
+    return not failed, "\n".join(lines)
+
 def generate_analysis_coupons():
     """
     Generates analysis coupons based on current bulletin.
@@ -408,11 +429,14 @@ from .scraper_tasks import (
     sync_spain_standings, sync_spain_fixtures, sync_spain_squads,
     sync_italy_standings, sync_italy_fixtures, sync_italy_squads
 )
+from .detail_tasks import crawl_detail_pages
 
 # Service Registry
 TASK_REGISTRY = {
     'scrape_bulletin': scrape_bilyoner_bulletin,
     'publish_data': publish_staged_data,
+    'rollback_bulletin': rollback_bulletin_version,
+    'prune_bulletin_versions': prune_old_bulletin_versions,
     'generate_coupons': generate_analysis_coupons,
     'auto_play': auto_play_pending_coupons,
     
@@ -438,6 +462,9 @@ TASK_REGISTRY = {
     'sync_italy_fixtures': sync_italy_fixtures,
     'sync_italy_squads': sync_italy_squads,
 
+    # --- Detail Pages (match reports / player profiles) ---
+    'crawl_detail_pages': crawl_detail_pages,
+
     'cleanup_old_logs': lambda: (True, "Old logs cleanup placeholder"),
-    'export_results': lambda: (True, "Export results placeholder"),
+    'export_results': export_results,
 }
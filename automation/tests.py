@@ -1,3 +1,129 @@
-from django.test import TestCase
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
 
-# Create your tests here.
+from automation.models import TaskLog
+from league_system.db import WriteQueue
+from league_system.log_config import SampleFilter
+from scraper.storage import iter_json_items
+
+
+class DbStressTests(TransactionTestCase):
+    """
+    Threaded write/read workload of the db_stress command: no 'database is locked' errors.
+    """
+    def run_stress(self, *args):
+        out = StringIO()
+        # CommandError on any lock or database error
+        call_command('db_stress', '--threads', '8', '--seconds', '2', *args, stdout=out)
+        self.assertIn(' 0 lock errors, 0 other errors', out.getvalue())
+        self.assertFalse(TaskLog.objects.filter(task_name='db_stress').exists())
+
+    def test_direct_writes(self):
+        self.run_stress()
+
+    def test_queued_writes(self):
+        self.run_stress('--queue')
+
+
+class WriteQueueTests(TransactionTestCase):
+    def setUp(self):
+        self.queue = WriteQueue()
+
+    def tearDown(self):
+        self.queue.flush()
+
+    def test_failing_job_is_rolled_back_alone(self):
+        def failing():
+            TaskLog.objects.create(task_name='queued', status='FAILED')
+            raise ValueError("boom")
+
+        release = threading.Event()
+        self.queue.submit(release.wait, 10)  # holds the writer so the next jobs share a batch
+        first = self.queue.submit(TaskLog.objects.create, task_name='queued', status='SUCCESS')
+        broken = self.queue.submit(failing)
+        last = self.queue.submit(TaskLog.objects.create, task_name='queued', status='RUNNING')
+        release.set()
+
+        self.assertEqual(first.result(10).status, 'SUCCESS')
+        self.assertEqual(last.result(10).status, 'RUNNING')
+        with self.assertRaises(ValueError):
+            broken.result(10)
+        self.assertEqual(
+            sorted(TaskLog.objects.filter(task_name='queued').values_list('status', flat=True)),
+            ['RUNNING', 'SUCCESS'],
+        )
+
+    def test_futures_resolve_after_commit(self):
+        release, started, holding = threading.Event(), threading.Event(), threading.Event()
+
+        def hold():
+            holding.set()
+            release.wait(10)
+
+        self.queue.submit(started.wait, 10)
+        written = self.queue.submit(TaskLog.objects.create, task_name='queued', status='SUCCESS')
+        self.queue.submit(hold)  # same batch as the write, still running
+        started.set()
+        self.assertTrue(holding.wait(10))
+
+        # The row is written but its batch has not committed: not resolved, not visible
+        self.assertFalse(written.done())
+        self.assertFalse(TaskLog.objects.filter(task_name='queued').exists())
+
+        release.set()
+        written.result(10)
+        self.assertTrue(TaskLog.objects.filter(task_name='queued').exists())
+
+
+class IterJsonItemsTests(SimpleTestCase):
+    """
+    Snapshot files read by seed_squads: same result as json.load, whatever the chunk size.
+    """
+    def parse(self, text, chunk_size):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return list(iter_json_items(path, chunk_size=chunk_size))
+
+    def test_items_match_json_load(self):
+        items = [{'team': 'Beşiktaş', 'goals': 12}, -2.5e-7, 350, 'x', [], None, True]
+        for text in (json.dumps(items), json.dumps(items, indent=2), '[ 3.5e2 , 10 ]', '[]'):
+            for chunk_size in (1, 3, 1 << 16):
+                self.assertEqual(self.parse(text, chunk_size), json.loads(text), (text, chunk_size))
+
+    def test_malformed_arrays_raise(self):
+        for text in ('[1 2]', '["a" "b"]', '[,1]', '[1,,2]', '[1,]', '[1, 2', '{"a": 1}'):
+            for chunk_size in (1, 1 << 16):
+                with self.assertRaises(ValueError, msg=(text, chunk_size)):
+                    self.parse(text, chunk_size)
+
+
+class SampleFilterTests(SimpleTestCase):
+    def test_child_logger_records_are_sampled_once_per_record(self):
+        parent = logging.getLogger('sample_test')
+        child = logging.getLogger('sample_test.child')
+        sample = SampleFilter(rate=3)
+        handlers = []
+        for _ in range(2):
+            handler = logging.handlers.BufferingHandler(100)
+            handler.addFilter(sample)
+            parent.addHandler(handler)
+            handlers.append(handler)
+        self.addCleanup(lambda: [parent.removeHandler(h) for h in handlers])
+        parent.setLevel(logging.DEBUG)
+        self.addCleanup(parent.setLevel, logging.NOTSET)
+
+        for i in range(6):
+            child.debug("Scroll step", extra={"sample": "test.scroll", "scroll": i})
+        child.info("Done", extra={"sample": "test.scroll"})
+        for handler in handlers:
+            self.assertEqual([r.getMessage() for r in handler.buffer], ["Scroll step", "Scroll step", "Done"])
+            self.assertEqual([getattr(r, 'scroll', None) for r in handler.buffer], [0, 3, None])
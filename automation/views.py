@@ -4,9 +4,8 @@ from .models import Workflow, Task, WorkflowStep, TaskLog
 from .runner import execute_workflow, execute_single_task
 
 from .services import TASK_REGISTRY
-import threading
 import logging
-from django.db import connection
+from league_system.db import start_db_thread
 
 logger = logging.getLogger('automation')
 
@@ -24,20 +23,13 @@ def dashboard(request):
         countries = ['Turkey', 'England', 'Spain', 'Italy']
         data_tasks = {}
         
+        kinds = ['standings', 'fixtures', 'squads']
+        names = [f'sync_{country.lower()}_{kind}' for country in countries for kind in kinds]
+        tasks = {task.name: task for task in Task.objects.filter(name__in=names)}
         for country in countries:
-            c_lower = country.lower()
-            # Find tasks by name convention defined in registry
-            # We need to ensure tasks are synced first (sync_tasks run at least once)
-            t_standings = Task.objects.filter(name=f'sync_{c_lower}_standings').first()
-            t_fixtures = Task.objects.filter(name=f'sync_{c_lower}_fixtures').first()
-            t_squads = Task.objects.filter(name=f'sync_{c_lower}_squads').first()
-            
-            data_tasks[country] = {
-                'standings': t_standings,
-                'fixtures': t_fixtures,
-                'squads': t_squads,
-            }
-            
+            # Tasks are found by the name convention of the registry (sync_tasks must have run once)
+            data_tasks[country] = {kind: tasks.get(f'sync_{country.lower()}_{kind}') for kind in kinds}
+
         return render(request, 'automation/dashboard.html', {
             'workflows': workflows,
             'recent_logs': recent_logs,
@@ -55,14 +47,7 @@ def task_run_direct(request, pk):
     """
     task = get_object_or_404(Task, pk=pk)
     
-    def run_thread():
-        # Ensure DB connection is clean for thread
-        connection.close()
-        execute_single_task(pk)
-        connection.close()
-        
-    t = threading.Thread(target=run_thread)
-    t.start()
+    start_db_thread(execute_single_task, pk)
     
     messages.info(request, f"Görev '{task.name}' arkaplanda başlatıldı.")
     return redirect('task_list')
@@ -75,9 +60,6 @@ def task_list(request):
     return render(request, 'automation/task_list.html', {'tasks': tasks})
 
 from .services import TASK_REGISTRY
-import threading
-from django.db import connection
-
 def sync_tasks(request):
     """
     Syncs available tasks from services.py to Database.
@@ -186,14 +168,7 @@ def workflow_run(request, pk):
     """
     workflow = get_object_or_404(Workflow, pk=pk)
     
-    def run_thread():
-        # Ensure DB connection is clean for thread
-        connection.close()
-        execute_workflow(pk)
-        connection.close()
-        
-    t = threading.Thread(target=run_thread)
-    t.start()
+    start_db_thread(execute_workflow, pk)
     
     messages.info(request, f"Worflow '{workflow.name}' arkaplanda başlatıldı.")
     return redirect('workflow_list')
@@ -273,18 +248,13 @@ def fetch_data_view(request, country, data_type):
                 def run_thread():
                     logger_t = logging.getLogger('automation')
                     logger_t.info(f"THREAD STARTED: {task_name} (ID: {task.pk})")
-                    connection.close()  # Ensure clean DB connection
-                    # We use a fresh thread execution
                     try:
                         execute_single_task(task.pk)
                         logger_t.info(f"THREAD COMPLETED: {task_name}")
                     except Exception as e:
                         logger_t.error(f"Thread execution failed for {task_name}: {e}")
-                    finally:
-                        connection.close()
                 
-                t = threading.Thread(target=run_thread)
-                t.start()
+                start_db_thread(run_thread)
                 logger.info(f"Spawned background thread for {task_name}")
                 
                 messages.success(request, f"{country.title()} Squads scraping started in BACKGROUND. Check logs for progress.")
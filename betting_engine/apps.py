@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BettingEngineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'betting_engine'
+
+    def ready(self):
+        from .search import setup_search
+        # Coupon search index (pg_trgm / SQLite FTS5) is created outside the migrations
+        post_migrate.connect(setup_search, sender=self)
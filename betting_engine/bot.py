@@ -1,6 +1,9 @@
 from playwright.sync_api import sync_playwright
 import time
 import re
+import logging
+
+logger = logging.getLogger('betting_engine')
 
 class BilyonerBot:
     def __init__(self, username, password, headless=None):
@@ -19,7 +22,7 @@ class BilyonerBot:
         else:
             self.headless = headless
             
-        print(f"Bot initialized. Headless Mode: {self.headless}")
+        logger.info(f"Bot initialized. Headless Mode: {self.headless}")
 
     def start(self):
         self.playwright = sync_playwright().start()
@@ -47,7 +50,7 @@ class BilyonerBot:
         if self.headless:
             args.append("--headless=new")
         
-        print(f"Launching browser context from: {user_data_dir}")
+        logger.info(f"Launching browser context from: {user_data_dir}")
         self.browser = self.playwright.chromium.launch_persistent_context(
             user_data_dir,
             headless=self.headless,
@@ -68,22 +71,22 @@ class BilyonerBot:
         
     def login(self):
         try:
-            print("Step 1: Navigating to Login Page...")
+            logger.info("Step 1: Navigating to Login Page...")
             self.page.goto("https://www.bilyoner.com/giris-yap")
             
             # Check if already logged in
             if self.page.is_visible(".account-menu") or "iddaa" in self.page.url:
-                 print("Already logged in (Session restored)!")
+                 logger.info("Already logged in (Session restored)!")
                  return True
 
-            print("Step 2: Attempting to Fill Credentials...")
+            logger.info("Step 2: Attempting to Fill Credentials...")
             try:
                 # Short timeout to check if inputs exist. If not, maybe we are logged in.
                 if self.page.locator("input[name='username']").is_visible(timeout=3000):
                     self.page.fill("input[name='username']", self.username)
                     self.page.fill("input[name='password']", self.password)
                     
-                    print("Step 3: Submitting Login...")
+                    logger.info("Step 3: Submitting Login...")
                     try:
                         # Use no_wait_after=True to prevent hanging if the SPA handles transition without page load event
                         self.page.click("button[type='submit']", timeout=5000)
@@ -92,28 +95,28 @@ class BilyonerBot:
                         try: self.page.get_by_text("Giriş Yap", exact=True).click(timeout=3000)
                         except: pass
                 else:
-                    print("Login inputs not found (Assuming already logged in or different page). Proceeding immediately!")
+                    logger.warning("Login inputs not found (Assuming already logged in or different page). Proceeding immediately!")
                     return True # Assume success, skip waiting loop
             except Exception as e:
-                 print(f"Credential fill skipped/failed: {e}")
+                 logger.warning(f"Credential fill skipped/failed: {e}")
                  # Still continue, don't return False here
 
-            print("Step 4: Verifying Login Status (Waiting up to 10s)...")
+            logger.info("Step 4: Verifying Login Status (Waiting up to 10s)...")
             timeout = 10 
             start_time = time.time()
             
             while time.time() - start_time < timeout:
                 # Check for various success indicators
                 if "iddaa" in self.page.url or self.page.is_visible("text='Hesabım'") or self.page.is_visible(".account-menu"):
-                    print("Login successful! Proceeding...")
+                    logger.info("Login successful! Proceeding...")
                     return True
                 time.sleep(1)
             
-            print("Login timed out. Proceeding anyway (assuming manual login)...")
+            logger.warning("Login timed out. Proceeding anyway (assuming manual login)...")
             return True 
                     
         except Exception as e:
-            print(f"Login process error: {e}")
+            logger.error(f"Login process error: {e}")
             return True # Fallback
 
     def play_coupon(self, coupon_items, amount, skip_verification=False):
@@ -121,7 +124,7 @@ class BilyonerBot:
         Main logic: Login -> New Tab -> Add Matches -> Open Slip -> (Verify) -> Submit
         skip_verification: If True, bypasses all checks and submits immediately.
         """
-        print(f"Starting Bilyoner automation for {len(coupon_items)} matches...")
+        logger.info(f"Starting Bilyoner automation for {len(coupon_items)} matches...")
         
         # Ensure browser is started BEFORE login
         if not self.browser:
@@ -129,12 +132,12 @@ class BilyonerBot:
                  return False
 
         if not self.login():
-            print("Login failed! Aborting.")
+            logger.error("Login failed! Aborting.")
             return False
 
         try:
             # 1. Open New Tab for Betting
-            print("Opening new tab for betting operations...")
+            logger.info("Opening new tab for betting operations...")
             context = self.page.context
             new_page = context.new_page()
             self.page = new_page # Switch control to new tab
@@ -144,19 +147,19 @@ class BilyonerBot:
                 # Wait for search box or something
                 self.page.locator("input[type='text']").wait_for(timeout=10000)
             except Exception as e:
-                print(f"New tab navigation failed: {e}")
+                logger.error(f"New tab navigation failed: {e}")
 
-            print(f"Playing coupon with {len(coupon_items)} items...")
+            logger.info(f"Playing coupon with {len(coupon_items)} items...")
             
             for item in coupon_items:
                 # We are likely at the search page, find_and_select_match handle interactions
                 if not self.find_and_select_match(item):
-                    print(f"Skipping item {item} due to error.")
+                    logger.warning(f"Skipping item {item} due to error.")
                     continue
                 time.sleep(1)
                 
             # Loop finished, all matches added
-            print("All matches selected. Waiting 3 seconds as requested...")
+            logger.info("All matches selected. Waiting 3 seconds as requested...")
             time.sleep(3)
             
             # 3. Handle Cookie Popup (Fast check)
@@ -167,7 +170,7 @@ class BilyonerBot:
             except: pass
 
             # 4. Open Coupon Slip (Aggressive & Fast)
-            print("Opening Coupon Slip immediately...")
+            logger.info("Opening Coupon Slip immediately...")
             
             slip_opened = False
             # Strategy A: Total Odds Text (Most likely visible on green button)
@@ -176,10 +179,10 @@ class BilyonerBot:
                 for it in coupon_items: t_odds *= float(it.odds)
                 odds_str = "{:.2f}".format(t_odds).replace(".", ",")
                 
-                print(f"Looking for odds text: {odds_str}")
+                logger.info(f"Looking for odds text: {odds_str}")
                 btn_odds = self.page.get_by_text(odds_str, exact=True).last
                 if btn_odds.is_visible():
-                     print(f"Clicking Odds '{odds_str}'...")
+                     logger.info(f"Clicking Odds '{odds_str}'...")
                      btn_odds.click(force=True)
                      slip_opened = True
             except: pass
@@ -189,14 +192,14 @@ class BilyonerBot:
                 try:
                     btn_mac = self.page.locator("text=/\\d+\\s*Maç/").last
                     if btn_mac.is_visible():
-                        print("Clicking 'Maç' button...")
+                        logger.info("Clicking 'Maç' button...")
                         btn_mac.click(force=True)
                         slip_opened = True
                 except: pass
 
             if not slip_opened:
                  # Strategy C: Blind Click (Bottom Right)
-                 print("Selectors failed. Doing Blind Click on Bottom Right...")
+                 logger.warning("Selectors failed. Doing Blind Click on Bottom Right...")
                  try:
                     vp = self.page.viewport_size
                     if vp:
@@ -208,10 +211,10 @@ class BilyonerBot:
             try:
                 self.page.get_by_text("HEMEN OYNA", exact=True).wait_for(timeout=3000)
             except:
-                print("Panel opening wait timed out (might already be open or click failed).")
+                logger.warning("Panel opening wait timed out (might already be open or click failed).")
 
             # 5. Set Amount (Destek: Kuruşlu Tutar)
-            print(f"Setting amount to {amount}...")
+            logger.info(f"Setting amount to {amount}...")
             # Virgül ile formatla: 25.50 -> "25,50"
             amount_str = "{:.2f}".format(amount).replace(".", ",")
             
@@ -220,7 +223,7 @@ class BilyonerBot:
                 misli_input = self.page.locator("input[data-cy='amount-input'], input[name='amount'], input.amount-input, input[type='tel']").first
                 
                 if misli_input.is_visible(timeout=3000):
-                    print(f"Found amount input. Typing: {amount_str}")
+                    logger.info(f"Found amount input. Typing: {amount_str}")
                     misli_input.click()
                     misli_input.fill("")
                     time.sleep(0.2)
@@ -230,7 +233,7 @@ class BilyonerBot:
                     self.page.keyboard.press("Tab")
                     time.sleep(1)
                 else:
-                    print("Amount input not found via primary selectors. Searching broadly...")
+                    logger.warning("Amount input not found via primary selectors. Searching broadly...")
                     # Fallback: Focus on any visible numeric input in the slip area
                     inputs = self.page.locator("#coupon-container input").all()
                     for inp in inputs:
@@ -240,12 +243,10 @@ class BilyonerBot:
                             inp.press("Enter")
                             break
             except Exception as e: 
-                print(f"Error setting amount: {e}")
+                logger.warning(f"Error setting amount: {e}")
 
             # 5. VERIFY COUPON CONTENT (USER CONTROLLED)
-            print("\n" + "="*40)
-            print("KUPON HAZIRLANDI. KONTROL AŞAMASI...") 
-            print("="*40)
+            logger.info("KUPON HAZIRLANDI. KONTROL AŞAMASI...")
             
             # Interactive prompt ONLY if not skipped via argument
             if not skip_verification:
@@ -256,19 +257,19 @@ class BilyonerBot:
                     # So we must assume verification is ON unless explicitly disabled via arg.
                     # Or we skip 'input' entirely in automated mode.
                     # For now, let's just log.
-                    print("Running in automated mode. Using 'skip_verification' argument value:", skip_verification)
+                    logger.info(f"Running in automated mode. Using 'skip_verification' argument value: {skip_verification}")
                     # user_choice = input("Kupon kontrolü yapılsın mı? (Kapatmak için 'h' veya 'kapat' yazın, yoksa Enter): ").strip().lower()
                 except: pass
             
             if skip_verification:
-                print(">> KULLANICI TERCİHİ: KUPON KONTROLÜ KAPATILDI. <<")
+                logger.info(">> KULLANICI TERCİHİ: KUPON KONTROLÜ KAPATILDI. <<")
             else:
-                print(">> KUPON KONTROLÜ AKTİF <<")
+                logger.info(">> KUPON KONTROLÜ AKTİF <<")
 
             verification_passed = True
             
             if not skip_verification:
-                print("Verifying coupon content against request...")
+                logger.info("Verifying coupon content against request...")
                 try:
                     # Issue: 'HEMEN OYNA' container might just be the button div, missing the list above.
                     # Fix: Get the button, then traverse up to find the main coupon container
@@ -282,26 +283,26 @@ class BilyonerBot:
                         
                         # Backup: if that's too small, try body but filter for coupon area
                         if len(slip_content) < 50:
-                            print("Panel content too short, trying broader extraction...")
+                            logger.warning("Panel content too short, trying broader extraction...")
                             slip_content = self.page.locator(".coupon-container, div[class*='coupon']").first.text_content() or self.page.locator("body").text_content()
                     else:
                         slip_content = self.page.locator("body").text_content()
 
                 except Exception as e:
-                    print(f"Content read error: {e}. Using body fallback.")
+                    logger.warning(f"Content read error: {e}. Using body fallback.")
                     slip_content = self.page.locator("body").text_content()
                     
                 # Clean content for robust check
                 slip_content = re.sub(r'\s+', ' ', slip_content).strip()
 
                 if not slip_content:
-                    print("CRITICAL: content is empty. Cannot verify.")
+                    logger.error("CRITICAL: content is empty. Cannot verify.")
                     # If verification was requested but failed to get content, fail safe? 
                     # Or assume body read error? Let's fail safe.
                     verification_passed = False
                 else: 
                     # Debug: Print MORE content to see where teams are hiding
-                    print(f"Slip Content (First 500 chars): {slip_content[:500]}")
+                    logger.info(f"Slip Content (First 500 chars): {slip_content[:500]}")
                     
                     for item in coupon_items:
                         # 1. Verify Teams (Fuzzy check)
@@ -313,7 +314,7 @@ class BilyonerBot:
                             return False
 
                         if not is_team_in_text(item.home_team, slip_content) and not is_team_in_text(item.away_team, slip_content):
-                             print(f"VERIFICATION FAILED: Neither '{item.home_team}' nor '{item.away_team}' matched in slip text.")
+                             logger.error(f"VERIFICATION FAILED: Neither '{item.home_team}' nor '{item.away_team}' matched in slip text.")
                              verification_passed = False
                              break
                         
@@ -335,20 +336,20 @@ class BilyonerBot:
                              except: pass
                         
                         if odds_matched:
-                            print(f"Verified odds: {item.odds}")
+                            logger.info(f"Verified odds: {item.odds}")
                         else:
-                            print(f"WARNING: Exact odds {item.odds} not found. Proceeding on Team Name match.")
+                            logger.warning(f"WARNING: Exact odds {item.odds} not found. Proceeding on Team Name match.")
                              
-                        print(f"Verified item: {item.home_team} vs {item.away_team}")
+                        logger.info(f"Verified item: {item.home_team} vs {item.away_team}")
             
             if not verification_passed:
-                print("CRITICAL: Verification failed (Teams not found). Aborting.")
+                logger.error("CRITICAL: Verification failed (Teams not found). Aborting.")
                 return False
                 
-            print("Coupon VERIFIED successfully. Ready to submit.")
+            logger.info("Coupon VERIFIED successfully. Ready to submit.")
 
             # 6. SUBMIT - HEMEN OYNA (REAL ACTION ENABLED)
-            print("Clicking HEMEN OYNA (REAL BET)...")
+            logger.info("Clicking HEMEN OYNA (REAL BET)...")
             try:
                 # Only click if verified
                 if verification_passed:
@@ -362,41 +363,41 @@ class BilyonerBot:
                         # Check for "Onayla" button (sometimes appears as a secondary confirmation)
                         confirm_btn = self.page.get_by_text("Onayla").first
                         if confirm_btn.is_visible():
-                            print("Confirming bet...")
+                            logger.info("Confirming bet...")
                             confirm_btn.click()
                         
-                        print("Coupon submitted successfully! GOOD LUCK!")
+                        logger.info("Coupon submitted successfully! GOOD LUCK!")
                         return True
                     else:
-                         print("HEMEN OYNA button not found!")
+                         logger.error("HEMEN OYNA button not found!")
                          return False
                 else:
-                    print("Submission skipped due to verification failure.")
+                    logger.warning("Submission skipped due to verification failure.")
                     return False
             except Exception as e:
-                 print(f"Submission error: {e}")
+                 logger.error(f"Submission error: {e}")
                  return False
             
         except Exception as e:
-            print(f"Error playing coupon: {e}")
+            logger.error(f"Error playing coupon: {e}")
             return False
             
     def find_and_select_match(self, item):
         """
         Directly navigates to the search page and searches for the team.
         """
-        print(f"Processing match: {item.home_team} vs {item.away_team}")
+        logger.info(f"Processing match: {item.home_team} vs {item.away_team}")
         
         # 1. DIRECT NAVIGATION (User Request)
         search_url = "https://www.bilyoner.com/anasayfa-arama"
-        print(f"Navigating directly to search page...")
+        logger.info(f"Navigating directly to search page...")
         
         try:
             self.page.goto(search_url)
             # Wait a bit for page to initialize
             time.sleep(3)
         except Exception as e:
-            print(f"Navigation error: {e}")
+            logger.error(f"Navigation error: {e}")
 
         # 2. Handle Popups (Restore Pages / Crash warnings)
         try:
@@ -412,24 +413,24 @@ class BilyonerBot:
             
             # Check visibility
             if not search_input.is_visible():
-                print("Search input not visible immediately, waiting...")
+                logger.warning("Search input not visible immediately, waiting...")
                 search_input.wait_for(state="visible", timeout=5000)
             
             search_input.click()
             search_input.clear()
             
-            print(f"Typing team name: {item.home_team}")
+            logger.info(f"Typing team name: {item.home_team}")
             search_input.type(item.home_team, delay=100)
             time.sleep(1)
             
-            print("Pressing Enter...")
+            logger.info("Pressing Enter...")
             search_input.press("Enter")
             
             # Wait for results to load
             time.sleep(4)
             
         except Exception as e:
-            print(f"Search input interaction failed: {e}")
+            logger.error(f"Search input interaction failed: {e}")
             return False
 
         # 4. Select Match from Results
@@ -438,21 +439,21 @@ class BilyonerBot:
         # 3. Find and Click Match in Search Results (To go to Detail Page)
         match_found = False
         try:
-            print(f"Locating match '{item.home_team}' in search results...")
+            logger.info(f"Locating match '{item.home_team}' in search results...")
             
             # Use text locator for Home Team in the results list
             match_text = self.page.get_by_text(item.home_team, exact=False).first
             
             if match_text.is_visible(timeout=5000):
-                 print("Match found by Home Team! Clicking...")
+                 logger.info("Match found by Home Team! Clicking...")
                  match_text.click()
                  match_found = True
             else:
-                 print("Home team not found. Trying Away Team...")
+                 logger.warning("Home team not found. Trying Away Team...")
                  raise Exception("Home team not found")
                  
         except Exception as e:
-            print(f"Primary search failed: {e}. Attempting fallback with Away Team...")
+            logger.warning(f"Primary search failed: {e}. Attempting fallback with Away Team...")
             
             # FALLBACK: Search by Away Team
             try:
@@ -464,7 +465,7 @@ class BilyonerBot:
                     search_input.press("Control+A")
                     search_input.press("Backspace")
                     
-                    print(f"Typing AWAY team name: {item.away_team}")
+                    logger.info(f"Typing AWAY team name: {item.away_team}")
                     search_input.type(item.away_team, delay=100)
                     time.sleep(1)
                     search_input.press("Enter")
@@ -473,38 +474,38 @@ class BilyonerBot:
                     # Try finding match again
                     match_text_away = self.page.get_by_text(item.away_team, exact=False).first
                     if match_text_away.is_visible(timeout=5000):
-                         print("Match found by Away Team! Clicking...")
+                         logger.info("Match found by Away Team! Clicking...")
                          match_text_away.click()
                          match_found = True
                     else:
-                         print("Away team also not found.")
+                         logger.error("Away team also not found.")
             except Exception as ex:
-                print(f"Fallback search error: {ex}")
+                logger.error(f"Fallback search error: {ex}")
 
         if not match_found:
-             print("CRITICAL: Match could not be found by either team name.")
+             logger.error("CRITICAL: Match could not be found by either team name.")
              return False
 
         # Wait for Detail Page to Load
         # Screenshot 2 shows "Oranlar", "İstatistik" tabs.
-        print("Waiting for detail page...")
+        logger.info("Waiting for detail page...")
         try:
             self.page.get_by_text("Oranlar").wait_for(timeout=10000)
-            print("Detail page loaded.")
+            logger.info("Detail page loaded.")
         except:
-            print("Detail page load warning (might be slow or different structure). Continuing...")
+            logger.warning("Detail page load warning (might be slow or different structure). Continuing...")
 
         time.sleep(2) # Stabilize
         
         # 4. Select Prediction on Detail Page
         prediction = item.prediction.strip()
-        print(f"Selecting prediction: {prediction}")
+        logger.info(f"Selecting prediction: {prediction}")
         
         found_button = False
         
         # Logic for "Maç Sonucu" (MS 1, MS 0, MS 2, MS X)
         if "MS" in prediction or prediction in ["1", "X", "0", "2"]:
-            print("Category: Match Result")
+            logger.info("Category: Match Result")
             label_map = {
                 "MS 1": "MS 1", "1": "MS 1",
                 "MS X": "MS X", "MS 0": "MS X", "X": "MS X", "0": "MS X",
@@ -514,44 +515,44 @@ class BilyonerBot:
             
             btn = self.page.get_by_text(target_label, exact=True).first
             if btn.is_visible():
-                print(f"Clicking {target_label}...")
+                logger.info(f"Clicking {target_label}...")
                 btn.click()
                 found_button = True
         
         # Logic for Over/Under (Alt/Üst)
         elif "Alt" in prediction or "Üst" in prediction:
-            print("Category: Over/Under")
+            logger.info("Category: Over/Under")
             parts = prediction.split(" ")
             if len(parts) >= 2:
                 threshold = parts[0].replace(".", ",") # 2.5 -> 2,5
                 side = parts[1] # Alt/Üst
                 target_text = f"{threshold} {side}" 
-                print(f"Looking for text: {target_text}")
+                logger.info(f"Looking for text: {target_text}")
                 
                 btn = self.page.get_by_text(target_text, exact=False).first
                 if btn.is_visible():
-                    print(f"Clicking {target_text}...")
+                    logger.info(f"Clicking {target_text}...")
                     btn.click()
                     found_button = True
 
         # General Fallback: Click by Odds Value (Risky but effective if unique)
         if not found_button:
             target_odds = str(item.odds).replace('.', ',')
-            print(f"Button not found by label. Trying by odds value: {target_odds}")
+            logger.warning(f"Button not found by label. Trying by odds value: {target_odds}")
             
             odds_btn = self.page.get_by_text(target_odds, exact=True).first
             if odds_btn.is_visible():
-                print(f"Clicking odds text: {target_odds}")
+                logger.info(f"Clicking odds text: {target_odds}")
                 odds_btn.click()
                 found_button = True
             else:
-                print("Could not find button by odds either.")
+                logger.error("Could not find button by odds either.")
         
         if found_button:
-            print("Selection made successfully.")
+            logger.info("Selection made successfully.")
             return True
         else:
-            print(f"FAILED to select prediction: {prediction}")
+            logger.error(f"FAILED to select prediction: {prediction}")
             return False
             
         return False
@@ -1,5 +1,6 @@
 from django.db import models
 from data_manager.models import BilyonerBulletin, CountryChoices
+from data_manager.teams import normalize_team_name
 
 class Coupon(models.Model):
     STATUS_CHOICES = [
@@ -17,13 +18,32 @@ class Coupon(models.Model):
     is_played = models.BooleanField(default=False, verbose_name="Oynandı mı?")
     is_archived = models.BooleanField(default=False, verbose_name="Arşivlendi mi?") 
     execution_status = models.CharField(max_length=20, default='', blank=True, verbose_name="Bot İşlem Durumu") # SUCCESS, FAILED
+    # Normalized team/league names of the items, indexed for the log search (see betting_engine.search)
+    search_text = models.TextField(blank=True, default='', editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at', '-id'], name='coupon_log_idx')]  # coupon_logs keyset ordering
 
     def __str__(self):
         return f"Kupon #{self.id} | {self.amount} TL | {self.get_status_display()}"
 
+    @staticmethod
+    def build_search_text(items):
+        """
+        'galatasaray fenerbahce super lig | ...' (Turkish-casefolded) from (home, away, league) tuples.
+        """
+        return " | ".join(normalize_team_name(f"{home} {away} {league or ''}") for home, away, league in items)
+
+    def refresh_search_text(self):
+        """
+        Rebuilds search_text from the stored items.
+        """
+        self.search_text = self.build_search_text(
+            self.items.order_by('id').values_list('home_team', 'away_team', 'league')
+        )
+        Coupon.objects.using(self._state.db).filter(pk=self.pk).update(search_text=self.search_text)
+
     def update_status(self):
         # Check all items, if any creates LOST -> Coupon LOST
         # If all WON -> Coupon WON
@@ -67,6 +87,19 @@ class CouponItem(models.Model):
     
     status = models.CharField(max_length=10, choices=Coupon.STATUS_CHOICES, default='PENDING')
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Status-only saves (result checks) leave the coupon's search text alone.
+        # New coupons are written through betting_engine.utils._add_items, which builds it once.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'home_team', 'away_team', 'league'} & set(update_fields):
+            self.coupon.refresh_search_text()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.coupon.refresh_search_text()
+        return result
+
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} - {self.prediction} ({self.odds})"
 
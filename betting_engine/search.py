@@ -0,0 +1,116 @@
+"""
+Coupon log search.
+
+Coupon.search_text holds the items' team and league names, Turkish-casefolded
+with normalize_team_name ('Beşiktaş' -> 'besiktas'), so a search needs no join
+with CouponItem. The substring match is served by an index created after migrate:
+  - PostgreSQL: pg_trgm GIN index (LIKE '%...%' uses it)
+  - SQLite: FTS5 table with the trigram tokenizer, kept in sync by triggers
+Terms shorter than 3 characters (no trigram) fall back to a plain LIKE.
+"""
+import logging
+from django.db import connection, connections, transaction, DatabaseError
+from django.db.models.expressions import RawSQL
+
+from data_manager.teams import normalize_team_name
+
+logger = logging.getLogger('automation')
+
+FTS_TABLE = 'betting_engine_coupon_fts'
+TRIGRAM_INDEX = 'coupon_search_trgm'
+
+POSTGRES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON betting_engine_coupon USING gin (search_text gin_trgm_ops)",
+]
+
+SQLITE_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_text, content='betting_engine_coupon', content_rowid='id', tokenize='trigram')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON betting_engine_coupon BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON betting_engine_coupon BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_text ON betting_engine_coupon BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+]
+
+
+def _fts_available(conn=connection):
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=%s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def install_search_index(using='default'):
+    """
+    Creates the search index of the database (idempotent). Returns True when an index exists.
+    """
+    conn = connections[using]
+    if conn.vendor == 'postgresql':
+        statements = POSTGRES_SQL
+    elif conn.vendor == 'sqlite':
+        statements = SQLITE_SQL
+    else:
+        return False
+
+    try:
+        with transaction.atomic(using=using):
+            with conn.cursor() as cursor:
+                created = conn.vendor == 'sqlite' and not _fts_available(conn)
+                for sql in statements:
+                    cursor.execute(sql)
+                if created:
+                    # External-content FTS starts empty: index the existing coupons once
+                    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        return True
+    except DatabaseError as e:
+        # e.g. no permission for CREATE EXTENSION, or SQLite without FTS5/trigram: LIKE still works
+        logger.warning(f"Coupon search index not installed ({conn.vendor}): {e}")
+        return False
+
+
+def backfill_search_text(using='default'):
+    """
+    Fills search_text of coupons written before the column existed. Returns the number updated.
+    """
+    from .models import Coupon
+
+    count = 0
+    for coupon in Coupon.objects.using(using).filter(search_text='', items__isnull=False).distinct().iterator():
+        coupon.refresh_search_text()
+        count += 1
+    return count
+
+
+def search_coupons(queryset, text):
+    """
+    Filters a Coupon queryset to coupons with an item whose teams/league contain `text`.
+    """
+    term = normalize_team_name(text)
+    if not term:
+        return queryset
+    # The index lives in the database the query is read from (the replica if routed there)
+    if len(term) >= 3 and _fts_available(connections[queryset.db]):
+        phrase = '"' + term.replace('"', '""') + '"'
+        return queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [phrase]))
+    return queryset.filter(search_text__contains=term)
+
+
+def setup_search(sender, using='default', **kwargs):
+    """
+    post_migrate handler: backfill, then index. Skipped while the coupon table does not
+    exist (e.g. `migrate` on a fresh database: the app has no migrations, syncdb creates it).
+    """
+    from .models import Coupon
+
+    if Coupon._meta.db_table not in connections[using].introspection.table_names():
+        return
+    backfill_search_text(using)
+    install_search_index(using)
@@ -1,3 +1,42 @@
 from django.test import TestCase
 
-# Create your tests here.
+from data_manager.models import BilyonerBulletin
+from .models import Coupon
+from .search import search_coupons
+from .utils import _add_items
+
+
+class CouponItemsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.picks = [
+            {'bulletin': BilyonerBulletin.objects.create(
+                country='TURKEY', unique_key=f"k{i}", match_time='20:00', league='Süper Lig',
+                home_team=home, away_team=away, odds_1=2, odds_x=3, odds_2=4,
+            ), 'pick': 'MS 1', 'odds': 2.0}
+            for i, (home, away) in enumerate([('Beşiktaş', 'Göztepe'), ('Galatasaray', 'Fenerbahçe'),
+                                              ('Kasımpaşa', 'Başakşehir')])
+        ]
+
+    def test_items_and_search_text_are_written_once(self):
+        coupon = Coupon.objects.create(amount=50)
+        # One INSERT for the items, one UPDATE for the coupon
+        with self.assertNumQueries(2):
+            _add_items(coupon, self.picks)
+            coupon.save()
+        self.assertEqual(coupon.items.count(), 3)
+        stored = Coupon.objects.get(pk=coupon.pk).search_text
+        coupon.refresh_search_text()
+        self.assertEqual(stored, coupon.search_text)
+        self.assertIn('besiktas goztepe super lig', stored)
+
+        found = search_coupons(Coupon.objects.all(), 'FENERBAHÇE')
+        self.assertEqual(list(found), [coupon])
+        self.assertFalse(search_coupons(Coupon.objects.all(), 'Trabzonspor').exists())
+
+    def test_item_edit_refreshes_search_text(self):
+        coupon = Coupon.objects.create(amount=50)
+        item, = _add_items(coupon, self.picks[:1])
+        item.home_team = 'Trabzonspor'
+        item.save()
+        self.assertIn('trabzonspor', Coupon.objects.get(pk=coupon.pk).search_text)
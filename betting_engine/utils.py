@@ -1,9 +1,26 @@
 from decimal import Decimal
 from django.utils import timezone
-from data_manager.models import BilyonerBulletin, Fixture
-from analysis.engine import MatchAnalyzer
+from data_manager.models import BilyonerBulletin, Fixture, NEWEST_FIRST
+from analysis.batch import analyze_matches
 from .models import Coupon, CouponItem
 from django.db.models import Q
+from league_system.routers import use_replica
+
+def _add_items(coupon, picks):
+    """
+    Writes the coupon's items in one INSERT and sets its search_text for the coupon.save() that follows.
+    """
+    items = CouponItem.objects.bulk_create([
+        CouponItem(
+            coupon=coupon, match=pick['bulletin'], home_team=pick['bulletin'].home_team,
+            away_team=pick['bulletin'].away_team, match_date=pick['bulletin'].match_date,
+            match_time=pick['bulletin'].match_time, league=pick['bulletin'].league,
+            prediction=pick['pick'], odds=Decimal(str(pick['odds'])), status='PENDING',
+        )
+        for pick in picks
+    ])
+    coupon.search_text = Coupon.build_search_text((i.home_team, i.away_team, i.league) for i in items)
+    return items
 
 def generate_coupon(amount):
     """
@@ -34,21 +51,8 @@ def generate_coupon(amount):
             confidence=confidence
         )
         
-        bulletin = pick['bulletin']
         odds = Decimal(str(pick['odds']))
-        
-        CouponItem.objects.create(
-            coupon=coupon,
-            match=bulletin,
-            home_team=bulletin.home_team,
-            away_team=bulletin.away_team,
-            match_date=bulletin.match_date,
-            match_time=bulletin.match_time,
-            league=bulletin.league,
-            prediction=pick['pick'],
-            odds=odds,
-            status='PENDING'
-        )
+        _add_items(coupon, [pick])
         
         coupon.total_odds = odds
         coupon.potential_return = Decimal(str(float(amount) * float(odds)))
@@ -57,18 +61,17 @@ def generate_coupon(amount):
     
     return created_coupons
 
+# Analysis reads may use the replica (they stay on the primary once the request has written)
+@use_replica()
 def _get_candidates():
     """
     Helper to fetch and rank updated match candidates.
     Returns list of dicts. Now analyzes MS, Over 2.5, Under 2.5.
     """
-    bulletins = BilyonerBulletin.objects.filter(
-        Q(ms_1__isnull=False) & ~Q(ms_1='-') & ~Q(ms_1='') &
-        Q(ms_2__isnull=False) & ~Q(ms_2='-') & ~Q(ms_2='')
-    )
+    bulletins = BilyonerBulletin.objects.filter(odds_1__isnull=False, odds_2__isnull=False)
     
     # Get list of already played matches/predictions to avoid duplicates
-    played_coupons = Coupon.objects.filter(is_played=True)
+    played_coupons = Coupon.objects.filter(is_played=True).prefetch_related('items')
     played_keys = set()
     
     for pc in played_coupons:
@@ -81,8 +84,9 @@ def _get_candidates():
             
     candidates = []
 
-    for bulletin in bulletins:
-        analyzer = MatchAnalyzer(bulletin)
+    # One LeagueIndex for all rows instead of per-match lookups (see analysis.batch)
+    for analyzer in analyze_matches(bulletins):
+        bulletin = analyzer.match
         pred = analyzer.prediction  # Returns dict with probabilities
         
         # Probabilities
@@ -98,12 +102,8 @@ def _get_candidates():
         ms_prob = 0
         ms_odds = 1.0
         
-        try:
-            o1 = float(bulletin.ms_1.replace(',', '.'))
-        except: o1 = 1.0
-        try:
-            o2 = float(bulletin.ms_2.replace(',', '.'))
-        except: o2 = 1.0
+        o1 = float(bulletin.odds_1)
+        o2 = float(bulletin.odds_2)
             
         if h_prob > a_prob:
             ms_pick = "MS 1"
@@ -114,15 +114,9 @@ def _get_candidates():
             ms_prob = a_prob
             ms_odds = o2
             
-        # 2. Over Pick
-        try:
-            o_over = float(bulletin.over_2_5.replace(',', '.')) if bulletin.over_2_5 else 1.0
-        except: o_over = 1.0
-        
-        # 3. Under Pick
-        try:
-            o_under = float(bulletin.under_2_5.replace(',', '.')) if bulletin.under_2_5 else 1.0
-        except: o_under = 1.0
+        # 2. Over Pick / 3. Under Pick
+        o_over = float(bulletin.odds_over_2_5) if bulletin.odds_over_2_5 else 1.0
+        o_under = float(bulletin.odds_under_2_5) if bulletin.odds_under_2_5 else 1.0
         
         # Store all viable options (>50% prob)
         base_match_key = f"{bulletin.home_team}|{bulletin.away_team}|{bulletin.match_date}"
@@ -203,22 +197,7 @@ def generate_target_coupon(investment, target_amount):
         confidence=combined_prob * 100, # Approximate combined confidence
     )
     
-    for pick in accumulator_items:
-        bulletin = pick['bulletin']
-        odds = Decimal(str(pick['odds']))
-        
-        CouponItem.objects.create(
-            coupon=coupon,
-            match=bulletin,
-            home_team=bulletin.home_team,
-            away_team=bulletin.away_team,
-            match_date=bulletin.match_date,
-            match_time=bulletin.match_time,
-            league=bulletin.league,
-            prediction=pick['pick'],
-            odds=odds,
-            status='PENDING'
-        )
+    _add_items(coupon, accumulator_items)
         
     coupon.total_odds = Decimal(str(current_odds))
     coupon.potential_return = Decimal(str(float(investment) * current_odds))
@@ -274,22 +253,7 @@ def generate_legendary_coupon(investment=50, target_odds=100.0):
         is_archived=False
     )
     
-    for pick in accumulator_items:
-        bulletin = pick['bulletin']
-        odds = Decimal(str(pick['odds']))
-        
-        CouponItem.objects.create(
-            coupon=coupon,
-            match=bulletin,
-            home_team=bulletin.home_team,
-            away_team=bulletin.away_team,
-            match_date=bulletin.match_date,
-            match_time=bulletin.match_time,
-            league=bulletin.league,
-            prediction=pick['pick'],
-            odds=odds,
-            status='PENDING'
-        )
+    _add_items(coupon, accumulator_items)
         
     coupon.total_odds = Decimal(str(current_odds))
     coupon.potential_return = Decimal(str(float(investment) * current_odds))
@@ -359,14 +323,8 @@ def generate_guaranteed_trio_hedge(total_investment):
     # Create 3 Single Coupons
     for i, pick in enumerate(final_picks):
         c = Coupon.objects.create(amount=stake_per_single, status='PENDING', confidence=float(pick['prob']) * 100, is_archived=True)
-        bulletin = pick['bulletin']
         odds = Decimal(str(pick['odds']))
-        
-        CouponItem.objects.create(
-            coupon=c, match=bulletin, home_team=bulletin.home_team, away_team=bulletin.away_team,
-            match_date=bulletin.match_date, match_time=bulletin.match_time, league=bulletin.league,
-            prediction=pick['pick'], odds=odds, status='PENDING'
-        )
+        _add_items(c, [pick])
         c.total_odds = odds
         c.potential_return = stake_per_single * odds
         c.save()
@@ -378,15 +336,8 @@ def generate_guaranteed_trio_hedge(total_investment):
     combo_odds = Decimal(1)
     
     for pick in final_picks:
-        bulletin = pick['bulletin']
-        odds = Decimal(str(pick['odds']))
-        combo_odds *= odds
-        
-        CouponItem.objects.create(
-            coupon=c_combo, match=bulletin, home_team=bulletin.home_team, away_team=bulletin.away_team,
-            match_date=bulletin.match_date, match_time=bulletin.match_time, league=bulletin.league,
-            prediction=pick['pick'], odds=odds, status='PENDING'
-        )
+        combo_odds *= Decimal(str(pick['odds']))
+    _add_items(c_combo, final_picks)
         
     c_combo.total_odds = combo_odds
     c_combo.potential_return = stake_combo * combo_odds
@@ -432,30 +383,29 @@ def check_coupon_results(coupon):
     """
     Checks if pending items in coupon match known fixtures with scores.
     """
-    items = coupon.items.filter(status='PENDING')
+    items = coupon.items.filter(status='PENDING').select_related('match')
     if not items.exists():
         return
 
     for item in items:
         # Try to find a completed fixture
-        # Note: Bilyoner Use 'Galatasaray' but Fixture might be 'Galatasaray A.Ş.'?
-        # Using icontains might be risky if multiple matches exist, but usually recent one is matched.
-        # We can also filter by date if stored cleanly.
-        
-        fixture = Fixture.objects.filter(
-            score__isnull=False
-        ).exclude(score='').filter(
-            Q(home_team__icontains=item.home_team) & Q(away_team__icontains=item.away_team)
-        ).first()
+        played = Fixture.objects.filter(played=True).order_by(*NEWEST_FIRST)
+        bulletin = item.match
+        if bulletin and bulletin.home_team_ref_id and bulletin.away_team_ref_id:
+            # Teams resolved at ingest time (data_manager.teams) -> indexed FK lookup
+            fixture = played.filter(
+                home_team_ref_id=bulletin.home_team_ref_id, away_team_ref_id=bulletin.away_team_ref_id
+            ).first()
+        else:
+            # Unlinked item (bulletin deleted or team unknown): name match on the snapshot
+            fixture = played.filter(
+                Q(home_team__icontains=item.home_team) & Q(away_team__icontains=item.away_team)
+            ).first()
 
         if fixture:
             try:
-                score = fixture.score.strip()
-                if '-' not in score: continue
-                
-                parts = score.split('-')
-                h_goals = int(parts[0])
-                a_goals = int(parts[1])
+                h_goals = fixture.home_goals
+                a_goals = fixture.away_goals
                 
                 result = "X"
                 if h_goals > a_goals: result = "1"
@@ -468,7 +418,7 @@ def check_coupon_results(coupon):
                     item.status = 'WON'
                 else:
                     item.status = 'LOST'
-                item.save()
+                item.save(update_fields=['status'])
             except Exception as e:
                 print(f"Error checking result for {item}: {e}")
                 
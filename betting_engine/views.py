@@ -1,9 +1,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from .models import Coupon
+from .search import search_coupons
 from .utils import generate_coupon, check_coupon_results
 from decimal import Decimal
 from django.db.models import Sum
+from data_manager.pagination import keyset_page
 
 def coupon_create(request):
     """
@@ -172,10 +174,8 @@ def coupon_logs(request):
     """
     Comprehensive log searching and filtering view.
     """
-    from django.db.models import Q
-    
     # Base query: All coupons
-    coupons = Coupon.objects.all().order_by('-created_at')
+    coupons = Coupon.objects.all()
     
     # Filters
     log_type = request.GET.get('log_type') # played, analyzed, all
@@ -197,17 +197,14 @@ def coupon_logs(request):
         if search.isdigit():
             coupons = coupons.filter(id=search)
         else:
-            coupons = coupons.filter(
-                Q(items__home_team__icontains=search) | 
-                Q(items__away_team__icontains=search) |
-                Q(items__league__icontains=search)
-            ).distinct()
+            # Indexed search over the denormalized item names (betting_engine.search)
+            coupons = search_coupons(coupons, search)
             
-    # Pagination? Let's limit to 100 for performance if list is long
-    coupons = coupons[:200]
+    page = keyset_page(coupons.prefetch_related('items'), ('-created_at', '-id'), request)
             
     context = {
-        'coupons': coupons,
+        'coupons': page,
+        'page': page,
         'log_type': log_type,
         'status': status,
         'search': search
@@ -285,7 +282,7 @@ def coupon_detail(request, pk):
 
 from .models import BilyonerCredential
 from .bot import BilyonerBot
-import threading
+from league_system.db import start_db_thread
 
 def bilyoner_settings(request):
     if request.method == 'POST':
@@ -337,7 +334,6 @@ def play_coupon_on_bilyoner(request, pk):
              success = bot.play_coupon(coupon_items, amount, skip_verification=skip_verification)
              
              # Update status in DB - Re-fetch inside thread to be safe
-             from django.db import connection
              try:
                  c_update = Coupon.objects.get(pk=coupon.pk)
                  if success:
@@ -349,14 +345,11 @@ def play_coupon_on_bilyoner(request, pk):
                  c_update.save()
              except Exception as db_e:
                  print(f"DB Update Error in Thread: {db_e}")
-             finally:
-                 connection.close()
 
         except Exception as e:
             print(f"Thread error: {e}")
         
-    thread = threading.Thread(target=run_bot)
-    thread.start()
+    start_db_thread(run_bot)
     
     mode_msg = "KONTROLSÜZ (HIZLI)" if skip_verification else "GÜVENLİ (KONTROLLÜ)"
     messages.info(request, f"Bilyoner otomasyonu başlatıldı. Mod: {mode_msg}. Tarayıcıyı takip edin.")
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import Player, Standing, Fixture
+from .models import (
+    Player, Standing, Fixture, CrawledPage, MatchStat, PlayerSeasonStat, Team, TeamAlias, BulletinVersion, OddsMove,
+    SeasonStanding, SeasonFixture, SeasonPlayerStat,
+)
+from .bulletin import set_current_version
+from .teams import repoint_alias
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
@@ -19,3 +24,97 @@ class FixtureAdmin(admin.ModelAdmin):
     list_display = ('country', 'week', 'home_team', 'score', 'away_team', 'date')
     list_filter = ('country', 'week')
     search_fields = ('home_team', 'away_team')
+
+@admin.register(CrawledPage)
+class CrawledPageAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'url', 'status', 'error_count', 'last_crawled', 'last_changed')
+    list_filter = ('kind', 'status')
+    search_fields = ('url',)
+
+@admin.register(MatchStat)
+class MatchStatAdmin(admin.ModelAdmin):
+    list_display = ('country', 'home_team', 'home_goals', 'away_goals', 'away_team', 'home_shots', 'away_shots')
+    list_filter = ('country',)
+    search_fields = ('home_team', 'away_team')
+
+@admin.register(PlayerSeasonStat)
+class PlayerSeasonStatAdmin(admin.ModelAdmin):
+    list_display = ('country', 'player_name', 'season', 'competition', 'appearances', 'goals', 'assists')
+    list_filter = ('country', 'season')
+    search_fields = ('player_name',)
+
+class TeamAliasInline(admin.TabularInline):
+    model = TeamAlias
+    extra = 1
+    fields = ('alias', 'source', 'country')
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ('country', 'name', 'created_at')
+    list_filter = ('country',)
+    search_fields = ('name', 'aliases__alias')
+    inlines = [TeamAliasInline]
+
+@admin.register(TeamAlias)
+class TeamAliasAdmin(admin.ModelAdmin):
+    list_display = ('alias', 'team', 'source', 'country')
+    list_filter = ('source', 'country')
+    search_fields = ('alias', 'team__name')
+    autocomplete_fields = ('team',)
+    actions = ['approve']
+
+    @admin.action(description="Seçili tahminleri onayla")
+    def approve(self, request, queryset):
+        # Guesses are not linked yet; approving one links its rows
+        guesses = list(queryset.filter(source=TeamAlias.Source.GUESS))
+        TeamAlias.objects.filter(id__in=[a.id for a in guesses]).update(source=TeamAlias.Source.MANUAL)
+        rows = sum(repoint_alias(alias) for alias in guesses)
+        self.message_user(request, f"{len(guesses)} takım eşleşmesi onaylandı, {rows} satır bağlandı.")
+
+    def save_model(self, request, obj, form, change):
+        # A corrected guess becomes a manual alias; corrected or approved aliases (re)link their rows
+        if change and 'team' in form.changed_data and obj.source == TeamAlias.Source.GUESS:
+            obj.source = TeamAlias.Source.MANUAL
+        super().save_model(request, obj, form, change)
+        if obj.source != TeamAlias.Source.GUESS and (not change or {'team', 'source'} & set(form.changed_data)):
+            count = repoint_alias(obj)
+            self.message_user(request, f"{count} satır yeni takıma bağlandı.")
+
+@admin.register(BulletinVersion)
+class BulletinVersionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'source', 'row_count', 'is_current', 'created_at', 'published_at')
+    list_filter = ('source', 'is_current')
+    actions = ['make_current']
+
+    @admin.action(description="Seçili versiyonu canlıya al")
+    def make_current(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Tek bir versiyon seçin.", level='error')
+            return
+        set_current_version(queryset.first())
+        self.message_user(request, "Bülten versiyonu güncellendi.")
+
+@admin.register(OddsMove)
+class OddsMoveAdmin(admin.ModelAdmin):
+    list_display = ('unique_key', 'match_date', 'market', 'odds', 'recorded_at', 'country')
+    list_filter = ('country', 'market')
+    search_fields = ('unique_key',)
+    date_hierarchy = 'recorded_at'
+
+@admin.register(SeasonStanding)
+class SeasonStandingAdmin(admin.ModelAdmin):
+    list_display = ('season', 'matchweek', 'rank', 'team', 'points', 'country')
+    list_filter = ('country', 'season')
+    search_fields = ('team',)
+
+@admin.register(SeasonFixture)
+class SeasonFixtureAdmin(admin.ModelAdmin):
+    list_display = ('season', 'week', 'match_date', 'home_team', 'score', 'away_team', 'country')
+    list_filter = ('country', 'season', 'played')
+    search_fields = ('home_team', 'away_team')
+
+@admin.register(SeasonPlayerStat)
+class SeasonPlayerStatAdmin(admin.ModelAdmin):
+    list_display = ('season', 'player_name', 'team_name', 'matches_played', 'goals', 'assists', 'country')
+    list_filter = ('country', 'season')
+    search_fields = ('player_name', 'team_name')
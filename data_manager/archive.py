@@ -0,0 +1,193 @@
+"""
+Season archive: SeasonStanding / SeasonFixture / SeasonPlayerStat.
+
+Every league sync snapshots the live rows into the archive (upsert on the
+season keys, team links copied as they are), so the end-of-matchweek table,
+every fixture and the last squad stats of each season survive the next sync.
+Past seasons can be bulk-loaded from JSON with the `load_archive` command.
+"""
+from datetime import date
+from django.db import transaction
+from django.db.models import Max
+
+from .models import (
+    Standing, Fixture, Player, SeasonStanding, SeasonFixture, SeasonPlayerStat,
+)
+from .fixtures import fixture_result_fields, season_for
+from .squads import player_fields, player_key
+
+STANDING_FIELDS = ('rank', 'played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'average', 'points')
+FIXTURE_FIELDS = ('week', 'match_date', 'score', 'home_goals', 'away_goals', 'played', 'match_url')
+PLAYER_FIELDS = ('player_name', 'position', 'age', 'matches_played', 'starts', 'goals', 'assists', 'yellow_cards', 'red_cards')
+
+ARCHIVE_KEYS = {
+    SeasonStanding: ['country', 'season', 'matchweek', 'team'],
+    SeasonFixture: ['country', 'season', 'home_team', 'away_team'],
+    SeasonPlayerStat: ['country', 'season', 'team_name', 'player_key'],
+}
+
+
+def current_season():
+    return season_for(date.today())
+
+
+def _upsert(model, objects, update_fields):
+    """
+    Batched INSERT ... ON CONFLICT (season key) DO UPDATE. Returns the row count.
+    """
+    unique = {}
+    for obj in objects:
+        unique[tuple(getattr(obj, f) for f in ARCHIVE_KEYS[model])] = obj
+    model.objects.bulk_create(
+        list(unique.values()), batch_size=1000, update_conflicts=True,
+        unique_fields=ARCHIVE_KEYS[model], update_fields=list(update_fields),
+    )
+    return len(unique)
+
+
+def archive_standings(country, season=None, teams=None):
+    """
+    Stores the live table as the end of its matchweek (the most games played by any team).
+    A later sync in the same matchweek overwrites it. With `teams` (names sync_rows reported
+    as changed) only those rows are copied, once the matchweek has a snapshot.
+    """
+    season = season or current_season()
+    matchweek = Standing.objects.filter(country=country).aggregate(m=Max('played'))['m']
+    if matchweek is None:
+        return 0
+    rows = Standing.objects.filter(country=country)
+    if teams is not None and SeasonStanding.objects.filter(country=country, season=season, matchweek=matchweek).exists():
+        rows = rows.filter(team__in=list(teams))
+    return _upsert(SeasonStanding, [
+        SeasonStanding(country=country, season=season, matchweek=matchweek, team=row.team, team_ref_id=row.team_ref_id,
+                       **{f: getattr(row, f) for f in STANDING_FIELDS})
+        for row in rows
+    ], STANDING_FIELDS + ('team_ref', 'captured_at'))
+
+
+def archive_fixtures(country, keys=None):
+    """
+    Copies the live fixtures of the country (those with a known season) into the archive.
+    With `keys` ((season, home, away) keys sync_rows reported as changed) only those are copied.
+    """
+    rows = Fixture.objects.filter(country=country).exclude(season="")
+    if keys is not None and SeasonFixture.objects.filter(country=country).exists():
+        keys = set(keys)
+        rows = [row for row in rows.filter(home_team__in={home for _, home, _ in keys})
+                if (row.season, row.home_team, row.away_team) in keys]
+    return _upsert(SeasonFixture, [
+        SeasonFixture(country=country, season=row.season, week=row.week, match_date=row.match_date,
+                      home_team=row.home_team, away_team=row.away_team,
+                      home_team_ref_id=row.home_team_ref_id, away_team_ref_id=row.away_team_ref_id,
+                      score=row.score or "", home_goals=row.home_goals, away_goals=row.away_goals,
+                      played=row.played, match_url=row.match_url)
+        for row in rows
+    ], FIXTURE_FIELDS + ('home_team_ref', 'away_team_ref'))
+
+
+def archive_squads(country, season=None, keys=None):
+    """
+    Stores the live squad stats as the season's latest player stats.
+    With `keys` (player keys sync_players reported as changed) only those players are
+    copied, once the season has been archived.
+    """
+    season = season or current_season()
+    rows = Player.objects.filter(country=country)
+    if keys is not None and SeasonPlayerStat.objects.filter(country=country, season=season).exists():
+        keys = set(keys)
+        rows = [row for row in rows.filter(team_name__in={team for team, _ in keys}) if player_key(row.__dict__) in keys]
+    return _upsert(SeasonPlayerStat, [
+        SeasonPlayerStat(country=country, season=season, team_name=row.team_name, team_ref_id=row.team_ref_id,
+                         player_key=(row.profile_url or row.player_name)[:500],
+                         **{f: getattr(row, f) for f in PLAYER_FIELDS if f != 'position'},
+                         position=row.position or "")
+        for row in rows
+    ], PLAYER_FIELDS + ('team_ref',))
+
+
+ARCHIVERS = {
+    'standings': archive_standings,
+    'fixtures': archive_fixtures,
+    'squads': archive_squads,
+}
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def load_archive_rows(kind, country, season, rows, matchweek=None):
+    """
+    Bulk loader for past seasons. `rows` use the scraper's keys (Turkish or English);
+    for standings without `matchweek` the most games played is used.
+    Returns the number of archived rows.
+    """
+    from .teams import link_team_refs
+
+    with transaction.atomic():
+        if kind == 'standings':
+            objects = [
+                SeasonStanding(
+                    country=country, season=season, matchweek=0,
+                    team=str(row.get('team') or row.get('Takım') or ''),
+                    rank=_int(row.get('rank') or row.get('Sıra') or row.get('#')),
+                    played=_int(row.get('played') or row.get('O')),
+                    won=_int(row.get('won') or row.get('G')),
+                    drawn=_int(row.get('drawn') or row.get('B')),
+                    lost=_int(row.get('lost') or row.get('M')),
+                    goals_for=_int(row.get('goals_for') or row.get('A')),
+                    goals_against=_int(row.get('goals_against') or row.get('Y')),
+                    average=_int(row.get('average') or row.get('AV')),
+                    points=_int(row.get('points') or row.get('P')),
+                )
+                for row in rows
+            ]
+            week = matchweek if matchweek is not None else max((o.played for o in objects), default=0)
+            for obj in objects:
+                obj.matchweek = week
+            count = _upsert(SeasonStanding, objects, STANDING_FIELDS + ('captured_at',))
+
+        elif kind == 'fixtures':
+            texts = [
+                {
+                    'week': str(row.get('week') or row.get('Hafta') or ''),
+                    'date': str(row.get('date') or row.get('Tarih') or ''),
+                    'home_team': str(row.get('home_team') or row.get('Ev Sahibi') or ''),
+                    'score': str(row.get('score') or row.get('Skor') or ''),
+                    'away_team': str(row.get('away_team') or row.get('Misafir') or ''),
+                    'match_url': row.get('match_url') or row.get('Maç Linki') or None,
+                }
+                for row in rows
+            ]
+            results = fixture_result_fields((t['date'], t['score']) for t in texts)
+            count = _upsert(SeasonFixture, [
+                SeasonFixture(
+                    country=country, season=season, week=t['week'], home_team=t['home_team'], away_team=t['away_team'],
+                    score=t['score'], match_url=t['match_url'], match_date=r['match_date'],
+                    home_goals=r['home_goals'], away_goals=r['away_goals'], played=r['played'],
+                )
+                for t, r in zip(texts, results)
+            ], FIXTURE_FIELDS)
+
+        elif kind == 'squads':
+            objects = []
+            for row in rows:
+                fields = player_fields(row)
+                objects.append(SeasonPlayerStat(
+                    country=country, season=season, team_name=fields['team_name'],
+                    player_key=(fields['profile_url'] or fields['player_name'])[:500],
+                    **{f: fields[f] for f in PLAYER_FIELDS},
+                ))
+            count = _upsert(SeasonPlayerStat, objects, PLAYER_FIELDS)
+        else:
+            raise ValueError(f"Unknown archive kind: {kind}")
+
+        link_team_refs(country, models=[SeasonStanding, SeasonFixture, SeasonPlayerStat])
+    return count
+
+
+def latest_archived_season(country):
+    return SeasonFixture.objects.filter(country=country).aggregate(s=Max('season'))['s']
@@ -0,0 +1,295 @@
+"""
+Bulletin row normalization shared by every write path (scraper command, publish,
+push endpoints, sqlite import), plus the staging -> live publish routine.
+
+Odds stay in their display columns (ms_1 ... "1.45" / "-") and are also written
+as nullable Decimal columns (odds_1 ...); the Bilyoner date/time strings are
+combined into a timezone-aware `kickoff_at`. Readers filter on the typed columns
+in SQL instead of re-parsing strings.
+"""
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from zoneinfo import ZoneInfo
+from django.db import transaction
+from scraper.bulletin_sync import ROW_FIELDS, normalize_row, row_hash
+
+# Bilyoner shows Turkish local times
+BULLETIN_TZ = ZoneInfo("Europe/Istanbul")
+
+# display column -> typed column
+ODDS_COLUMNS = {
+    'ms_1': 'odds_1',
+    'ms_x': 'odds_x',
+    'ms_2': 'odds_2',
+    'under_2_5': 'odds_under_2_5',
+    'over_2_5': 'odds_over_2_5',
+}
+
+# Display fields as sent by the scraper (shared with the delta sync client)
+SOURCE_FIELDS = ROW_FIELDS
+TYPED_FIELDS = tuple(ODDS_COLUMNS.values()) + ('kickoff_at',)
+
+
+def parse_odds(value):
+    """
+    "1,45" / "1.45" / 1.45 -> Decimal('1.45'); "-", "" and values <= 1 -> None.
+    """
+    if value is None:
+        return None
+    text = str(value).strip().replace(',', '.')
+    try:
+        odds = Decimal(text).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        return None
+    return odds if odds > 1 else None
+
+
+def parse_kickoff(match_date, match_time):
+    """
+    ('15.08.2025', '20:45') -> aware datetime in Europe/Istanbul. None if the date is unknown.
+    """
+    d = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', match_date or '')
+    if not d:
+        return None
+    t = re.search(r'(\d{1,2}):(\d{2})', match_time or '')
+    hour, minute = (int(t.group(1)), int(t.group(2))) if t else (0, 0)
+    try:
+        return datetime(int(d.group(3)), int(d.group(2)), int(d.group(1)), hour, minute, tzinfo=BULLETIN_TZ)
+    except ValueError:
+        return None
+
+
+def typed_fields(row):
+    """
+    Typed column values for a row given as dict (scraper/push payload).
+    """
+    fields = {typed: parse_odds(row.get(text)) for text, typed in ODDS_COLUMNS.items()}
+    fields['kickoff_at'] = parse_kickoff(row.get('match_date'), row.get('match_time'))
+    return fields
+
+
+def bulletin_fields(row, default_country='TURKEY'):
+    """
+    Full BilyonerBulletin kwargs (display strings + typed columns + row hash) from a scraped/pushed dict.
+    """
+    fields = normalize_row(row, default_country)
+    fields.update(typed_fields(fields))
+    fields['row_hash'] = row_hash(fields)
+    return fields
+
+
+def row_from_instance(obj):
+    """
+    Source dict of a bulletin/staging instance, e.g. to copy staging rows to live.
+    """
+    return {field: getattr(obj, field) for field in SOURCE_FIELDS}
+
+
+def refresh_typed_fields(queryset):
+    """
+    Recomputes odds/kickoff columns for existing rows (rows written before the typed columns existed).
+    """
+    objs = list(queryset)
+    for obj in objs:
+        for field, value in typed_fields(row_from_instance(obj)).items():
+            setattr(obj, field, value)
+    # Base manager: the default bulletin manager only sees the current version
+    queryset.model._base_manager.bulk_update(objs, list(TYPED_FIELDS), batch_size=500)
+    return len(objs)
+
+
+def stage_bulletin(rows):
+    """
+    Replaces the staging area with scraped rows (one transaction, batched inserts).
+    Returns the number of staged rows.
+    """
+    from .models import BilyonerBulletinStaging
+
+    unique = {}
+    for row in rows:
+        fields = bulletin_fields(row)
+        unique[fields['unique_key']] = {field: fields[field] for field in SOURCE_FIELDS}
+    with transaction.atomic():
+        BilyonerBulletinStaging.objects.all().delete()
+        BilyonerBulletinStaging.objects.bulk_create(
+            [BilyonerBulletinStaging(**fields) for fields in unique.values()], batch_size=500
+        )
+    return len(unique)
+
+
+def set_current_version(version):
+    """
+    Moves the current-version pointer. Readers switch when the (outermost) transaction commits.
+    """
+    from django.utils import timezone
+    from .models import BulletinVersion
+    from .stats import invalidate_dataset_stats
+
+    with transaction.atomic():
+        BulletinVersion.objects.filter(is_current=True).exclude(pk=version.pk).update(is_current=False)
+        version.is_current = True
+        # published_at keeps the first publish time, so rollback walks back in publish order
+        version.published_at = version.published_at or timezone.now()
+        version.save(update_fields=['is_current', 'published_at'])
+        invalidate_dataset_stats()
+
+
+def _write_version(source, rows, carried=(), sync_token=""):
+    """
+    Creates a bulletin version from new `rows` (scraped/pushed dicts) plus `carried`
+    rows (column dicts of the current version, copied as they are) and makes it current.
+    Price changes of the new rows are appended to the odds history.
+    """
+    from .models import BilyonerBulletin, BulletinVersion
+    from .teams import link_team_refs
+    from .odds import record_odds_moves
+
+    unique = {}
+    for row in rows:
+        fields = bulletin_fields(row)
+        unique[fields['unique_key']] = fields
+
+    with transaction.atomic():
+        # Compared with the still-current version, so only real price changes are appended
+        record_odds_moves(unique.values())
+        analyses = dict(
+            BilyonerBulletin.objects.exclude(gemini_analysis__isnull=True).exclude(gemini_analysis="")
+            .filter(unique_key__in=list(unique)).values_list('unique_key', 'gemini_analysis')
+        ) if unique else {}
+        version = BulletinVersion.objects.create(
+            source=source, row_count=len(unique) + len(carried), sync_token=sync_token
+        )
+        BilyonerBulletin.all_versions.bulk_create([
+            BilyonerBulletin(version=version, **fields) for fields in carried
+        ] + [
+            BilyonerBulletin(version=version, gemini_analysis=analyses.get(key), **fields)
+            for key, fields in unique.items()
+        ], batch_size=500)
+        # Rows written before versioning existed are visible until the first versioned publish
+        BilyonerBulletin.all_versions.filter(version__isnull=True).delete()
+        set_current_version(version)
+        link_team_refs(models=[BilyonerBulletin])
+    return version
+
+
+def publish_bulletin(rows, source):
+    """
+    Writes `rows` (scraped/pushed dicts) as a new bulletin version and makes it current,
+    in one transaction. The previous version stays untouched (rollback target), so readers
+    never see an empty or partial bulletin and coupon items keep their match FK.
+    Cached Gemini analyses of matches still in the bulletin are carried over.
+    Returns the new BulletinVersion.
+    """
+    return _write_version(source, rows)
+
+
+class StaleBulletinVersion(Exception):
+    pass
+
+
+def bulletin_manifest():
+    """
+    (current version id, {unique_key: row_hash}) for the delta sync handshake.
+    """
+    from .models import BilyonerBulletin, BulletinVersion
+
+    current = BulletinVersion.objects.filter(is_current=True).values_list('id', flat=True).first()
+    return current, dict(BilyonerBulletin.objects.values_list('unique_key', 'row_hash'))
+
+
+def diff_manifest(server, client):
+    """
+    Keys the server needs (new or changed on the client) and keys to drop.
+    """
+    need = [key for key, digest in client.items() if server.get(key) != digest]
+    remove = [key for key in server if key not in client]
+    return need, remove
+
+
+def apply_bulletin_delta(base_version, upserts, removals, sync_token):
+    """
+    Builds the next version from the current one: rows in `removals` are dropped,
+    `upserts` (raw rows) replace or add, every other row is copied with its typed
+    columns, team links and Gemini cache. Applying the same sync token twice is a no-op.
+    Returns (version, stats). Raises StaleBulletinVersion if the current version is
+    not `base_version` any more (the client has to redo the handshake).
+    """
+    from .models import BilyonerBulletin, BulletinVersion
+
+    with transaction.atomic():
+        applied = BulletinVersion.objects.filter(sync_token=sync_token).first() if sync_token else None
+        if applied:
+            return applied, {'inserted': 0, 'changed': 0, 'removed': 0, 'unchanged': applied.row_count, 'already_applied': True}
+
+        current = BulletinVersion.objects.select_for_update().filter(is_current=True).first()
+        if (current.id if current else None) != base_version:
+            raise StaleBulletinVersion(f"Stale base version {base_version}, current is {current.id if current else None}")
+
+        upserts = {normalize_row(row)['unique_key']: row for row in upserts if row.get('unique_key')}
+        skip = set(upserts) | set(removals)
+        copy_fields = [
+            f.attname for f in BilyonerBulletin._meta.concrete_fields
+            if f.attname not in ('id', 'version_id', 'created_at', 'updated_at')
+        ]
+        existing = set(BilyonerBulletin.objects.values_list('unique_key', flat=True))
+        carried = [row for row in BilyonerBulletin.objects.values(*copy_fields) if row['unique_key'] not in skip]
+
+        version = _write_version(BulletinVersion.Source.PUSH, upserts.values(), carried, sync_token)
+    inserted = len(set(upserts) - existing)
+    return version, {
+        'inserted': inserted,
+        'changed': len(upserts) - inserted,
+        'removed': len(existing & set(removals)),
+        'unchanged': len(carried),
+    }
+
+
+def publish_staging():
+    """
+    Publishes every staging row as a new bulletin version and empties staging, in one transaction.
+    Returns the number of published rows (0 when staging is empty; live is left untouched).
+    """
+    from .models import BilyonerBulletinStaging, BulletinVersion
+
+    with transaction.atomic():
+        staged = list(BilyonerBulletinStaging.objects.values(*SOURCE_FIELDS))
+        if not staged:
+            return 0
+        version = publish_bulletin(staged, BulletinVersion.Source.STAGING)
+        BilyonerBulletinStaging.objects.all().delete()
+    return version.row_count
+
+
+def rollback_bulletin():
+    """
+    Makes the previously published version current again. Returns it, or None if there is none.
+    """
+    from .models import BulletinVersion
+
+    with transaction.atomic():
+        current = BulletinVersion.objects.select_for_update().filter(is_current=True).first()
+        previous = BulletinVersion.objects.filter(published_at__isnull=False)
+        if current:
+            previous = previous.filter(published_at__lt=current.published_at)
+        previous = previous.order_by('-published_at').first()
+        if previous:
+            set_current_version(previous)
+    return previous
+
+
+def prune_bulletin_versions(keep=3):
+    """
+    Deletes all but the `keep` most recently published versions (never the current one).
+    Coupon items of pruned rows fall back to their own team/date snapshot.
+    Returns the number of deleted versions.
+    """
+    from .models import BulletinVersion
+
+    recent = list(
+        BulletinVersion.objects.filter(published_at__isnull=False)
+        .order_by('-published_at').values_list('id', flat=True)[:keep]
+    )
+    stale = BulletinVersion.objects.filter(is_current=False).exclude(id__in=recent)
+    _, deleted = stale.delete()
+    return deleted.get(BulletinVersion._meta.label, 0)
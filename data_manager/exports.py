@@ -0,0 +1,215 @@
+"""
+Streaming CSV / JSONL exports.
+
+Rows are read with .values() projections over .iterator(chunk_size=...), so an
+export never loads the table (or the model instances) into memory: the web view
+streams bytes as soon as the first chunk is read and export_to_file() writes a
+gzip file for the scheduler (automation 'export_results' task) in constant memory.
+"""
+import csv
+import gzip
+import json
+import os
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# name -> model, exported fields, ordering, accepted ?filters
+EXPORTS = {
+    'standings': {
+        'model': 'data_manager.Standing',
+        'fields': ('country', 'rank', 'team', 'played', 'won', 'drawn', 'lost',
+                   'goals_for', 'goals_against', 'average', 'points', 'updated_at'),
+        'ordering': ('country', 'rank', 'id'),
+        'filters': ('country',),
+    },
+    'fixtures': {
+        'model': 'data_manager.Fixture',
+        'fields': ('country', 'season', 'week', 'date', 'time', 'match_date', 'home_team', 'away_team',
+                   'score', 'home_goals', 'away_goals', 'played', 'match_url'),
+        'ordering': ('country', 'id'),
+        'filters': ('country', 'season', 'played'),
+    },
+    'players': {
+        'model': 'data_manager.Player',
+        'fields': ('country', 'team_name', 'jersey_number', 'player_name', 'position', 'age', 'matches_played',
+                   'starts', 'goals', 'assists', 'yellow_cards', 'red_cards', 'profile_url'),
+        'ordering': ('country', 'team_name', 'jersey_number', 'id'),
+        'filters': ('country',),
+    },
+    'bulletin': {
+        'model': 'data_manager.BilyonerBulletin',
+        'fields': ('country', 'unique_key', 'league', 'match_date', 'match_time', 'kickoff_at', 'home_team', 'away_team',
+                   'odds_1', 'odds_x', 'odds_2', 'odds_under_2_5', 'odds_over_2_5'),
+        'ordering': ('country', 'kickoff_at', 'id'),
+        'filters': ('country',),
+    },
+    'season_standings': {
+        'model': 'data_manager.SeasonStanding',
+        'fields': ('country', 'season', 'matchweek', 'rank', 'team', 'played', 'won', 'drawn', 'lost',
+                   'goals_for', 'goals_against', 'average', 'points'),
+        'ordering': ('country', 'season', 'matchweek', 'rank', 'id'),
+        'filters': ('country', 'season'),
+    },
+    'season_fixtures': {
+        'model': 'data_manager.SeasonFixture',
+        'fields': ('country', 'season', 'week', 'match_date', 'home_team', 'away_team',
+                   'score', 'home_goals', 'away_goals', 'played', 'match_url'),
+        'ordering': ('country', 'season', 'id'),
+        'filters': ('country', 'season', 'played'),
+    },
+    'season_players': {
+        'model': 'data_manager.SeasonPlayerStat',
+        'fields': ('country', 'season', 'team_name', 'player_name', 'position', 'age', 'matches_played',
+                   'starts', 'goals', 'assists', 'yellow_cards', 'red_cards', 'player_key'),
+        'ordering': ('country', 'season', 'team_name', 'id'),
+        'filters': ('country', 'season'),
+    },
+    # One row per pick, with its coupon's columns
+    'coupons': {
+        'model': 'betting_engine.CouponItem',
+        'fields': ('coupon_id', 'coupon__created_at', 'coupon__amount', 'coupon__total_odds', 'coupon__potential_return',
+                   'coupon__status', 'coupon__is_played', 'coupon__confidence', 'country', 'league', 'match_date',
+                   'match_time', 'home_team', 'away_team', 'prediction', 'odds', 'status'),
+        'ordering': ('-coupon__created_at', '-coupon_id', 'id'),
+        'filters': ('status', 'coupon__status', 'coupon__is_played'),
+    },
+    'task_logs': {
+        'model': 'automation.TaskLog',
+        'fields': ('id', 'created_at', 'task_name', 'workflow__name', 'status', 'duration_seconds', 'output'),
+        'ordering': ('-created_at', '-id'),
+        'filters': ('task_name', 'status'),
+    },
+}
+
+
+def _filter_value(value):
+    # Query strings carry booleans as text
+    return {'true': True, 'false': False}.get(str(value).lower(), value)
+
+
+def _filter_field(model, path):
+    """
+    Model field a filter name points at ('coupon__status' follows the relation).
+    """
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def export_filters(name, filters=None):
+    """
+    Accepted filters of an export (empty / 'ALL' values ignored), cleaned with their field's
+    to_python. Raises ValueError for a value the field rejects (e.g. ?played=abc).
+    """
+    spec = EXPORTS[name]
+    model = apps.get_model(spec['model'])
+    lookups = {}
+    for key, value in (filters or {}).items():
+        if key not in spec['filters'] or value in (None, '', 'ALL'):
+            continue
+        try:
+            lookups[key] = _filter_field(model, key).to_python(_filter_value(value))
+        except ValidationError:
+            raise ValueError(f"Invalid value for {key}: {value!r}")
+    return lookups
+
+
+def export_queryset(name, filters=None):
+    """
+    .values() queryset of an export, with the accepted filters applied (see export_filters).
+    """
+    spec = EXPORTS[name]
+    queryset = apps.get_model(spec['model'])._default_manager.all()
+    return queryset.filter(**export_filters(name, filters)).order_by(*spec['ordering']).values(*spec['fields'])
+
+
+def iter_rows(name, filters=None, chunk_size=None):
+    return export_queryset(name, filters).iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+class _Echo:
+    """
+    csv.writer target that hands back the formatted line instead of buffering it.
+    """
+    def write(self, value):
+        return value
+
+
+def csv_lines(name, rows):
+    writer = csv.writer(_Echo())
+    fields = EXPORTS[name]['fields']
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(['' if row[f] is None else row[f] for f in fields])
+
+
+def jsonl_lines(name, rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+
+
+def export_lines(name, fmt, filters=None):
+    """
+    Generator of the export's text lines (CSV with a header row, or one JSON object per line).
+    """
+    if name not in EXPORTS:
+        raise ValueError(f"Unknown export: {name}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    rows = iter_rows(name, filters)
+    return csv_lines(name, rows) if fmt == 'csv' else jsonl_lines(name, rows)
+
+
+def export_filename(name, fmt, compressed=False):
+    stamp = timezone.localtime().strftime('%Y%m%d_%H%M%S')
+    return f"{name}_{stamp}.{fmt}" + (".gz" if compressed else "")
+
+
+def export_to_file(name, fmt, directory=None, filters=None):
+    """
+    Writes a gzip export into `directory` (default EXPORT_DIR). Returns (path, row_count).
+    The file appears under its final name only once complete.
+    """
+    directory = directory or settings.EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, export_filename(name, fmt, compressed=True))
+    tmp_path = path + ".part"
+    count = 0
+    try:
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', newline='') as handle:
+            for line in export_lines(name, fmt, filters):
+                handle.write(line)
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if fmt == 'csv':
+        count -= 1  # header
+    return path, count
+
+
+def prune_exports(directory=None, keep=None):
+    """
+    Keeps the newest `keep` files of every export name. Returns the number of files removed.
+    """
+    directory = directory or settings.EXPORT_DIR
+    keep = settings.EXPORT_KEEP_FILES if keep is None else keep
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for name in EXPORTS:
+        files = sorted(
+            (f for f in os.listdir(directory) if f.startswith(f"{name}_") and f.endswith('.gz')
+             and f[len(name) + 1:len(name) + 2].isdigit()),
+            reverse=True,
+        )
+        for filename in files[keep:]:
+            os.remove(os.path.join(directory, filename))
+            removed += 1
+    return removed
@@ -0,0 +1,99 @@
+"""
+Structured fixture results, computed once at ingest.
+
+Scraped fixtures carry free-text cells: score ('2:1', '2-1' or empty), date
+('Cum 15.08.2025', blank for later matches on the same day) and week. These
+helpers turn them into home_goals / away_goals / played / match_date / season,
+so readers can use indexed range scans instead of re-parsing strings.
+"""
+import re
+from datetime import date
+
+SCORE_RE = re.compile(r'^\s*(\d+)\s*[:\-]\s*(\d+)\s*$')
+DATE_RE = re.compile(r'(\d{1,2})[./](\d{1,2})[./](\d{2,4})')
+
+
+def parse_score(score):
+    """
+    '2:1' / '2-1' -> (2, 1); anything else (not played, '-:-', time) -> (None, None).
+    """
+    m = SCORE_RE.match(score or '')
+    if not m:
+        return None, None
+    return int(m.group(1)), int(m.group(2))
+
+
+def parse_fixture_date(text):
+    """
+    Parses fixture date cells like 'Cum 15.08.2025', '15.08.25' or '15/08/2025'.
+    """
+    m = DATE_RE.search(text or '')
+    if not m:
+        return None
+    day, month, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def season_for(match_date):
+    """
+    European season label: 15.08.2025 -> '2025/2026', 10.03.2026 -> '2025/2026'.
+    """
+    if not match_date:
+        return ""
+    start = match_date.year if match_date.month >= 7 else match_date.year - 1
+    return f"{start}/{start + 1}"
+
+
+def iter_result_fields(rows):
+    """
+    rows: (date_text, score_text) pairs in page order.
+    Yields one dict of structured fields per row. Transfermarkt leaves the date
+    cell blank for later matches on the same day, so the last date is carried forward.
+    """
+    last_date = None
+    for date_text, score_text in rows:
+        parsed = parse_fixture_date(date_text)
+        if parsed:
+            last_date = parsed
+        elif date_text:
+            last_date = None
+        match_date = parsed or last_date
+
+        home_goals, away_goals = parse_score(score_text)
+        yield {
+            'home_goals': home_goals,
+            'away_goals': away_goals,
+            'played': home_goals is not None,
+            'match_date': match_date,
+            'season': season_for(match_date),
+        }
+
+
+def fixture_result_fields(rows):
+    """
+    List form of iter_result_fields.
+    """
+    return list(iter_result_fields(rows))
+
+
+def refresh_result_fields(queryset):
+    """
+    Recomputes the structured columns of existing fixtures (per country, in load order).
+    """
+    from .models import Fixture
+
+    objs = list(queryset.order_by('country', 'id'))
+    by_country = {}
+    for obj in objs:
+        by_country.setdefault(obj.country, []).append(obj)
+    for rows in by_country.values():
+        for obj, fields in zip(rows, fixture_result_fields((o.date, o.score) for o in rows)):
+            for field, value in fields.items():
+                setattr(obj, field, value)
+    Fixture.objects.bulk_update(objs, ['home_goals', 'away_goals', 'played', 'match_date', 'season'], batch_size=500)
+    return len(objs)
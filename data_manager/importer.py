@@ -0,0 +1,280 @@
+"""
+Streaming import of the desktop scraper's SQLite database (scraper_data.db).
+
+Each table's column mapping is resolved once from cursor.description, rows are
+read with fetchmany() and upserted batch by batch (sync_rows / sync_players)
+inside one transaction per table. The import runs in a background thread and reports its
+progress (rows read against the table's estimated size) in an automation TaskLog row.
+"""
+import os
+import time
+import sqlite3
+import itertools
+import logging
+from django.conf import settings
+from django.db import transaction
+from league_system.db import start_db_thread, writer
+
+from .models import Standing, Fixture, CountryChoices, BulletinVersion
+from .fixtures import iter_result_fields
+from .sync import sync_rows
+from .squads import sync_players
+from .teams import link_team_refs
+from .bulletin import publish_bulletin
+
+logger = logging.getLogger('automation')
+
+IMPORT_TASK_NAME = 'import_scraper_db'
+FETCH_SIZE = 2000
+PROGRESS_INTERVAL = 2  # seconds between TaskLog progress writes while a table is imported
+
+# field -> (candidate column names, default); matched case-insensitively
+COLUMN_MAP = {
+    'standings': {
+        'rank': (['rank', '#'], 0),
+        'team': (['team', 'takım', 'Team'], 'Unknown'),
+        'played': (['played', 'O', 'Oynadığı'], 0),
+        'won': (['won', 'G', 'Galibiyet'], 0),
+        'drawn': (['drawn', 'B', 'Beraberlik'], 0),
+        'lost': (['lost', 'M', 'Mağlubiyet'], 0),
+        'goals_for': (['goals_for', 'A', 'Atılan'], 0),
+        'goals_against': (['goals_against', 'Y', 'Yenen'], 0),
+        'average': (['average', 'AV', 'Averaj'], 0),
+        'points': (['points', 'P', 'Puan'], 0),
+    },
+    'fixtures': {
+        'week': (['week', 'Hafta'], ''),
+        'date': (['date', 'Tarih'], ''),
+        'time': (['time', 'Saat'], ''),
+        'home_team': (['home_team', 'Ev Sahibi', 'Ev'], ''),
+        'score': (['score', 'Skor'], ''),
+        'away_team': (['away_team', 'Misafir', 'Deplasman'], ''),
+    },
+    'squads': {
+        'team_name': (['team_name', 'team', 'Takım'], 'Unknown'),
+        'jersey_number': (['jersey_number', 'No', 'Numara'], 0),
+        'player_name': (['player_name', 'player', 'Ad', 'Oyuncu'], 'Unknown'),
+        'profile_url': (['profile_url', 'url'], ''),
+        'position': (['position', 'POZ', 'Pozisyon'], ''),
+        'age': (['age', 'Yaş'], 0),
+        'matches_played': (['matches_played', 'Maç'], 0),
+        'starts': (['starts', 'ilk 11', '11'], 0),
+        'goals': (['goals', 'Gol'], 0),
+        'assists': (['assists', 'Asist'], 0),
+        'yellow_cards': (['yellow_cards', 'Sarı'], 0),
+        'red_cards': (['red_cards', 'Kırmızı'], 0),
+    },
+    'bulletin': {
+        'unique_key': (['unique_key'], None),
+        'country': (['country'], 'TURKEY'),
+        'league': (['league'], ''),
+        'match_date': (['match_date'], ''),
+        'match_time': (['date', 'time', 'match_time'], '00:00'),
+        'home_team': (['home_team'], 'Unknown'),
+        'away_team': (['away_team'], 'Unknown'),
+        'ms_1': (['ms_1'], '-'),
+        'ms_x': (['ms_x'], '-'),
+        'ms_2': (['ms_2'], '-'),
+        'under_2_5': (['under_2_5'], '-'),
+        'over_2_5': (['over_2_5'], '-'),
+    },
+}
+
+
+def scraper_db_path():
+    return os.path.join(os.path.dirname(settings.BASE_DIR), "scraper_data.db")
+
+
+def table_kind(table_name):
+    """
+    'england_fixtures' -> ('fixtures', 'ENGLAND'); kind is None for unknown tables.
+    """
+    t_lower = table_name.lower()
+    country = CountryChoices.TURKEY
+    if "england" in t_lower: country = CountryChoices.ENGLAND
+    elif "spain" in t_lower: country = CountryChoices.SPAIN
+    elif "italy" in t_lower: country = CountryChoices.ITALY
+
+    if "standings" in t_lower or "_lig" in t_lower: kind = 'standings'
+    elif "fixtures" in t_lower or "fikstur" in t_lower: kind = 'fixtures'
+    elif "squads" in t_lower or "kadro" in t_lower: kind = 'squads'
+    elif "bulletin" in t_lower: kind = 'bulletin'
+    else: kind = None
+    return kind, country
+
+
+def resolve_columns(description, kind):
+    """
+    field -> column index (or None: use the default), resolved once per table.
+    """
+    columns = {col[0].lower(): index for index, col in enumerate(description)}
+    mapping = {}
+    for field, (candidates, _) in COLUMN_MAP[kind].items():
+        mapping[field] = next((columns[c.lower()] for c in candidates if c.lower() in columns), None)
+    return mapping
+
+
+def iter_batches(cursor, table_name, kind, size=FETCH_SIZE):
+    """
+    Yields lists of {field: value} dicts, `size` source rows at a time.
+    """
+    cursor.execute(f'SELECT * FROM "{table_name}"')
+    mapping = resolve_columns(cursor.description, kind)
+    defaults = {field: default for field, (_, default) in COLUMN_MAP[kind].items()}
+    getters = [(field, index, defaults[field]) for field, index in mapping.items()]
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield [
+            {field: (row[index] if index is not None and row[index] is not None else default)
+             for field, index, default in getters}
+            for row in rows
+        ]
+
+
+def _country_choice(value):
+    value = str(value or '').upper()
+    if "ENGLAND" in value: return CountryChoices.ENGLAND
+    if "SPAIN" in value: return CountryChoices.SPAIN
+    if "ITALY" in value: return CountryChoices.ITALY
+    if "GERMANY" in value: return CountryChoices.GERMANY
+    return CountryChoices.TURKEY
+
+
+def import_table(cursor, table_name, progress=None):
+    """
+    Imports one table in a single transaction. `progress(rows_done)` is called after each batch.
+    Returns the number of imported rows (None for unknown tables).
+    """
+    kind, country = table_kind(table_name)
+    if kind is None:
+        return None
+
+    done = 0
+
+    def rows():
+        nonlocal done
+        for batch in iter_batches(cursor, table_name, kind):
+            yield from batch
+            done += len(batch)
+            progress and progress(done)
+
+    with transaction.atomic():
+        # Squads, standings and fixtures are upserted while the source is read, so existing
+        # rows keep their ids; the bulletin becomes one version and is bounded by its size
+        if kind == 'squads':
+            sync_players(country, rows())
+        elif kind == 'standings':
+            sync_rows(Standing, country, (Standing(**fields) for fields in rows()))
+        elif kind == 'fixtures':
+            source, texts = itertools.tee(rows())
+            results = iter_result_fields((r['date'], r['score']) for r in texts)
+            sync_rows(Fixture, country, (Fixture(**fields, **result) for fields, result in zip(source, results)))
+        elif kind == 'bulletin':
+            bulletin = list(rows())
+            for index, fields in enumerate(bulletin):
+                fields['unique_key'] = fields['unique_key'] or f"unknown_{index}"
+                fields['country'] = _country_choice(fields['country'])
+            if bulletin:
+                publish_bulletin(bulletin, BulletinVersion.Source.IMPORT)
+    return done
+
+
+def run_import(tables, log=None):
+    """
+    Imports `tables` from scraper_data.db. With a TaskLog `log`, progress and the
+    result are written to it. Returns (success, message).
+    """
+    started = time.time()
+    lines = []
+    pending = None
+
+    def report(text, status='RUNNING'):
+        nonlocal pending
+        if log is None:
+            return
+        log.output = "\n".join(lines + [text] if text else lines)
+        log.status = status
+        log.duration_seconds = time.time() - started
+        # Written by the writer thread on its own connection (on every backend, unlike
+        # background_write): progress is not part of the open table transaction, and all
+        # writes of the log stay in order
+        pending = writer.submit(log.save, update_fields=['output', 'status', 'duration_seconds'])
+
+    def batch_progress(prefix, estimate):
+        last = time.time()
+
+        def progress(done):
+            nonlocal last
+            logger.debug(f"{prefix}: {done} rows")
+            # Throttled, and never more than one progress write waiting in the queue
+            if time.time() - last < PROGRESS_INTERVAL or (pending and not pending.done()):
+                return
+            last = time.time()
+            report(f"{prefix}: {done}/{estimate if estimate is not None else '?'} satır okundu...")
+        return progress
+
+    try:
+        conn = sqlite3.connect(scraper_db_path())
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing = {r[0] for r in cursor.fetchall()}
+            total = 0
+            for position, table_name in enumerate(tables, start=1):
+                prefix = f"[{position}/{len(tables)}] {table_name}"
+                if table_name not in existing:
+                    lines.append(f"{prefix}: tablo bulunamadı, atlandı.")
+                    continue
+                report(f"{prefix}: başlıyor...")
+                # On SQLite the table's transaction holds the write lock until it commits:
+                # let the start line land first (progress written meanwhile lands after the commit)
+                if log is not None:
+                    writer.flush()
+                table_started = time.time()
+                progress = batch_progress(prefix, table_row_estimate(cursor, table_name))
+                count = import_table(cursor, table_name, progress=progress)
+                if count is None:
+                    lines.append(f"{prefix}: bilinmeyen tablo türü, atlandı.")
+                    continue
+                total += count
+                lines.append(f"{prefix}: {count} kayıt ({time.time() - table_started:.1f}s)")
+                report(None)
+        finally:
+            conn.close()
+
+        link_team_refs()
+        message = f"Başarıyla {total} kayıt aktarıldı ({time.time() - started:.1f}s)."
+        lines.append(message)
+        report(None, status='SUCCESS')
+        return True, message
+    except Exception as e:
+        logger.error(f"Import failed: {e}", exc_info=True)
+        lines.append(f"Hata: {e}")
+        report(None, status='FAILED')
+        return False, str(e)
+
+
+def start_import_job(tables):
+    """
+    Starts run_import in a background thread. Returns the TaskLog that tracks it.
+    """
+    from automation.models import TaskLog
+
+    log = TaskLog.objects.create(task_name=IMPORT_TASK_NAME, status='RUNNING', output="Sıraya alındı...")
+
+    start_db_thread(run_import, tables, log, daemon=True)
+    return log
+
+
+def table_row_estimate(cursor, table_name):
+    """
+    Row count estimate from MAX(rowid) (an index lookup instead of a COUNT(*) scan).
+    Exact unless rows were deleted; None for WITHOUT ROWID tables.
+    """
+    try:
+        cursor.execute(f'SELECT MAX(rowid) FROM "{table_name}"')
+        return cursor.fetchone()[0] or 0
+    except sqlite3.Error:
+        return None
@@ -0,0 +1,43 @@
+import sys
+import gzip
+from django.core.management.base import BaseCommand, CommandError
+from data_manager.models import CountryChoices
+from data_manager.exports import EXPORTS, EXPORT_FORMATS, export_lines, export_to_file
+
+
+class Command(BaseCommand):
+    help = ('Streams a dataset as CSV/JSONL to stdout or a file (.gz paths are compressed), '
+            'or writes gzip exports of every dataset into EXPORT_DIR with --all')
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--output', help='Output file (default: stdout)')
+        parser.add_argument('--country', choices=CountryChoices.values)
+        parser.add_argument('--season', help='Season label, e.g. 2023/2024 (fixtures and archive exports)')
+        parser.add_argument('--all', action='store_true', help='Export every dataset into EXPORT_DIR')
+
+    def handle(self, *args, **options):
+        filters = {'country': options['country'], 'season': options['season']}
+        if options['all']:
+            for name in EXPORTS:
+                path, count = export_to_file(name, options['format'], filters=filters)
+                self.stdout.write(f"{name}: {count} rows -> {path}")
+            return
+        if not options['name']:
+            raise CommandError("Give a dataset name or --all.")
+
+        try:
+            lines = export_lines(options['name'], options['format'], filters)
+        except ValueError as e:
+            raise CommandError(str(e))
+        output = options['output']
+        if not output:
+            for line in lines:
+                sys.stdout.write(line)
+            return
+        opener = gzip.open if output.endswith('.gz') else open
+        with opener(output, 'wt', encoding='utf-8', newline='') as handle:
+            for line in lines:
+                handle.write(line)
+        self.stderr.write(self.style.SUCCESS(f"Exported {options['name']} to {output}."))
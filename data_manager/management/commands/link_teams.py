@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from data_manager.models import CountryChoices
+from data_manager.teams import link_team_refs
+
+
+class Command(BaseCommand):
+    help = 'Resolves team names to canonical Team rows and fills missing team FKs (standings, fixtures, squads, bulletin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--country', choices=CountryChoices.values, help='Only this country (default: all)')
+
+    def handle(self, *args, **options):
+        linked = link_team_refs(options.get('country'))
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} rows to canonical teams."))
@@ -0,0 +1,36 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from data_manager.models import CountryChoices
+from data_manager.archive import ARCHIVERS, load_archive_rows
+
+
+class Command(BaseCommand):
+    help = ('Loads past-season standings/fixtures/squads from a JSON file (list of scraped rows) '
+            'into the season archive, or snapshots the live tables with --from-live')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='JSON file with a list of rows')
+        parser.add_argument('--kind', choices=sorted(ARCHIVERS), help='standings, fixtures or squads')
+        parser.add_argument('--country', choices=CountryChoices.values, default=CountryChoices.TURKEY)
+        parser.add_argument('--season', help='Season label, e.g. 2023/2024')
+        parser.add_argument('--matchweek', type=int, help='Matchweek of a standings file (default: most games played)')
+        parser.add_argument('--from-live', action='store_true', help='Archive the current live tables of every country')
+
+    def handle(self, *args, **options):
+        if options['from_live']:
+            kinds = [options['kind']] if options['kind'] else sorted(ARCHIVERS)
+            for country in CountryChoices.values:
+                for kind in kinds:
+                    count = ARCHIVERS[kind](country)
+                    self.stdout.write(f"{country} {kind}: {count} rows archived")
+            return
+
+        if not (options['path'] and options['kind'] and options['season']):
+            raise CommandError("path, --kind and --season are required (or use --from-live).")
+
+        with open(options['path'], encoding='utf-8') as f:
+            rows = json.load(f)
+        count = load_archive_rows(options['kind'], options['country'], options['season'], rows, options['matchweek'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {count} {options['kind']} rows for {options['country']} {options['season']}."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from data_manager.models import BilyonerBulletin
+from data_manager.bulletin import refresh_typed_fields
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the typed odds and kickoff_at columns of every bulletin version from its text fields'
+
+    def handle(self, *args, **options):
+        count = refresh_typed_fields(BilyonerBulletin.all_versions.all())
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} bulletin rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from data_manager.models import Fixture
+from data_manager.fixtures import refresh_result_fields
+
+
+class Command(BaseCommand):
+    help = 'Recomputes goals, played flag, match_date and season of stored fixtures from their text fields'
+
+    def handle(self, *args, **options):
+        count = refresh_result_fields(Fixture.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} fixtures."))
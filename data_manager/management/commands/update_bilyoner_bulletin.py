@@ -9,7 +9,7 @@ from django.conf import settings
 sys.path.append(os.path.abspath(os.path.join(settings.BASE_DIR, '..')))
 
 from scraper.bilyoner import BilyonerScraper
-from data_manager.models import BilyonerBulletinStaging
+from data_manager.bulletin import stage_bulletin
 
 logger = logging.getLogger('scraper')
 
@@ -37,27 +37,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(msg))
             logger.info(msg)
             
-            # Clear Staging Table
-            BilyonerBulletinStaging.objects.all().delete()
-            
-            count = 0
-            for m in matches:
-                # Direct Create since we cleared (scraped list is unique by key)
-                BilyonerBulletinStaging.objects.create(
-                    unique_key=m['unique_key'],
-                    country=m.get('country', 'TURKEY'),
-                    league=m.get('league', '-'),
-                    match_date=m.get('match_date', ''),
-                    match_time=m.get('match_time', '00:00'),
-                    home_team=m.get('home_team', 'Unknown'),
-                    away_team=m.get('away_team', 'Unknown'),
-                    ms_1=m.get('ms_1', '-'),
-                    ms_x=m.get('ms_x', '-'),
-                    ms_2=m.get('ms_2', '-'),
-                    under_2_5=m.get('under_2_5', '-'),
-                    over_2_5=m.get('over_2_5', '-')
-                )
-                count += 1
+            # Replaces the staging area in one transaction
+            count = stage_bulletin(matches)
 
             done_msg = f"Done. Saved {count} matches to Staging Area."
             self.stdout.write(self.style.SUCCESS(done_msg))
@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.db import models
+from django.utils import timezone
 
 class CountryChoices(models.TextChoices):
     TURKEY = 'TURKEY', 'Türkiye'
@@ -15,8 +17,52 @@ class BaseLeagueModel(models.Model):
     class Meta:
         abstract = True
 
+class Team(models.Model):
+    """
+    Canonical team (standings spelling). Every other source spelling is a TeamAlias,
+    and league rows point here through their team_ref foreign keys.
+    """
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    name = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['country', 'name']
+        unique_together = ('country', 'name')
+
+    def __str__(self):
+        return f"[{self.get_country_display()}] {self.name}"
+
+class TeamAlias(models.Model):
+    class Source(models.TextChoices):
+        STANDINGS = 'standings', 'Puan Durumu'
+        FIXTURES = 'fixtures', 'Fikstür'
+        SQUADS = 'squads', 'Kadrolar'
+        BULLETIN = 'bulletin', 'Bülten'
+        MANUAL = 'manual', 'Manuel'
+        GUESS = 'guess', 'Tahmin (kontrol edilecek)'  # word/fuzzy match; rows are linked once approved in the admin
+
+    team = models.ForeignKey(Team, related_name='aliases', on_delete=models.CASCADE)
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    alias = models.CharField(max_length=255)  # normalized spelling (see data_manager.teams.normalize_team_name)
+    source = models.CharField(max_length=20, choices=Source.choices, default=Source.MANUAL)
+
+    class Meta:
+        unique_together = ('country', 'alias')
+        verbose_name_plural = "Team aliases"
+
+    def save(self, *args, **kwargs):
+        # Manual aliases typed in the admin are stored in the same normalized form
+        from .teams import normalize_team_name
+        self.alias = normalize_team_name(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.team.name} ({self.source})"
+
 class Player(BaseLeagueModel):
     team_name = models.CharField(max_length=100)
+    team_ref = models.ForeignKey(Team, related_name='players', on_delete=models.SET_NULL, null=True, blank=True)
     jersey_number = models.IntegerField(default=0)
     player_name = models.CharField(max_length=150)
     profile_url = models.URLField(max_length=500, blank=True, null=True)
@@ -28,6 +74,12 @@ class Player(BaseLeagueModel):
     assists = models.IntegerField(default=0)
     yellow_cards = models.IntegerField(default=0)
     red_cards = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Keyset ordering of the players listing
+            models.Index(fields=['country', 'team_name', 'jersey_number', 'id']),
+        ]
     
     def __str__(self):
         return f"[{self.get_country_display()}] {self.player_name} ({self.team_name})"
@@ -35,6 +87,7 @@ class Player(BaseLeagueModel):
 class Standing(BaseLeagueModel):
     rank = models.IntegerField(default=0)
     team = models.CharField(max_length=100)
+    team_ref = models.ForeignKey(Team, related_name='standings', on_delete=models.SET_NULL, null=True, blank=True)
     played = models.IntegerField(default=0)
     won = models.IntegerField(default=0)
     drawn = models.IntegerField(default=0)
@@ -43,13 +96,40 @@ class Standing(BaseLeagueModel):
     goals_against = models.IntegerField(default=0)
     average = models.IntegerField(default=0)
     points = models.IntegerField(default=0)
+    # Scraped points minus 3W+D (deductions); kept when points are derived from fixtures
+    points_adjustment = models.IntegerField(default=0)
+    adjustment_season = models.CharField(max_length=9, blank=True, default="")  # fixture season of points_adjustment
+    # Fixtures disagreed with the scraped row at the last reconcile: keep the scraped values until the next one
+    pinned = models.BooleanField(default=False)
+    reconciled_at = models.DateTimeField(null=True, blank=True)  # last comparison with the scraped table
 
     class Meta:
         ordering = ['country', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'team'], name='uniq_standing_country_team'),
+        ]
+        indexes = [models.Index(fields=['country', 'rank', 'id'])]  # listing keyset ordering
 
     def __str__(self):
         return f"[{self.get_country_display()}] {self.rank}. {self.team} ({self.points}p)"
 
+# Newest result first. Played fixtures with an unparsed date have match_date NULL; PostgreSQL
+# sorts NULLs first on DESC (SQLite last), so they are pushed to the end explicitly
+NEWEST_FIRST = (models.F('match_date').desc(nulls_last=True), '-id')
+
+class FixtureQuerySet(models.QuerySet):
+    def for_team(self, team_id):
+        return self.filter(models.Q(home_team_ref_id=team_id) | models.Q(away_team_ref_id=team_id))
+
+    def last_results(self, team_id, limit=5, before=None):
+        """
+        Last `limit` played matches of a team, newest first (index range scan on team + match_date).
+        """
+        qs = self.for_team(team_id).filter(played=True)
+        if before is not None:
+            qs = qs.filter(match_date__lt=before)
+        return qs.order_by(*NEWEST_FIRST)[:limit]
+
 class Fixture(BaseLeagueModel):
     week = models.CharField(max_length=100)  # "1. Hafta" etc.
     date = models.CharField(max_length=100, blank=True, null=True)
@@ -57,20 +137,108 @@ class Fixture(BaseLeagueModel):
     home_team = models.CharField(max_length=100)
     score = models.CharField(max_length=50, blank=True, null=True)
     away_team = models.CharField(max_length=100)
+    home_team_ref = models.ForeignKey(Team, related_name='home_fixtures', on_delete=models.SET_NULL, null=True, blank=True)
+    away_team_ref = models.ForeignKey(Team, related_name='away_fixtures', on_delete=models.SET_NULL, null=True, blank=True)
+    match_url = models.URLField(max_length=500, blank=True, null=True)  # Transfermarkt match report
+
+    # Structured result, filled at ingest by data_manager.fixtures
+    home_goals = models.IntegerField(null=True, blank=True)
+    away_goals = models.IntegerField(null=True, blank=True)
+    played = models.BooleanField(default=False)
+    match_date = models.DateField(null=True, blank=True)
+    season = models.CharField(max_length=9, blank=True, default="")  # "2025/2026"
+
+    objects = FixtureQuerySet.as_manager()
 
     class Meta:
         ordering = ['country', 'week']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'season', 'home_team', 'away_team'], name='uniq_fixture_natural_key'),
+        ]
+        indexes = [
+            models.Index(fields=['country', 'match_date']),
+            models.Index(fields=['home_team_ref', 'match_date']),
+            models.Index(fields=['away_team_ref', 'match_date']),
+            models.Index(fields=['country', 'home_team', 'match_date']),
+            models.Index(fields=['country', 'away_team', 'match_date']),
+            models.Index(fields=['country', '-id'], name='fixture_listing_idx'),  # listing keyset ordering
+        ]
 
     def __str__(self):
         return f"[{self.get_country_display()}] {self.week}: {self.home_team} vs {self.away_team}"
 
+class BulletinVersion(models.Model):
+    """
+    Immutable bulletin snapshot. Every publish writes its rows under a new version
+    and then moves the `is_current` pointer; readers only see the current version.
+    """
+    class Source(models.TextChoices):
+        STAGING = 'staging', 'Staging Yayını'
+        PUSH = 'push', 'Dış Push (API)'
+        LOCAL_SCRAPE = 'local_scrape', 'Lokal Tarama'
+        IMPORT = 'import', 'SQLite Aktarımı'
+
+    source = models.CharField(max_length=20, choices=Source.choices, default=Source.STAGING)
+    row_count = models.IntegerField(default=0)
+    is_current = models.BooleanField(default=False)
+    sync_token = models.CharField(max_length=100, blank=True, default="", db_index=True)  # delta sync apply id
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-published_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['is_current'], condition=models.Q(is_current=True), name='single_current_bulletin_version'),
+        ]
+
+    def __str__(self):
+        marker = " (current)" if self.is_current else ""
+        return f"v{self.id} {self.get_source_display()} - {self.row_count} maç{marker}"
+
+class BulletinQuerySet(models.QuerySet):
+    def upcoming(self, hours=None):
+        """
+        Matches not started yet, optionally only those kicking off within `hours`.
+        """
+        now = timezone.now()
+        qs = self.filter(kickoff_at__gte=now)
+        if hours is not None:
+            qs = qs.filter(kickoff_at__lte=now + timedelta(hours=hours))
+        return qs
+
+    def odds_between(self, field, low=None, high=None):
+        """
+        e.g. odds_between('odds_1', 1.3, 2.0). Rows without that odd are excluded.
+        """
+        qs = self.filter(**{f"{field}__isnull": False})
+        if low is not None:
+            qs = qs.filter(**{f"{field}__gte": low})
+        if high is not None:
+            qs = qs.filter(**{f"{field}__lte": high})
+        return qs
+
+class CurrentBulletinManager(models.Manager.from_queryset(BulletinQuerySet)):
+    """
+    Default manager: rows of the current version only. Rows written before versioning
+    are shown only while no version is current (the first versioned publish removes them),
+    so a unique_key never matches two rows.
+    """
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            models.Q(version__is_current=True)
+            | models.Q(version__isnull=True) & ~models.Exists(BulletinVersion.objects.filter(is_current=True))
+        )
+
 class BilyonerBulletin(BaseLeagueModel):
-    unique_key = models.CharField(max_length=255, unique=True)
+    version = models.ForeignKey(BulletinVersion, related_name='matches', on_delete=models.CASCADE, null=True, blank=True)
+    unique_key = models.CharField(max_length=255)
     league = models.CharField(max_length=100, blank=True, null=True)
     match_date = models.CharField(max_length=20, default="", blank=True)
     match_time = models.CharField(max_length=50) # "20:00"
     home_team = models.CharField(max_length=100)
     away_team = models.CharField(max_length=100)
+    home_team_ref = models.ForeignKey(Team, related_name='home_bulletins', on_delete=models.SET_NULL, null=True, blank=True)
+    away_team_ref = models.ForeignKey(Team, related_name='away_bulletins', on_delete=models.SET_NULL, null=True, blank=True)
     
     # Odds can be strings ("1.45") or Floats. Using CHAR for safety to avoid float precision issues during scrape/display
     ms_1 = models.CharField(max_length=10, default="-")
@@ -78,17 +246,83 @@ class BilyonerBulletin(BaseLeagueModel):
     ms_2 = models.CharField(max_length=10, default="-")
     under_2_5 = models.CharField(max_length=10, default="-")
     over_2_5 = models.CharField(max_length=10, default="-")
+
+    # Typed copies filled by data_manager.bulletin (null when the odd is missing)
+    odds_1 = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    odds_x = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    odds_2 = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    odds_under_2_5 = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    odds_over_2_5 = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    kickoff_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
+    # Content hash of the display fields (scraper.bulletin_sync.row_hash), compared by the delta sync
+    row_hash = models.CharField(max_length=40, blank=True, default="")
+
     # AI Cache
     gemini_analysis = models.TextField(blank=True, null=True, verbose_name="Gemini AI Analizi")
 
+    objects = CurrentBulletinManager()
+    all_versions = BulletinQuerySet.as_manager()
+
     class Meta:
-        ordering = ['country', 'match_time']
+        ordering = ['country', 'kickoff_at', 'match_time']
         verbose_name_plural = "Bilyoner Bulletins"
+        indexes = [models.Index(fields=['country', 'kickoff_at'])]
+        constraints = [
+            models.UniqueConstraint(fields=['version', 'unique_key'], name='uniq_bulletin_version_key'),
+        ]
 
     def __str__(self):
         return f"[{self.get_country_display()}] {self.home_team} vs {self.away_team}"
 
+class OddsMoveQuerySet(models.QuerySet):
+    def series(self, unique_key, match_date, market=None):
+        """
+        Price history of one match (optionally one market), oldest first.
+        """
+        qs = self.filter(unique_key=unique_key, match_date=match_date)
+        if market:
+            qs = qs.filter(market=market)
+        return qs.order_by('market', 'recorded_at', 'id')
+
+    def recent(self, minutes=60):
+        """
+        Price changes recorded in the last `minutes`.
+        """
+        return self.filter(recorded_at__gte=timezone.now() - timedelta(minutes=minutes))
+
+class OddsMove(models.Model):
+    """
+    Append-only odds history. One row per (match, market) whenever the price changes;
+    unchanged prices are not written again, so volume follows actual line moves.
+    """
+    class Market(models.TextChoices):
+        HOME = '1', 'MS 1'
+        DRAW = 'X', 'MS X'
+        AWAY = '2', 'MS 2'
+        UNDER_2_5 = 'U25', '2.5 Alt'
+        OVER_2_5 = 'O25', '2.5 Üst'
+
+    # A match is (unique_key, match_date): the key is only "home-away", so it repeats every season
+    unique_key = models.CharField(max_length=255)  # BilyonerBulletin.unique_key
+    match_date = models.CharField(max_length=20, default="", blank=True)  # BilyonerBulletin.match_date
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    market = models.CharField(max_length=3, choices=Market.choices)
+    odds = models.DecimalField(max_digits=7, decimal_places=2)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    objects = OddsMoveQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['unique_key', 'match_date', 'market', 'recorded_at']
+        indexes = [
+            models.Index(fields=['unique_key', 'match_date', 'market', 'recorded_at']),  # series for a match
+            models.Index(fields=['recorded_at']),  # moves in the last N minutes
+        ]
+
+    def __str__(self):
+        return f"{self.unique_key} ({self.match_date}) {self.market} @ {self.odds} ({self.recorded_at:%d.%m %H:%M})"
+
 class BilyonerBulletinStaging(BaseLeagueModel):
     unique_key = models.CharField(max_length=255, unique=True)
     league = models.CharField(max_length=100, blank=True, null=True)
@@ -110,3 +344,222 @@ class BilyonerBulletinStaging(BaseLeagueModel):
 
     def __str__(self):
         return f"[STAGING] {self.home_team} vs {self.away_team}"
+
+class CrawledPage(models.Model):
+    """
+    Bookkeeping for the detail crawler: one row per match/player page URL.
+    content_hash is the hash of the parsed rows, so unchanged pages are not rewritten.
+    """
+    class Kind(models.TextChoices):
+        MATCH = 'match', 'Maç Detayı'
+        PLAYER = 'player', 'Oyuncu Profili'
+
+    class Status(models.TextChoices):
+        OK = 'ok', 'OK'
+        EMPTY = 'empty', 'Veri Yok'
+        ERROR = 'error', 'Hata'
+
+    url = models.URLField(max_length=500, unique=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.OK)
+    content_hash = models.CharField(max_length=40, blank=True, default="")
+    error_count = models.IntegerField(default=0)
+    last_crawled = models.DateTimeField(null=True, blank=True)
+    last_changed = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['kind', 'status'])]
+
+    def __str__(self):
+        return f"[{self.kind}] {self.url} ({self.status})"
+
+class MatchStat(BaseLeagueModel):
+    match_url = models.URLField(max_length=500, unique=True)
+    home_team = models.CharField(max_length=100, blank=True, default="")
+    away_team = models.CharField(max_length=100, blank=True, default="")
+    home_goals = models.IntegerField(null=True, blank=True)
+    away_goals = models.IntegerField(null=True, blank=True)
+    home_shots = models.IntegerField(null=True, blank=True)
+    away_shots = models.IntegerField(null=True, blank=True)
+    home_shots_off = models.IntegerField(null=True, blank=True)
+    away_shots_off = models.IntegerField(null=True, blank=True)
+    home_saves = models.IntegerField(null=True, blank=True)
+    away_saves = models.IntegerField(null=True, blank=True)
+    home_corners = models.IntegerField(null=True, blank=True)
+    away_corners = models.IntegerField(null=True, blank=True)
+    home_free_kicks = models.IntegerField(null=True, blank=True)
+    away_free_kicks = models.IntegerField(null=True, blank=True)
+    home_fouls = models.IntegerField(null=True, blank=True)
+    away_fouls = models.IntegerField(null=True, blank=True)
+    home_offsides = models.IntegerField(null=True, blank=True)
+    away_offsides = models.IntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"[{self.get_country_display()}] {self.home_team} {self.home_goals}-{self.away_goals} {self.away_team}"
+
+class PlayerSeasonStat(BaseLeagueModel):
+    profile_url = models.URLField(max_length=500, db_index=True)
+    player_name = models.CharField(max_length=150, blank=True, default="")
+    season = models.CharField(max_length=20)  # "2025/2026"
+    competition = models.CharField(max_length=100, blank=True, default="")
+    team_name = models.CharField(max_length=100, blank=True, default="")
+    appearances = models.IntegerField(default=0)
+    minutes = models.IntegerField(default=0)
+    goals = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    yellow_cards = models.IntegerField(default=0)
+    red_cards = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['profile_url', '-season']
+
+    def __str__(self):
+        return f"{self.player_name} {self.season} {self.competition}: {self.goals}G {self.assists}A"
+
+# --- SEASON ARCHIVE (history for modelling / backtesting) ---
+# Live tables (Standing, Fixture, Player) keep only the current snapshot. The archive
+# keeps every season. (country, season) lookups use the unique constraints' indexes;
+# the extra indexes serve per-team history: (team_ref, season), (home/away_team_ref, match_date).
+
+class SeasonStandingQuerySet(models.QuerySet):
+    def table(self, country, season, matchweek=None):
+        """
+        League table of a season after `matchweek` (default: the last archived one).
+        """
+        qs = self.filter(country=country, season=season)
+        if matchweek is None:
+            matchweek = qs.aggregate(m=models.Max('matchweek'))['m']
+        return qs.filter(matchweek=matchweek).order_by('rank')
+
+    def final_tables(self):
+        """
+        Rows of the last archived matchweek of each (country, season).
+        """
+        last_week = SeasonStanding.objects.filter(
+            country=models.OuterRef('country'), season=models.OuterRef('season')
+        ).order_by('-matchweek').values('matchweek')[:1]
+        return self.filter(matchweek=models.Subquery(last_week))
+
+    def team_history(self, team_id):
+        """
+        The team's final position in every archived season.
+        """
+        return self.final_tables().filter(team_ref_id=team_id).order_by('season')
+
+class SeasonStanding(models.Model):
+    """
+    End-of-matchweek league table, one row per (country, season, matchweek, team).
+    """
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    season = models.CharField(max_length=9)  # "2025/2026"
+    matchweek = models.IntegerField(default=0)
+    team = models.CharField(max_length=100)
+    team_ref = models.ForeignKey(Team, related_name='season_standings', on_delete=models.SET_NULL, null=True, blank=True)
+    rank = models.IntegerField(default=0)
+    played = models.IntegerField(default=0)
+    won = models.IntegerField(default=0)
+    drawn = models.IntegerField(default=0)
+    lost = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    average = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    captured_at = models.DateTimeField(auto_now=True)
+
+    objects = SeasonStandingQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['country', 'season', 'matchweek', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'season', 'matchweek', 'team'], name='uniq_season_standing'),
+        ]
+        indexes = [models.Index(fields=['team_ref', 'season'])]
+
+    def __str__(self):
+        return f"[{self.country} {self.season} H{self.matchweek}] {self.rank}. {self.team}"
+
+class SeasonFixtureQuerySet(models.QuerySet):
+    def season_results(self, country, season):
+        return self.filter(country=country, season=season, played=True).order_by('match_date', 'id')
+
+    def head_to_head(self, team_a, team_b, limit=10):
+        """
+        Latest archived meetings of two teams (Team ids), both venues.
+        """
+        return self.filter(
+            models.Q(home_team_ref_id=team_a, away_team_ref_id=team_b) |
+            models.Q(home_team_ref_id=team_b, away_team_ref_id=team_a),
+            played=True,
+        ).order_by(*NEWEST_FIRST)[:limit]
+
+    def for_team(self, team_id, seasons=None):
+        qs = self.filter(models.Q(home_team_ref_id=team_id) | models.Q(away_team_ref_id=team_id))
+        if seasons:
+            qs = qs.filter(season__in=seasons)
+        return qs
+
+class SeasonFixture(models.Model):
+    """
+    Every fixture of every archived season.
+    """
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    season = models.CharField(max_length=9)
+    week = models.CharField(max_length=100, blank=True, default="")
+    match_date = models.DateField(null=True, blank=True)
+    home_team = models.CharField(max_length=100)
+    away_team = models.CharField(max_length=100)
+    home_team_ref = models.ForeignKey(Team, related_name='season_home_fixtures', on_delete=models.SET_NULL, null=True, blank=True)
+    away_team_ref = models.ForeignKey(Team, related_name='season_away_fixtures', on_delete=models.SET_NULL, null=True, blank=True)
+    score = models.CharField(max_length=50, blank=True, default="")
+    home_goals = models.IntegerField(null=True, blank=True)
+    away_goals = models.IntegerField(null=True, blank=True)
+    played = models.BooleanField(default=False)
+    match_url = models.URLField(max_length=500, blank=True, null=True)
+
+    objects = SeasonFixtureQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['country', 'season', 'match_date']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'season', 'home_team', 'away_team'], name='uniq_season_fixture'),
+        ]
+        indexes = [
+            models.Index(fields=['country', 'season', 'match_date']),
+            models.Index(fields=['home_team_ref', 'match_date']),
+            models.Index(fields=['away_team_ref', 'match_date']),
+        ]
+
+    def __str__(self):
+        return f"[{self.country} {self.season}] {self.home_team} {self.score or '-'} {self.away_team}"
+
+class SeasonPlayerStat(models.Model):
+    """
+    Squad statistics of a player at the end of an archived season (last snapshot wins).
+    """
+    country = models.CharField(max_length=20, choices=CountryChoices.choices, default=CountryChoices.TURKEY)
+    season = models.CharField(max_length=9)
+    team_name = models.CharField(max_length=100)
+    team_ref = models.ForeignKey(Team, related_name='season_players', on_delete=models.SET_NULL, null=True, blank=True)
+    player_name = models.CharField(max_length=100)
+    player_key = models.CharField(max_length=500)  # profile URL, or the name for rows without a link
+    position = models.CharField(max_length=50, blank=True, default="")
+    age = models.IntegerField(default=0, null=True, blank=True)
+    matches_played = models.IntegerField(default=0)
+    starts = models.IntegerField(default=0)
+    goals = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    yellow_cards = models.IntegerField(default=0)
+    red_cards = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['country', 'season', 'team_name', 'player_name']
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'season', 'team_name', 'player_key'], name='uniq_season_player'),
+        ]
+        indexes = [
+            models.Index(fields=['team_ref', 'season']),
+            models.Index(fields=['player_key', 'season']),
+        ]
+
+    def __str__(self):
+        return f"[{self.country} {self.season}] {self.player_name} ({self.team_name})"
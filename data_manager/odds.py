@@ -0,0 +1,118 @@
+"""
+Odds history (OddsMove) written at publish time.
+
+Each new bulletin version is compared with the last recorded move of every
+(match, market), a match being (unique_key, match_date); only changed or
+first-seen prices are appended. Readers get the series of a match, recent
+moves and opening -> latest drift.
+"""
+from django.utils import timezone
+from .models import OddsMove, BilyonerBulletin
+
+# typed bulletin column -> market code
+MARKETS = {
+    'odds_1': OddsMove.Market.HOME,
+    'odds_x': OddsMove.Market.DRAW,
+    'odds_2': OddsMove.Market.AWAY,
+    'odds_under_2_5': OddsMove.Market.UNDER_2_5,
+    'odds_over_2_5': OddsMove.Market.OVER_2_5,
+}
+
+
+def match_key(row):
+    """
+    (unique_key, match_date) of a bulletin row dict: the unique_key alone repeats every season.
+    """
+    return row['unique_key'], row.get('match_date') or ""
+
+
+def latest_prices(matches):
+    """
+    {(unique_key, match_date, market): odds} of the last recorded move of every (match, market).
+    """
+    matches = set(matches)
+    prices = {}
+    history = (OddsMove.objects.filter(unique_key__in={key for key, _ in matches})
+               .order_by('recorded_at', 'id').values_list('unique_key', 'match_date', 'market', 'odds'))
+    for key, match_date, market, odds in history:
+        if (key, match_date) in matches:
+            prices[(key, match_date, market)] = odds
+    return prices
+
+
+def _bulletin_seed(matches, recorded_at):
+    """
+    OddsMove rows of the current bulletin's prices for `matches` (matches published
+    before the history was recorded), so their history starts from the bulletin.
+    """
+    seed = []
+    rows = (BilyonerBulletin.objects.filter(unique_key__in={key for key, _ in matches})
+            .values('unique_key', 'match_date', 'country', 'version__published_at', *MARKETS))
+    for row in rows:
+        if match_key(row) not in matches:
+            continue
+        for column, market in MARKETS.items():
+            if row[column] is not None:
+                seed.append(OddsMove(
+                    unique_key=row['unique_key'], match_date=row['match_date'], country=row['country'],
+                    market=market, odds=row[column], recorded_at=row['version__published_at'] or recorded_at,
+                ))
+    return seed
+
+
+def record_odds_moves(rows, recorded_at=None):
+    """
+    rows: BilyonerBulletin field dicts (typed odds included) about to be published.
+    Appends an OddsMove for every price that differs from the last recorded move of the
+    same match. A match without any move is seeded once from the current bulletin.
+    Returns the number of moves written (seed rows included).
+    """
+    rows = [row for row in rows if row.get('unique_key')]
+    if not rows:
+        return 0
+    recorded_at = recorded_at or timezone.now()
+    matches = {match_key(row) for row in rows}
+    previous = latest_prices(matches)
+
+    moves = _bulletin_seed(matches - {(key, match_date) for key, match_date, _ in previous}, recorded_at)
+    for move in moves:
+        previous[(move.unique_key, move.match_date, move.market)] = move.odds
+    for row in rows:
+        for column, market in MARKETS.items():
+            odds = row.get(column)
+            if odds is not None and previous.get((*match_key(row), market)) != odds:
+                moves.append(OddsMove(
+                    unique_key=row['unique_key'], match_date=row.get('match_date') or "",
+                    country=row.get('country') or 'TURKEY', market=market, odds=odds, recorded_at=recorded_at,
+                ))
+    # Seed rows go first, so (recorded_at, id) keeps them before this publish's moves
+    OddsMove.objects.bulk_create(moves, batch_size=1000)
+    return len(moves)
+
+
+def odds_drift(matches, market=OddsMove.Market.HOME):
+    """
+    {(unique_key, match_date): (opening odds, latest odds, number of moves)} for one market.
+    """
+    matches = set(matches)
+    drift = {}
+    history = (OddsMove.objects.filter(unique_key__in={key for key, _ in matches}, market=market)
+               .order_by('recorded_at', 'id').values_list('unique_key', 'match_date', 'odds'))
+    for key, match_date, odds in history:
+        if (key, match_date) not in matches:
+            continue
+        opening, _, moves = drift.get((key, match_date), (odds, None, 0))
+        drift[(key, match_date)] = (opening, odds, moves + 1)
+    return drift
+
+
+def match_drift(unique_key, match_date):
+    """
+    [{'market': 'MS 1', 'opening': ..., 'latest': ..., 'moves': n}, ...] for one match, from its series.
+    """
+    drift = {}
+    for market, odds in OddsMove.objects.series(unique_key, match_date or "").values_list('market', 'odds'):
+        entry = drift.setdefault(market, {'market': OddsMove.Market(market).label, 'opening': odds, 'moves': 0})
+        entry['latest'] = odds
+        entry['moves'] += 1
+    return [drift[m] for m in OddsMove.Market.values if m in drift]
@@ -0,0 +1,135 @@
+"""
+Keyset (cursor) pagination for the listing pages.
+
+OFFSET pagination reads and throws away every row before the page, so deep pages
+get slower. Here the page continues from the ordering values of the last (or
+first) row it showed: WHERE (a, b, id) > (va, vb, vid) ORDER BY a, b, id LIMIT n.
+With an index on the ordering every page costs the same. The ordering must end
+with a unique field (id) and its fields must not be NULL.
+"""
+import json
+import base64
+import binascii
+import datetime
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+PER_PAGE = 50
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder cuts datetimes/times to milliseconds; a cursor needs the exact
+    value, or rows inside the same millisecond are skipped or repeated.
+    """
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(direction, values):
+    raw = json.dumps([direction, values], cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    ('next' | 'prev', [values]) or ('next', None) for a missing or broken cursor.
+    """
+    if not cursor:
+        return 'next', None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(raw)
+    except (ValueError, TypeError, binascii.Error):
+        return 'next', None
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        return 'next', None
+    return direction, values
+
+
+def _after(model, ordering, values):
+    """
+    Q for rows strictly after `values` in `ordering`:
+    (a > va) OR (a = va AND b > vb) OR (a = va AND b = vb AND id > vid) ('-' fields use <).
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        value = model._meta.get_field(name).to_python(value)
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPage:
+    """
+    One page: `items` plus `next_url` / `prev_url` (None at the ends) built from the request's query string.
+    """
+    def __init__(self, items, next_cursor, prev_cursor, request=None, param='cursor'):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.next_url = self._url(request, param, next_cursor)
+        self.prev_url = self._url(request, param, prev_cursor)
+        self.first_url = self._url(request, param, '') if prev_cursor else None
+
+    @staticmethod
+    def _url(request, param, cursor):
+        if request is None or cursor is None:
+            return None
+        query = request.GET.copy()
+        query.pop(param, None)
+        if cursor:
+            query[param] = cursor
+        return f"?{query.urlencode()}"
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_page(queryset, ordering, request=None, per_page=PER_PAGE, param='cursor'):
+    """
+    Returns the KeysetPage of `queryset` in `ordering` selected by request.GET[param].
+    """
+    model = queryset.model
+    direction, values = decode_cursor(request.GET.get(param) if request is not None else None)
+    if values is not None and len(values) != len(ordering):
+        direction, values = 'next', None
+
+    order = list(ordering) if direction == 'next' else [_flip(f) for f in ordering]
+    qs = queryset.order_by(*order)
+    if values is not None:
+        try:
+            qs = qs.filter(_after(model, order, values))
+        except ValidationError:
+            # Cursor values that do not fit the fields: start over
+            direction, values = 'next', None
+            order, qs = list(ordering), queryset.order_by(*ordering)
+
+    rows = list(qs[:per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+        has_prev, has_next = more, True
+    else:
+        has_prev, has_next = values is not None, more
+
+    def key(obj):
+        return [getattr(obj, f.lstrip('-')) for f in ordering]
+
+    next_cursor = encode_cursor('next', key(rows[-1])) if rows and has_next else None
+    prev_cursor = encode_cursor('prev', key(rows[0])) if rows and has_prev else None
+    return KeysetPage(rows, next_cursor, prev_cursor, request, param)
@@ -0,0 +1,113 @@
+"""
+Squad rows: normalization of the scrapers' key variants and the hash-diff upsert.
+
+Players have no natural key column, so rows are matched on (team, profile URL or
+name) and compared by a hash of their stat columns. Only new or changed players
+are written and only vanished players are deleted, so Player ids and team links
+survive a refresh. Scrapes (save_squads), snapshot seeding and the desktop
+import all go through sync_players.
+"""
+import hashlib
+from django.utils import timezone
+
+from .models import Player
+from .stats import invalidate_dataset_stats
+
+PLAYER_FIELDS = (
+    'team_name', 'jersey_number', 'player_name', 'profile_url', 'position', 'age',
+    'matches_played', 'starts', 'goals', 'assists', 'yellow_cards', 'red_cards',
+)
+
+
+def _safe_int(v):
+    try: return int(v)
+    except (TypeError, ValueError): return 0
+
+
+def player_fields(row):
+    """
+    Normalizes a scraped squad row (any scraper key variant) into Player field values.
+    """
+    return {
+        'team_name': row.get('team_name', row.get('team', '')),
+        'jersey_number': _safe_int(row.get('jersey_number', row.get('number', 0))),
+        'player_name': row.get('player_name', row.get('name', 'Unknown')),
+        'profile_url': row.get('profile_url', '') or '',
+        'position': row.get('position', '') or '',
+        'age': _safe_int(row.get('age', 0)),
+        'matches_played': _safe_int(row.get('matches_played', row.get('matches', 0))),
+        'starts': _safe_int(row.get('starts', 0)),
+        'goals': _safe_int(row.get('goals', 0)),
+        'assists': _safe_int(row.get('assists', 0)),
+        'yellow_cards': _safe_int(row.get('yellow_cards', row.get('yellow', 0))),
+        'red_cards': _safe_int(row.get('red_cards', row.get('red', 0))),
+    }
+
+
+def player_key(fields):
+    # Profile URL is the stable identity; name is the fallback for rows without a link
+    return (fields['team_name'], fields['profile_url'] or fields['player_name'])
+
+
+def player_hash(fields):
+    raw = "|".join(str(fields[f] if fields[f] is not None else '') for f in PLAYER_FIELDS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def sync_players(country, rows, teams=None, changed_keys=None, batch_size=500):
+    """
+    Makes the country's players (only `teams`' players if given) equal to `rows`
+    (raw squad dicts, any iterable). Changes are written every `batch_size` rows.
+    With a `changed_keys` list, the player_key of created, updated and deleted
+    players is appended to it. Returns (created, updated, deleted, unchanged).
+    """
+    existing_qs = Player.objects.filter(country=country)
+    if teams is not None:
+        existing_qs = existing_qs.filter(team_name__in=teams)
+
+    existing = {}
+    for values in existing_qs.values('id', *PLAYER_FIELDS).iterator(chunk_size=2000):
+        pk = values.pop('id')
+        existing[player_key(values)] = (pk, player_hash(values))
+
+    now = timezone.now()
+    seen = set()
+    to_create, to_update = [], []
+    created = updated = 0
+
+    def flush():
+        if to_create:
+            Player.objects.bulk_create(to_create)
+        if to_update:
+            Player.objects.bulk_update(to_update, list(PLAYER_FIELDS) + ['updated_at'])
+        if changed_keys is not None:
+            changed_keys.extend(player_key(obj.__dict__) for obj in to_create + to_update)
+        to_create.clear()
+        to_update.clear()
+
+    for row in rows:
+        fields = player_fields(row)
+        key = player_key(fields)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        current = existing.get(key)
+        if current is None:
+            to_create.append(Player(country=country, **fields))
+            created += 1
+        elif current[1] != player_hash(fields):
+            to_update.append(Player(id=current[0], country=country, updated_at=now, **fields))
+            updated += 1
+        if len(to_create) + len(to_update) >= batch_size:
+            flush()
+    flush()
+
+    vanished = {key: pk for key, (pk, _) in existing.items() if key not in seen}
+    if vanished:
+        Player.objects.filter(id__in=vanished.values()).delete()
+        if changed_keys is not None:
+            changed_keys.extend(vanished)
+    if created or updated or vanished:
+        invalidate_dataset_stats()
+    return created, updated, len(vanished), len(seen) - created - updated
@@ -0,0 +1,253 @@
+"""
+Standings engine: league tables derived from stored Fixture results.
+
+Every number of a Standing row (played, W/D/L, goals, points) follows from the
+played fixtures of the season. When a fixtures sync changes results, only the
+teams involved are recomputed (teams are matched by their team_ref), the table
+is re-ranked with the league's tie-breakers and only rows whose values or rank
+changed are written. The scraped table is fetched only every
+STANDINGS_RECONCILE_HOURS to reconcile: it stays the authority. Point
+deductions are kept as points_adjustment (for that fixture season only), and
+teams whose fixture totals disagree are pinned to the scraped row until the
+next reconcile.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Max
+from django.utils import timezone
+
+from .models import Standing, Fixture, Team, CountryChoices
+from .stats import invalidate_dataset_stats
+
+logger = logging.getLogger('automation')
+
+TOTAL_FIELDS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against')
+
+# Criteria after points, in order; h2h_* are computed over the matches between the teams level on points
+TIEBREAKERS = {
+    CountryChoices.TURKEY: ('h2h_points', 'h2h_goal_difference', 'h2h_goals_for', 'goal_difference', 'goals_for'),
+    CountryChoices.ENGLAND: ('goal_difference', 'goals_for', 'h2h_points', 'h2h_away_goals'),
+    CountryChoices.SPAIN: ('h2h_points', 'h2h_goal_difference', 'goal_difference', 'goals_for'),
+    CountryChoices.ITALY: ('h2h_points', 'h2h_goal_difference', 'goal_difference', 'goals_for'),
+    CountryChoices.GERMANY: ('goal_difference', 'goals_for', 'h2h_points', 'h2h_goal_difference', 'h2h_away_goals'),
+}
+DEFAULT_TIEBREAKERS = ('goal_difference', 'goals_for')
+
+
+def current_fixture_season(country):
+    return Fixture.objects.filter(country=country).exclude(season="").aggregate(s=Max('season'))['s']
+
+
+def _played(country, season):
+    return Fixture.objects.filter(
+        country=country, season=season, played=True,
+        home_team_ref__isnull=False, away_team_ref__isnull=False,
+        home_goals__isnull=False, away_goals__isnull=False,
+    )
+
+
+def team_totals(country, season, team_ids=None):
+    """
+    {team_id: {'played': n, 'won': n, ...}} from the played fixtures of the season.
+    With `team_ids` only those teams are computed (matches read through the team indexes).
+    """
+    fixtures = _played(country, season)
+    if team_ids is not None:
+        fixtures = fixtures.filter(Q(home_team_ref_id__in=team_ids) | Q(away_team_ref_id__in=team_ids))
+        totals = {team_id: dict.fromkeys(TOTAL_FIELDS, 0) for team_id in team_ids}
+    else:
+        totals = defaultdict(lambda: dict.fromkeys(TOTAL_FIELDS, 0))
+        # Teams without a played match yet still belong to the table
+        for home, away in Fixture.objects.filter(country=country, season=season).values_list('home_team_ref_id', 'away_team_ref_id'):
+            for team_id in (home, away):
+                if team_id is not None:
+                    totals[team_id]
+    for home, away, home_goals, away_goals in fixtures.values_list('home_team_ref_id', 'away_team_ref_id', 'home_goals', 'away_goals'):
+        for team_id, scored, conceded in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+            if team_id not in totals and team_ids is not None:
+                continue
+            row = totals[team_id]
+            row['played'] += 1
+            row['goals_for'] += scored
+            row['goals_against'] += conceded
+            row['won' if scored > conceded else 'drawn' if scored == conceded else 'lost'] += 1
+    return dict(totals)
+
+
+def _head_to_head(country, season, groups):
+    """
+    {team_id: {'h2h_points': n, 'h2h_goal_difference': n, ...}} over the matches inside each group of tied teams.
+    """
+    group_of = {team_id: index for index, group in enumerate(groups) for team_id in group}
+    stats = {team_id: defaultdict(int) for team_id in group_of}
+    fixtures = _played(country, season).filter(home_team_ref_id__in=list(group_of), away_team_ref_id__in=list(group_of))
+    for home, away, home_goals, away_goals in fixtures.values_list('home_team_ref_id', 'away_team_ref_id', 'home_goals', 'away_goals'):
+        if group_of[home] != group_of[away]:
+            continue
+        for team_id, scored, conceded, away_side in ((home, home_goals, away_goals, False), (away, away_goals, home_goals, True)):
+            row = stats[team_id]
+            row['h2h_points'] += 3 if scored > conceded else 1 if scored == conceded else 0
+            row['h2h_goal_difference'] += scored - conceded
+            row['h2h_goals_for'] += scored
+            if away_side:
+                row['h2h_away_goals'] += scored
+    return stats
+
+
+def rank_rows(country, season, rows):
+    """
+    Sorts Standing rows by points and the league's tie-breakers and sets their rank.
+    Head-to-head is only read when teams are level on points.
+    """
+    criteria = TIEBREAKERS.get(country, DEFAULT_TIEBREAKERS)
+    h2h = {}
+    if any(c.startswith('h2h_') for c in criteria):
+        level = defaultdict(list)
+        for row in rows:
+            if row.team_ref_id is not None:
+                level[row.points].append(row.team_ref_id)
+        groups = [group for group in level.values() if len(group) > 1]
+        if groups and season:
+            h2h = _head_to_head(country, season, groups)
+
+    def value(row, criterion):
+        if criterion == 'goal_difference':
+            return row.goals_for - row.goals_against
+        if criterion == 'goals_for':
+            return row.goals_for
+        return h2h.get(row.team_ref_id, {}).get(criterion, 0)
+
+    rows.sort(key=lambda row: (-row.points, *[-value(row, c) for c in criteria], row.team))
+    for position, row in enumerate(rows, start=1):
+        row.rank = position
+    return rows
+
+
+def update_standings(country, team_ids=None, season=None):
+    """
+    Recomputes the standings of `team_ids` (None: every team) from fixtures, re-ranks the
+    table and writes the rows that changed. Returns the number of rows written.
+    """
+    season = season or current_fixture_season(country)
+    if not season:
+        return 0
+    if team_ids is not None:
+        team_ids = {team_id for team_id in team_ids if team_id is not None}
+        if not team_ids:
+            return 0
+
+    with transaction.atomic():
+        totals = team_totals(country, season, team_ids)
+        rows = list(Standing.objects.filter(country=country))
+        by_team = {row.team_ref_id: row for row in rows if row.team_ref_id is not None}
+        before = {row.pk: (row.rank, *(getattr(row, f) for f in TOTAL_FIELDS), row.points, row.adjustment_season)
+                  for row in rows}
+
+        missing = [team_id for team_id in totals if team_id not in by_team]
+        names = dict(Team.objects.filter(id__in=missing).values_list('id', 'name'))
+        created = []
+        for team_id in missing:
+            if team_id in names:
+                row = Standing(country=country, team=names[team_id], team_ref_id=team_id)
+                rows.append(row)
+                by_team[team_id] = row
+                created.append(row)
+
+        for row in rows:
+            # Deductions and pins belong to the season they were reconciled in
+            # (a table reconciled before any fixture had a season adopts this one)
+            if row.adjustment_season and row.adjustment_season != season:
+                row.points_adjustment, row.pinned = 0, False
+            row.adjustment_season = season
+
+        for team_id, values in totals.items():
+            row = by_team.get(team_id)
+            if row is None or row.pinned:
+                continue
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.average = row.goals_for - row.goals_against
+            row.points = 3 * row.won + row.drawn + row.points_adjustment
+
+        rank_rows(country, season, rows)
+
+        now = timezone.now()
+        changed = []
+        for row in rows:
+            if row.pk is not None and before[row.pk] != (row.rank, *(getattr(row, f) for f in TOTAL_FIELDS), row.points, row.adjustment_season):
+                row.updated_at = now
+                changed.append(row)
+        if created:
+            Standing.objects.bulk_create(created)
+        if changed:
+            Standing.objects.bulk_update(changed, ['rank', *TOTAL_FIELDS, 'average', 'points', 'points_adjustment',
+                                                   'adjustment_season', 'pinned', 'updated_at'], batch_size=500)
+        if created or changed:
+            from .archive import archive_standings
+
+            invalidate_dataset_stats()
+            archive_standings(country, teams={row.team for row in created + changed})
+    return len(created) + len(changed)
+
+
+def fixture_team_ids(country, team_names):
+    """
+    team_ref ids of fixture team names (as written in fixtures).
+    """
+    names = list(team_names)
+    if not names:
+        return set()
+    ids = set()
+    pairs = Fixture.objects.filter(country=country).filter(Q(home_team__in=names) | Q(away_team__in=names)) \
+        .values_list('home_team', 'home_team_ref_id', 'away_team', 'away_team_ref_id').distinct()
+    for home, home_id, away, away_id in pairs:
+        if home in names and home_id:
+            ids.add(home_id)
+        if away in names and away_id:
+            ids.add(away_id)
+    return ids
+
+
+def reconcile_standings(country):
+    """
+    Compares the (just scraped) table with the fixture totals. The scraped rows stay;
+    their point deductions are kept as points_adjustment. Teams whose fixtures disagree
+    (and are not simply behind the scraped row) are pinned: update_standings leaves their
+    scraped values alone until the next reconcile. Returns the team names that differ.
+    """
+    season = current_fixture_season(country)
+    derived = team_totals(country, season) if season else {}
+    now = timezone.now()
+    rows = list(Standing.objects.filter(country=country))
+    mismatched = []
+    for row in rows:
+        row.points_adjustment = row.points - (3 * row.won + row.drawn)
+        row.adjustment_season = season or ""
+        row.reconciled_at = now
+        totals = derived.get(row.team_ref_id)
+        row.pinned = False
+        if totals is not None and any(getattr(row, f) != totals[f] for f in TOTAL_FIELDS):
+            mismatched.append(row.team)
+            # A scraped row with fewer games is just older than the fixtures: those win
+            row.pinned = row.played >= totals['played']
+    Standing.objects.bulk_update(rows, ['points_adjustment', 'adjustment_season', 'pinned', 'reconciled_at'], batch_size=500)
+    if mismatched:
+        pinned = [row.team for row in rows if row.pinned]
+        logger.warning(f"Standings reconcile ({country}): fixtures disagree for {', '.join(mismatched)}"
+                       + (f"; scraped rows kept until the next reconcile: {', '.join(pinned)}" if pinned else ""))
+    return mismatched
+
+
+def reconcile_due(country):
+    """
+    True when the scraped table should be fetched: never reconciled, older than
+    STANDINGS_RECONCILE_HOURS, or no fixture results to derive from.
+    """
+    last = Standing.objects.filter(country=country).aggregate(last=Max('reconciled_at'))['last']
+    if last is None or last < timezone.now() - timedelta(hours=settings.STANDINGS_RECONCILE_HOURS):
+        return True
+    season = current_fixture_season(country)
+    return not season or not _played(country, season).exists()
@@ -0,0 +1,65 @@
+"""
+Dataset statistics for the dashboards.
+
+Row counts and last-updated times of every table and country come from one
+grouped aggregate (a UNION ALL of per-table GROUP BY country) and are cached.
+Writers call invalidate_dataset_stats() when a sync, import or publish commits,
+so dashboards cost no queries between writes. The timeout bounds staleness for
+writes made by another process (e.g. the admin) on a per-process cache.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Value, CharField
+
+from .models import Player, Standing, Fixture, BilyonerBulletin, CountryChoices
+
+STATS_CACHE_KEY = 'data_manager:dataset_stats'
+STATS_CACHE_TIMEOUT = 300
+
+# stats key -> model (the bulletin counts rows of the current version only)
+STATS_TABLES = {
+    'players': Player,
+    'standings': Standing,
+    'fixtures': Fixture,
+    'bulletin': BilyonerBulletin,
+}
+
+
+def _empty():
+    stats = {name: 0 for name in STATS_TABLES}
+    stats.update({'standing': False, 'last_updated': None})
+    return stats
+
+
+def compute_dataset_stats():
+    """
+    {'turkey': {'players': n, 'standings': n, 'fixtures': n, 'bulletin': n,
+                'standing': bool, 'last_updated': datetime|None}, ...} from a single query.
+    """
+    parts = [
+        model.objects.order_by()
+        .values('country')
+        .annotate(table=Value(name, output_field=CharField()), rows=Count('id'), last=Max('updated_at'))
+        .values_list('table', 'country', 'rows', 'last')
+        for name, model in STATS_TABLES.items()
+    ]
+    stats = {country.lower(): _empty() for country in CountryChoices.values}
+    for table, country, rows, last in parts[0].union(*parts[1:], all=True):
+        entry = stats.setdefault(str(country).lower(), _empty())
+        entry[table] = rows
+        if last and (entry['last_updated'] is None or last > entry['last_updated']):
+            entry['last_updated'] = last
+    for entry in stats.values():
+        entry['standing'] = entry['standings'] > 0
+    return stats
+
+
+def dataset_stats():
+    return cache.get_or_set(STATS_CACHE_KEY, compute_dataset_stats, STATS_CACHE_TIMEOUT)
+
+
+def invalidate_dataset_stats():
+    """
+    Drops the cached stats once the current transaction commits (immediately outside one).
+    """
+    transaction.on_commit(lambda: cache.delete(STATS_CACHE_KEY))
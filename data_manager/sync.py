@@ -0,0 +1,83 @@
+"""
+Upsert-based league sync.
+
+Every scrape used to delete a country's rows and insert them again, so primary
+keys, team_ref links and created_at changed on each run and every row was
+rewritten. Rows are now matched on their natural key; only new or changed rows
+are written (one INSERT ... ON CONFLICT DO UPDATE per batch) and only rows that
+vanished from the source are deleted.
+"""
+from .models import Standing, Fixture
+from .stats import invalidate_dataset_stats
+
+# model -> (natural key without country, compared/updated value fields)
+NATURAL_KEYS = {
+    Standing: (
+        ('team',),
+        ('rank', 'played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'average', 'points'),
+    ),
+    Fixture: (
+        ('season', 'home_team', 'away_team'),
+        ('week', 'date', 'time', 'score', 'match_url', 'home_goals', 'away_goals', 'played', 'match_date'),
+    ),
+}
+
+
+def _values(model, obj, fields):
+    # Cleaned through the field so '3' from a sqlite import compares equal to 3 from the DB
+    return tuple(model._meta.get_field(f).to_python(getattr(obj, f)) for f in fields)
+
+
+def sync_rows(model, country, objects, changed_keys=None, batch_size=500):
+    """
+    Makes the country's rows of `model` equal to `objects` (unsaved instances, any iterable).
+    Existing rows keep their id, team_ref and created_at. Changed rows are written every
+    `batch_size` rows, so only the stored keys/values are held in memory, not the incoming
+    instances. With a `changed_keys` list, the natural keys of created, updated and deleted
+    rows are appended to it. Returns (created, updated, deleted, unchanged).
+    """
+    key_fields, value_fields = NATURAL_KEYS[model]
+
+    existing = {}
+    for row in model.objects.filter(country=country).values('id', *key_fields, *value_fields).iterator(chunk_size=2000):
+        existing[tuple(row[f] for f in key_fields)] = (row['id'], tuple(row[f] for f in value_fields))
+
+    seen = {}           # key -> values of the last incoming row with that key
+    written = set()
+    pending = {}        # one INSERT ... ON CONFLICT must not touch a key twice
+
+    def flush():
+        model.objects.bulk_create(
+            list(pending.values()), update_conflicts=True,
+            unique_fields=['country', *key_fields], update_fields=[*value_fields, 'updated_at'],
+        )
+        written.update(pending)
+        pending.clear()
+
+    for obj in objects:
+        obj.country = country
+        key = _values(model, obj, key_fields)
+        values = _values(model, obj, value_fields)
+        if key in seen:
+            current = seen[key]  # last row wins on duplicate keys
+        else:
+            current = existing[key][1] if key in existing else None
+        seen[key] = values
+        if current != values:
+            pending[key] = obj
+            if len(pending) >= batch_size:
+                flush()
+    if pending:
+        flush()
+
+    vanished = [pk for key, (pk, _) in existing.items() if key not in seen]
+    if changed_keys is not None:
+        changed_keys.extend(written)
+        changed_keys.extend(key for key in existing if key not in seen)
+
+    if vanished:
+        model.objects.filter(id__in=vanished).delete()
+    if written or vanished:
+        invalidate_dataset_stats()
+    created = sum(1 for key in written if key not in existing)
+    return created, len(written) - created, len(vanished), len(seen) - len(written)
@@ -0,0 +1,177 @@
+"""
+Canonical team resolution.
+
+Every source spells teams differently: Mackolik standings/squads, Transfermarkt
+fixtures ('Man. City') and Bilyoner bulletin rows ('İtalya Serie A Paz 1 Bologna').
+Standings names become the canonical Team rows; every other spelling is resolved
+once, stored as a TeamAlias, and written to the rows' team_ref foreign keys right
+after they are saved. Readers (analysis, coupon settlement) then filter by FK.
+Non-exact matches are stored as GUESS aliases and only linked once approved in the admin.
+"""
+import re
+import unicodedata
+from difflib import get_close_matches
+from django.db import transaction
+from .models import (
+    Team, TeamAlias, Standing, Fixture, Player, BilyonerBulletin,
+    SeasonStanding, SeasonFixture, SeasonPlayerStat,
+)
+
+
+def normalize_team_name(name):
+    """
+    'Beşiktaş A.Ş.' -> 'besiktas a s'. Folds Turkish i/ı and accents so spellings compare equal.
+    """
+    name = (name or '').replace('İ', 'i').replace('I', 'i').replace('ı', 'i').lower()
+    name = unicodedata.normalize('NFKD', name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(re.sub(r'[^\w\s]', ' ', name).split())
+
+
+def _contains_words(a, b):
+    # Whole-word containment of normalized names: 'galatasaray' in 'galatasaray a s', 'spor' not in 'antalyaspor'
+    a, b = f" {a} ", f" {b} "
+    return a in b or b in a
+
+
+def same_team(a, b):
+    """
+    Loose comparison between differently written names, e.g. 'Manchester City' vs 'Man. City'.
+    """
+    ta, tb = normalize_team_name(a).split(), normalize_team_name(b).split()
+    if not ta or not tb:
+        return False
+    if _contains_words(" ".join(ta), " ".join(tb)):
+        return True
+    short, long_ = (ta, tb) if len(ta) <= len(tb) else (tb, ta)
+    return len(short) == len(long_) and all(l.startswith(s) for s, l in zip(short, long_))
+
+
+class TeamResolver:
+    """
+    Resolves raw names of one country to Team ids. Aliases and canonical names are
+    loaded once, so a whole write batch costs a couple of queries plus one insert per new alias.
+    Unapproved GUESS aliases resolve to None.
+    """
+    def __init__(self, country):
+        self.country = country
+        self.aliases = {
+            alias: None if source == TeamAlias.Source.GUESS else team_id
+            for alias, team_id, source in TeamAlias.objects.filter(country=country).values_list('alias', 'team_id', 'source')
+        }
+        self.teams = {
+            normalize_team_name(name): team_id
+            for team_id, name in Team.objects.filter(country=country).values_list('id', 'name')
+        }
+
+    def _match(self, key):
+        """
+        (team_id, exact): exact only for an equal normalized name; word and fuzzy hits are guesses.
+        """
+        if key in self.teams:
+            return self.teams[key], True
+
+        # Longest canonical name inside the raw name as whole words (or the other way round)
+        best_id, best_len = None, 0
+        for name, team_id in self.teams.items():
+            if _contains_words(name, key) and len(name) > best_len:
+                best_id, best_len = team_id, len(name)
+        if best_id:
+            return best_id, False
+
+        for name, team_id in self.teams.items():
+            if same_team(name, key):
+                return team_id, False
+
+        close = get_close_matches(key, list(self.teams), n=1, cutoff=0.85)
+        return (self.teams[close[0]], False) if close else (None, False)
+
+    def resolve(self, raw_name, source, create=False):
+        """
+        Returns the Team id for `raw_name` or None. With create=True (standings) an
+        unknown name becomes a new canonical Team. Guessed matches are stored with
+        source GUESS and return None: rows are linked only after the guess is approved
+        (or corrected) in the admin.
+        """
+        key = normalize_team_name(raw_name)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.aliases[key]
+
+        team_id, exact = self._match(key)
+        if team_id is None and create:
+            team_id = Team.objects.create(country=self.country, name=raw_name.strip()[:100]).id
+            self.teams[key] = team_id
+            exact = True
+        if team_id is not None:
+            TeamAlias.objects.get_or_create(
+                country=self.country, alias=key[:255],
+                defaults={'team_id': team_id, 'source': source if exact else TeamAlias.Source.GUESS}
+            )
+            if not exact:
+                team_id = None
+            self.aliases[key] = team_id
+        return team_id
+
+
+# (model, name field, FK field, alias source). Standings first: they create the canonical teams.
+TEAM_REF_FIELDS = [
+    (Standing, 'team', 'team_ref', TeamAlias.Source.STANDINGS),
+    (Fixture, 'home_team', 'home_team_ref', TeamAlias.Source.FIXTURES),
+    (Fixture, 'away_team', 'away_team_ref', TeamAlias.Source.FIXTURES),
+    (Player, 'team_name', 'team_ref', TeamAlias.Source.SQUADS),
+    (BilyonerBulletin, 'home_team', 'home_team_ref', TeamAlias.Source.BULLETIN),
+    (BilyonerBulletin, 'away_team', 'away_team_ref', TeamAlias.Source.BULLETIN),
+]
+
+# Season archive; only linked when asked for by model (rows copied from live tables already carry their refs)
+ARCHIVE_REF_FIELDS = [
+    (SeasonStanding, 'team', 'team_ref', TeamAlias.Source.STANDINGS),
+    (SeasonFixture, 'home_team', 'home_team_ref', TeamAlias.Source.FIXTURES),
+    (SeasonFixture, 'away_team', 'away_team_ref', TeamAlias.Source.FIXTURES),
+    (SeasonPlayerStat, 'team_name', 'team_ref', TeamAlias.Source.SQUADS),
+]
+
+
+def link_team_refs(country=None, models=None):
+    """
+    Fills the team FKs of rows that do not have one yet; call it right after a write.
+    One UPDATE per distinct unresolved name. `country=None` handles every country.
+    Returns the number of rows linked.
+    """
+    fields = TEAM_REF_FIELDS if not models else [f for f in TEAM_REF_FIELDS + ARCHIVE_REF_FIELDS if f[0] in models]
+    if country is None:
+        countries = set(Team.objects.values_list('country', flat=True)) | {
+            c for model, *_ in fields
+            for c in model.objects.order_by().values_list('country', flat=True).distinct()
+        }
+        return sum(link_team_refs(c, models) for c in countries)
+
+    resolver = TeamResolver(country)
+    linked = 0
+    with transaction.atomic():
+        for model, name_field, ref_field, source in fields:
+            unresolved = {ref_field + '__isnull': True, 'country': country}
+            names = list(model.objects.filter(**unresolved).order_by().values_list(name_field, flat=True).distinct())
+            for name in names:
+                team_id = resolver.resolve(name, source, create=model in (Standing, SeasonStanding))
+                if team_id:
+                    linked += model.objects.filter(**unresolved, **{name_field: name}).update(**{ref_field: team_id})
+    return linked
+
+
+def repoint_alias(alias):
+    """
+    After an alias was approved or corrected in the admin: every row whose name
+    normalizes to it is linked to the alias' team. Returns the number of rows updated.
+    """
+    updated = 0
+    with transaction.atomic():
+        for model, name_field, ref_field, _ in TEAM_REF_FIELDS + ARCHIVE_REF_FIELDS:
+            rows = model.objects.filter(country=alias.country)
+            names = [name for name in rows.order_by().values_list(name_field, flat=True).distinct()
+                     if normalize_team_name(name) == alias.alias]
+            if names:
+                updated += rows.filter(**{name_field + '__in': names}).update(**{ref_field: alias.team_id})
+    return updated
@@ -1,3 +1,141 @@
-from django.test import TestCase
+import os
+import sqlite3
+import tempfile
+from datetime import date
+from unittest import mock
+from django.test import TestCase, TransactionTestCase
 
-# Create your tests here.
+from automation.models import TaskLog
+from league_system.db import writer
+from . import importer
+from .models import Team, TeamAlias, Standing, Fixture, Player, SeasonStanding, SeasonFixture
+from .teams import TeamResolver, link_team_refs, repoint_alias
+
+
+class TeamResolverTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.galatasaray = Team.objects.create(country='TURKEY', name='Galatasaray')
+        cls.antalyaspor = Team.objects.create(country='TURKEY', name='Antalyaspor')
+
+    def test_exact_name_is_linked(self):
+        resolver = TeamResolver('TURKEY')
+        self.assertEqual(resolver.resolve('GALATASARAY', TeamAlias.Source.FIXTURES), self.galatasaray.id)
+        self.assertEqual(TeamAlias.objects.get(alias='galatasaray').source, TeamAlias.Source.FIXTURES)
+
+    def test_substring_needs_whole_words(self):
+        resolver = TeamResolver('TURKEY')
+        # 'spor' is inside 'antalyaspor' but not a word of it
+        self.assertIsNone(resolver.resolve('Spor', TeamAlias.Source.BULLETIN))
+        self.assertFalse(TeamAlias.objects.filter(alias='spor').exists())
+
+    def test_guess_is_not_linked_until_approved(self):
+        fixture = Fixture.objects.create(country='TURKEY', home_team='Galatasaray A.Ş.', away_team='Antalyaspor')
+        link_team_refs('TURKEY', models=[Fixture])
+        fixture.refresh_from_db()
+        alias = TeamAlias.objects.get(alias='galatasaray a s')
+        self.assertEqual((alias.team_id, alias.source), (self.galatasaray.id, TeamAlias.Source.GUESS))
+        self.assertIsNone(fixture.home_team_ref_id)
+        self.assertEqual(fixture.away_team_ref_id, self.antalyaspor.id)
+
+        # Still a guess on the next run
+        link_team_refs('TURKEY', models=[Fixture])
+        fixture.refresh_from_db()
+        self.assertIsNone(fixture.home_team_ref_id)
+
+        alias.source = TeamAlias.Source.MANUAL
+        alias.save()
+        self.assertEqual(repoint_alias(alias), 1)
+        fixture.refresh_from_db()
+        self.assertEqual(fixture.home_team_ref_id, self.galatasaray.id)
+
+    def test_standings_create_canonical_teams(self):
+        Standing.objects.create(country='TURKEY', team='Göztepe', rank=1)
+        self.assertEqual(link_team_refs('TURKEY', models=[Standing]), 1)
+        self.assertTrue(Team.objects.filter(country='TURKEY', name='Göztepe').exists())
+
+
+class SeasonArchiveQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Team.objects.create(country='TURKEY', name='Galatasaray')
+        cls.b = Team.objects.create(country='TURKEY', name='Fenerbahçe')
+        cls.c = Team.objects.create(country='TURKEY', name='Beşiktaş')
+        # Two archived seasons; 2024/2025 has two matchweeks, the leader changes in the last one
+        for season, week, order in [('2023/2024', 34, (cls.a, cls.b, cls.c)),
+                                    ('2024/2025', 1, (cls.a, cls.b, cls.c)),
+                                    ('2024/2025', 2, (cls.b, cls.a, cls.c))]:
+            for rank, team in enumerate(order, start=1):
+                SeasonStanding.objects.create(country='TURKEY', season=season, matchweek=week, team=team.name,
+                                              team_ref=team, rank=rank)
+        SeasonStanding.objects.create(country='ENGLAND', season='2024/2025', matchweek=38, team='Arsenal', rank=1)
+
+        def fixture(season, home, away, day, played=True):
+            return SeasonFixture.objects.create(
+                country='TURKEY', season=season, home_team=home.name, away_team=away.name,
+                home_team_ref=home, away_team_ref=away, played=played,
+                match_date=date(int(season[:4]), 9, day) if day else None,
+            )
+        cls.old = fixture('2023/2024', cls.a, cls.b, 1)
+        cls.undated = fixture('2023/2024', cls.b, cls.a, None)
+        cls.new = fixture('2024/2025', cls.b, cls.a, 2)
+        cls.unplayed = fixture('2024/2025', cls.a, cls.b, 20, played=False)
+        cls.other = fixture('2024/2025', cls.a, cls.c, 9)
+
+    def test_table_defaults_to_the_last_matchweek(self):
+        self.assertEqual([s.team for s in SeasonStanding.objects.table('TURKEY', '2024/2025')],
+                         ['Fenerbahçe', 'Galatasaray', 'Beşiktaş'])
+        self.assertEqual(SeasonStanding.objects.table('TURKEY', '2024/2025', matchweek=1).first().team, 'Galatasaray')
+
+    def test_final_tables_and_team_history(self):
+        final = SeasonStanding.objects.final_tables()
+        self.assertEqual(sorted(set(final.values_list('country', 'season', 'matchweek'))),
+                         [('ENGLAND', '2024/2025', 38), ('TURKEY', '2023/2024', 34), ('TURKEY', '2024/2025', 2)])
+        self.assertEqual(list(SeasonStanding.objects.team_history(self.a.id).values_list('season', 'rank')),
+                         [('2023/2024', 1), ('2024/2025', 2)])
+
+    def test_head_to_head_newest_first_both_venues(self):
+        meetings = list(SeasonFixture.objects.head_to_head(self.b.id, self.a.id))
+        self.assertEqual(meetings, [self.new, self.old, self.undated])
+        self.assertEqual(list(SeasonFixture.objects.head_to_head(self.a.id, self.b.id, limit=1)), [self.new])
+
+    def test_for_team_and_season_results(self):
+        self.assertEqual(set(SeasonFixture.objects.for_team(self.c.id)), {self.other})
+        self.assertEqual(set(SeasonFixture.objects.for_team(self.a.id, seasons=['2023/2024'])), {self.old, self.undated})
+        self.assertEqual(list(SeasonFixture.objects.season_results('TURKEY', '2024/2025')), [self.new, self.other])
+
+
+class ImportProgressTests(TransactionTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE turkey_squads (team TEXT, player TEXT, goals INTEGER)')
+        conn.executemany('INSERT INTO turkey_squads VALUES (?, ?, ?)',
+                         [('Galatasaray', f'Oyuncu {i}', i % 7) for i in range(5000)])
+        conn.commit()
+        conn.close()
+
+    def test_batch_progress_is_written_to_the_task_log(self):
+        log = TaskLog.objects.create(task_name=importer.IMPORT_TASK_NAME, status='RUNNING')
+        outputs = []
+        submit = writer.submit
+
+        def record(fn, *args, **kwargs):
+            outputs.append(log.output)
+            return submit(fn, *args, **kwargs)
+
+        with mock.patch.object(importer, 'scraper_db_path', return_value=self.path), \
+                mock.patch.object(importer, 'PROGRESS_INTERVAL', 0), \
+                mock.patch.object(writer, 'submit', side_effect=record):
+            success, message = importer.run_import(['turkey_squads'], log)
+            writer.flush()
+
+        self.assertTrue(success, message)
+        self.assertEqual(Player.objects.count(), 5000)
+        self.assertIn("[1/1] turkey_squads: 2000/5000 satır okundu...", outputs)
+        log.refresh_from_db()
+        self.assertEqual(log.status, 'SUCCESS')
+        self.assertIn("[1/1] turkey_squads: 5000 kayıt", log.output)
+        self.assertNotIn("satır okundu", log.output)
@@ -15,6 +15,7 @@ urlpatterns = [
     
     # Generic Listings with type arg
     path('list/<str:data_type>/', views.listings, name='listings'),
+    path('export/<str:data_type>/', views.export_data, name='export_data'),
     
     # Auth
     path('register/', views.register, name='register'),
@@ -1,10 +1,19 @@
 from django.shortcuts import render, redirect
+from django.http import StreamingHttpResponse, Http404, HttpResponseBadRequest
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib import messages
-from .models import Player, Standing, Fixture, CountryChoices, BilyonerBulletin
+from django.db.models import Q
+from .models import Player, Standing, Fixture, BilyonerBulletin
 from .forms import CountryFilterForm
+from .bulletin import publish_staging
+from .importer import start_import_job, table_row_estimate, IMPORT_TASK_NAME
+from .stats import dataset_stats
+from .pagination import keyset_page
+from .exports import EXPORTS, EXPORT_FORMATS, export_lines, export_filename
+from league_system.routers import use_replica
+from league_system.db import start_db_thread
 import sqlite3
 import os
 
@@ -29,31 +38,19 @@ def index(request):
 # --- DASHBOARD & BROWSING ---
 @login_required
 def dashboard(request):
-    stats = {
-        'turkey': {
-            'players': Player.objects.filter(country=CountryChoices.TURKEY).count(),
-            'standing': Standing.objects.filter(country=CountryChoices.TURKEY).exists(),
-            'fixtures': Fixture.objects.filter(country=CountryChoices.TURKEY).count()
-        },
-        'england': {
-            'players': Player.objects.filter(country=CountryChoices.ENGLAND).count(),
-            'standing': Standing.objects.filter(country=CountryChoices.ENGLAND).exists(),
-            'fixtures': Fixture.objects.filter(country=CountryChoices.ENGLAND).count()
-        },
-        'spain': {
-            'players': Player.objects.filter(country=CountryChoices.SPAIN).count(),
-            'standing': Standing.objects.filter(country=CountryChoices.SPAIN).exists(),
-            'fixtures': Fixture.objects.filter(country=CountryChoices.SPAIN).count()
-        },
-        'italy': {
-            'players': Player.objects.filter(country=CountryChoices.ITALY).count(),
-            'standing': Standing.objects.filter(country=CountryChoices.ITALY).exists(),
-            'fixtures': Fixture.objects.filter(country=CountryChoices.ITALY).count()
-        }
-    }
+    # Cached, one grouped query when stale (see data_manager.stats)
+    stats = dataset_stats()
     return render(request, 'dashboard.html', {'stats': stats})
 
+# data_type -> keyset ordering (ends with id; matches an index of the model)
+LISTING_ORDERING = {
+    'standings': ('country', 'rank', 'id'),
+    'fixtures': ('country', '-id'),
+    'players': ('country', 'team_name', 'jersey_number', 'id'),
+}
+
 @login_required
+@use_replica()
 def listings(request, data_type):
     """
     Generic view for Standings, Fixtures, and Players.
@@ -83,24 +80,54 @@ def listings(request, data_type):
     else:
         queryset = model_class.objects.all()
 
-    # Optimization
-    if data_type == 'standings':
-        queryset = queryset.order_by('country', 'rank')
-    elif data_type == 'fixtures':
-        queryset = queryset.order_by('country', '-id') # or week
-    elif data_type == 'players':
-        queryset = queryset.order_by('country', 'team_name', 'jersey_number')[:200] # Limit for performance
+    # Filters run in SQL: ?team=...&week=...&position=...
+    filters = {key: request.GET.get(key, '').strip() for key in ('team', 'week', 'position')}
+    if filters['team']:
+        if data_type == 'fixtures':
+            queryset = queryset.filter(Q(home_team__icontains=filters['team']) | Q(away_team__icontains=filters['team']))
+        else:
+            queryset = queryset.filter(**{('team' if data_type == 'standings' else 'team_name') + '__icontains': filters['team']})
+    if filters['week'] and data_type == 'fixtures':
+        # "3" matches the scraped "3. Hafta" labels
+        week = filters['week']
+        queryset = queryset.filter(Q(week__iexact=week) | Q(week__startswith=f"{week}.") if week.isdigit() else Q(week__iexact=week))
+    if filters['position'] and data_type == 'players':
+        queryset = queryset.filter(position__icontains=filters['position'])
+
+    # Keyset pagination on the indexed ordering (see Meta.indexes)
+    page = keyset_page(queryset, LISTING_ORDERING[data_type], request)
 
     context = {
         'form': form,
         'data_type': data_type,
-        'items': queryset,
+        'items': page,
+        'page': page,
+        'filters': filters,
         'selected_country': selected_country,
         'show_update_button': request.user.is_superuser  # Pass simple boolean
     }
     return render(request, template_name, context)
 
 @login_required
+def export_data(request, data_type):
+    """
+    Streams a whole dataset as CSV or JSONL: /export/<data_type>/?format=jsonl&country=TURKEY&season=...
+    """
+    fmt = request.GET.get('format', 'csv')
+    if data_type not in EXPORTS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+    try:
+        # Filters are checked here, before the streaming response has sent its status line
+        lines = export_lines(data_type, fmt, request.GET.dict())
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    content_type = 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(data_type, fmt)}"'
+    return response
+
+@login_required
+@use_replica()
 def bulletin(request):
     """
     View to display Bilyoner betting bulletin.
@@ -112,9 +139,21 @@ def bulletin(request):
     
     if selected_country and selected_country != 'ALL':
         queryset = queryset.filter(country=selected_country)
+
+    # Optional SQL filters: ?hours=6&min_odds=1.5&max_odds=2.5 (MS 1 odds)
+    hours = request.GET.get('hours', '')
+    if hours.isdigit():
+        queryset = queryset.upcoming(int(hours))
+    try:
+        min_odds = float(request.GET['min_odds']) if request.GET.get('min_odds') else None
+        max_odds = float(request.GET['max_odds']) if request.GET.get('max_odds') else None
+    except ValueError:
+        min_odds = max_odds = None
+    if min_odds is not None or max_odds is not None:
+        queryset = queryset.odds_between('odds_1', min_odds, max_odds)
         
-    # Order by country then time
-    queryset = queryset.order_by('country', 'match_time')
+    # Order by country then kickoff
+    queryset = queryset.order_by('country', 'kickoff_at', 'match_time')
     
     context = {
         'form': form,
@@ -156,9 +195,8 @@ def import_hub(request):
                 elif "squads" in lower_t or "kadro" in lower_t: cat = "Kadro"
                 elif "bulletin" in lower_t: cat = "Bülten"
                 
-                # Get Row Count
-                cursor.execute(f"SELECT COUNT(*) FROM {t}")
-                count = cursor.fetchone()[0]
+                # Row count estimate (MAX(rowid) instead of a full COUNT(*) scan)
+                count = table_row_estimate(cursor, t)
                 
                 available_tables.append({
                     'name': t,
@@ -170,7 +208,13 @@ def import_hub(request):
         except Exception as e:
             messages.error(request, f"DB Error: {e}")
 
-    return render(request, 'import_hub.html', {'tables': available_tables})
+    from automation.models import TaskLog
+    import_jobs = TaskLog.objects.filter(task_name=IMPORT_TASK_NAME)[:5]
+    return render(request, 'import_hub.html', {
+        'tables': available_tables,
+        'import_jobs': import_jobs,
+        'import_running': any(job.status == 'RUNNING' for job in import_jobs),
+    })
 
 @login_required
 def sync_data(request):
@@ -182,137 +226,10 @@ def sync_data(request):
         messages.warning(request, "Tablo seçilmedi.")
         return redirect('import_hub')
 
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    project_root = os.path.dirname(base_dir)
-    scraper_db_path = os.path.join(project_root, "scraper_data.db")
-    
-    try:
-        conn = sqlite3.connect(scraper_db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        imported_count = 0
-        
-        def get_val(row, keys, default=None):
-            # Helper to find first matching key in row (case-insensitive)
-            # row.keys() handles sqlite3.Row if iterated properly
-            available_keys = row.keys()
-            for k in keys:
-                for ak in available_keys:
-                    if k.lower() == ak.lower():
-                        return row[ak]
-            return default
-
-        for table_name in selected_tables:
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-            
-            # Auto-detect Country and Type
-            t_lower = table_name.lower()
-            
-            target_country = CountryChoices.TURKEY
-            if "england" in t_lower: target_country = CountryChoices.ENGLAND
-            elif "spain" in t_lower: target_country = CountryChoices.SPAIN
-            elif "italy" in t_lower: target_country = CountryChoices.ITALY
-            
-            # 1. STANDINGS
-            if "standings" in t_lower or "_lig" in t_lower:
-                Standing.objects.filter(country=target_country).delete()
-                
-                for row in rows:
-                    Standing.objects.create(
-                        country=target_country,
-                        rank=get_val(row, ['rank', '#'], 0),
-                        team=get_val(row, ['team', 'takım', 'Takım', 'Team'], 'Unknown'),
-                        played=get_val(row, ['played', 'O', 'Oynadığı'], 0),
-                        won=get_val(row, ['won', 'G', 'Galibiyet'], 0),
-                        drawn=get_val(row, ['drawn', 'B', 'Beraberlik'], 0),
-                        lost=get_val(row, ['lost', 'M', 'Mağlubiyet'], 0),
-                        goals_for=get_val(row, ['goals_for', 'A', 'Atılan'], 0),
-                        goals_against=get_val(row, ['goals_against', 'Y', 'Yenen'], 0),
-                        average=get_val(row, ['average', 'AV', 'Av', 'Averaj'], 0),
-                        points=get_val(row, ['points', 'P', 'Puan'], 0)
-                    )
-                    imported_count += 1
-                    
-            # 2. FIXTURES
-            elif "fixtures" in t_lower or "fikstur" in t_lower:
-                Fixture.objects.filter(country=target_country).delete()
-                for row in rows:
-                    Fixture.objects.create(
-                        country=target_country,
-                        week=get_val(row, ['week', 'Hafta'], ''),
-                        date=get_val(row, ['date', 'Tarih'], ''),
-                        time=get_val(row, ['time', 'Saat'], ''),
-                        home_team=get_val(row, ['home_team', 'Ev Sahibi', 'Ev'], ''),
-                        score=get_val(row, ['score', 'Skor'], ''),
-                        away_team=get_val(row, ['away_team', 'Misafir', 'Deplasman'], '')
-                    )
-                    imported_count += 1
-                    
-            # 3. SQUADS
-            elif "squads" in t_lower or "kadro" in t_lower:
-                Player.objects.filter(country=target_country).delete()
-                for row in rows:
-                    Player.objects.create(
-                        country=target_country,
-                        team_name=get_val(row, ['team_name', 'team', 'Takım'], 'Unknown'),
-                        jersey_number=get_val(row, ['jersey_number', 'No', 'Numara'], 0),
-                        player_name=get_val(row, ['player_name', 'player', 'Ad', 'Oyuncu'], 'Unknown'),
-                        profile_url=get_val(row, ['profile_url', 'url'], ''),
-                        position=get_val(row, ['position', 'POZ', 'Pozisyon'], ''),
-                        age=get_val(row, ['age', 'Yaş'], 0),
-                        matches_played=get_val(row, ['matches_played', 'Maç'], 0),
-                        starts=get_val(row, ['starts', 'ilk 11', '11'], 0),
-                        goals=get_val(row, ['goals', 'Gol'], 0), 
-                        assists=get_val(row, ['assists', 'Asist'], 0),
-                        yellow_cards=get_val(row, ['yellow_cards', 'Sarı'], 0),
-                        red_cards=get_val(row, ['red_cards', 'Kırmızı'], 0)
-                    )
-                    imported_count += 1
-            
-            # 4. BILYONER BULLETIN (New)
-            elif "bulletin" in t_lower:
-                # We use update_or_create to avoid duplicates, or delete all first?
-                # Let's clean up old bulletins to keep it fresh
-                BilyonerBulletin.objects.all().delete()
-                
-                for row in rows:
-                    # Map source country string to Choice
-                    c_str = get_val(row, ['country'], 'TURKEY')
-                    
-                    # Normalize country
-                    c_choice = CountryChoices.TURKEY
-                    if "england" in c_str.upper(): c_choice = CountryChoices.ENGLAND
-                    elif "spain" in c_str.upper(): c_choice = CountryChoices.SPAIN
-                    elif "italy" in c_str.upper(): c_choice = CountryChoices.ITALY
-                    elif "germany" in c_str.upper(): c_choice = "GERMANY" # If added to model choices
-                    
-                    BilyonerBulletin.objects.create(
-                        unique_key=get_val(row, ['unique_key'], f"unknown_{imported_count}"),
-                        country=c_choice,
-                        league=get_val(row, ['league'], ''),
-                        match_time=get_val(row, ['date', 'time', 'match_time'], '00:00'),
-                        home_team=get_val(row, ['home_team'], 'Unknown'),
-                        away_team=get_val(row, ['away_team'], 'Unknown'),
-                        ms_1=get_val(row, ['ms_1'], '-'),
-                        ms_x=get_val(row, ['ms_x'], '-'),
-                        ms_2=get_val(row, ['ms_2'], '-'),
-                        under_2_5=get_val(row, ['under_2_5'], '-'),
-                        over_2_5=get_val(row, ['over_2_5'], '-')
-                    )
-                    imported_count += 1
-
-            else:
-                 messages.warning(request, f"Skipped unknown table type: {table_name}")
-
-        conn.close()
-        messages.success(request, f"Başarıyla {imported_count} kayıt aktarıldı.")
-        
-    except Exception as e:
-        messages.error(request, f"Hata: {e}")
-        
-    return redirect('dashboard')
+    # Streaming bulk import in a background thread; progress is shown on the import hub
+    job = start_import_job(selected_tables)
+    messages.info(request, f"{len(selected_tables)} tablo arkaplanda aktarılıyor (İş #{job.id}). İlerleme aşağıda görünür.")
+    return redirect('import_hub')
 
 @login_required
 def scrape_hub(request):
@@ -328,13 +245,9 @@ def run_web_scraper(request):
     Essential for AWS/Production to avoid Nginx 504 Timeouts.
     """
     if request.method == "POST":
-        import threading
-        from django.db import connection
         from django.core.management import call_command
         
         def scrape_worker():
-            # Close any old DB connections for this thread
-            connection.close()
             try:
                 # We can't capture stdout easily to messages in a thread, 
                 # but we can log errors or rely on the command's own logging/stdout
@@ -343,13 +256,9 @@ def run_web_scraper(request):
                 print("BACKGROUND SCRAPER FINISHED.")
             except Exception as e:
                 print(f"BACKGROUND SCRAPER ERROR: {e}")
-            finally:
-                connection.close()
 
         # Start Thread
-        t = threading.Thread(target=scrape_worker)
-        t.setDaemon(True)
-        t.start()
+        start_db_thread(scrape_worker, daemon=True)
         
         messages.info(request, "Bilyoner Veri Çekme işlemi ARKAPLANDA başlatıldı. İşlem 1-2 dakika sürebilir. Lütfen 'İncele & Onayla' sayfasını ara sıra yenileyerek kontrol edin.")
         return redirect('scrape_review')
@@ -371,33 +280,7 @@ def publish_scraped_data(request):
     Moves data from Staging to Live.
     """
     if request.method == "POST":
-        from .models import BilyonerBulletinStaging
-        
-        # 1. Clear Live
-        BilyonerBulletin.objects.all().delete()
-        
-        # 2. Move Staging to Live
-        staging_items = BilyonerBulletinStaging.objects.all()
-        count = 0
-        for s in staging_items:
-            BilyonerBulletin.objects.create(
-                unique_key=s.unique_key,
-                country=s.country,
-                league=s.league,
-                match_time=s.match_time,
-                home_team=s.home_team,
-                away_team=s.away_team,
-                ms_1=s.ms_1,
-                ms_x=s.ms_x,
-                ms_2=s.ms_2,
-                under_2_5=s.under_2_5,
-                over_2_5=s.over_2_5
-            )
-            count += 1
-            
-        # 3. Clear Staging
-        staging_items.delete()
-        
+        count = publish_staging()
         messages.success(request, f"{count} Maç Canlı Bültäne Aktarıldı.")
         return redirect('bulletin')
         
@@ -0,0 +1,163 @@
+"""
+SQLite write-contention handling.
+
+Web requests, the scheduler loop and the background threads (task runs, imports,
+scrapes) all write to the same db.sqlite3. Three things keep them from failing
+with "database is locked":
+
+  * configure_sqlite(): WAL and tuned pragmas on every new connection, so readers
+    never block the writer and commits stay cheap.
+  * settings: a busy timeout (connections wait for the lock instead of failing)
+    and BEGIN IMMEDIATE transactions (the write lock is taken up front, so two
+    transactions never deadlock upgrading a read lock).
+  * WriteQueue / background_write(): small background writes (TaskLog progress)
+    go to one writer thread, which commits whatever is pending as one batch.
+
+On other databases the pragmas are skipped and background_write() runs inline.
+
+Background threads use thread_connection() / start_db_thread(): the thread's
+connection is returned when the work ends (to the pool on PostgreSQL, see
+DB_POOL in settings) instead of being torn down and re-opened around every job.
+"""
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from django.db import connection, connections, transaction, close_old_connections
+
+logger = logging.getLogger('automation')
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # readers and the writer no longer block each other
+    "PRAGMA synchronous=NORMAL",    # durable with WAL; fsync at checkpoints only
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",     # 20 MB page cache
+    "PRAGMA mmap_size=134217728",   # 128 MB memory-mapped reads
+)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    connection_created handler.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+
+
+class WriteQueue:
+    """
+    Runs submitted write callables on a single thread, in order. Jobs that are pending
+    together are committed in one transaction (each in its own savepoint, so a failing
+    job is rolled back alone). Futures resolve after the commit.
+    """
+    def __init__(self, max_batch=100):
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        self._ensure_thread()
+        return future
+
+    def flush(self, timeout=30):
+        """
+        Waits until everything submitted so far is committed.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self.submit(lambda: None).result(timeout)
+        except Exception as e:
+            logger.warning(f"Write queue flush failed: {e}")
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < self.max_batch:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run_batch(jobs)
+            close_old_connections()
+
+    def _run_batch(self, jobs):
+        done = []
+        try:
+            with transaction.atomic():
+                for fn, args, kwargs, future in jobs:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic():
+                            done.append((future, fn(*args, **kwargs)))
+                    except Exception as e:
+                        logger.error(f"Queued write failed: {e}", exc_info=True)
+                        future.set_exception(e)
+        except Exception as e:
+            # Commit failed: every job of the batch is lost
+            logger.error(f"Write batch of {len(jobs)} failed: {e}", exc_info=True)
+            for future, _ in done:
+                future.set_exception(e)
+            return
+        for future, result in done:
+            future.set_result(result)
+
+
+@contextmanager
+def thread_connection():
+    """
+    Database work outside the request cycle: drops a connection that is broken or past
+    CONN_MAX_AGE on entry and gives this thread's connections back on exit.
+    """
+    close_old_connections()
+    try:
+        yield
+    finally:
+        connections.close_all()
+
+
+def start_db_thread(target, *args, name=None, daemon=False, **kwargs):
+    """
+    Starts `target` in a thread wrapped in thread_connection(). Returns the thread.
+    """
+    def run():
+        with thread_connection():
+            target(*args, **kwargs)
+
+    thread = threading.Thread(target=run, name=name, daemon=daemon)
+    thread.start()
+    return thread
+
+
+writer = WriteQueue()
+atexit.register(writer.flush)
+
+
+def background_write(fn, *args, **kwargs):
+    """
+    Queues a write on SQLite (returns a Future); elsewhere runs it now (completed Future).
+    """
+    if connection.vendor == 'sqlite':
+        return writer.submit(fn, *args, **kwargs)
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        logger.error(f"Background write failed: {e}", exc_info=True)
+        future.set_exception(e)
+    return future
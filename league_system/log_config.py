@@ -0,0 +1,97 @@
+"""
+Queue-based logging for the scraper, automation and bot loggers.
+
+Django calls `configure_logging` (see LOGGING_CONFIG in settings) with the
+LOGGING dict. After the normal dictConfig, the real handlers of the hot
+loggers are moved behind a QueueHandler and drained by a QueueListener
+thread, so file/console I/O never blocks the browser-driving thread.
+
+Structured fields can be passed with `extra`, e.g.
+    logger.debug("Scroll step", extra={"sample": "bilyoner.scroll", "scroll": i})
+Records tagged with `sample` are DEBUG events that may be thinned out by
+the SampleFilter (1 out of every N per sample key). It sits on the handlers,
+so records propagated from child loggers (automation.api_receiver, ...) are
+sampled too; logger-level filters only see records logged on that logger.
+"""
+import atexit
+import logging
+import logging.config
+import logging.handlers
+import queue
+import threading
+
+QUEUED_LOGGERS = ('scraper', 'automation', 'betting_engine')
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'sample', 'sample_keep'}
+
+_listeners = []
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Regular formatter that appends `extra` fields as key=value pairs.
+    """
+    def format(self, record):
+        text = super().format(record)
+        fields = {k: v for k, v in vars(record).items() if k not in _RESERVED_ATTRS}
+        if fields:
+            text += " | " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class SampleFilter(logging.Filter):
+    """
+    Lets through 1 of every `rate` DEBUG records per `sample` key.
+    Records without a `sample` key or above DEBUG always pass.
+    """
+    def __init__(self, rate=1):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._counts = {}
+        self._lock = threading.Lock()  # shared by the queue listener threads
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None or self.rate == 1 or record.levelno > logging.DEBUG:
+            return True
+        # One instance serves several handlers: decide once per record, not once per handler
+        keep = getattr(record, 'sample_keep', None)
+        if keep is None:
+            with self._lock:
+                count = self._counts.get(key, 0)
+                self._counts[key] = count + 1
+            keep = record.sample_keep = count % self.rate == 0
+        return keep
+
+
+def _attach_queue(logger):
+    handlers = list(logger.handlers)
+    if not handlers or any(isinstance(h, logging.handlers.QueueHandler) for h in handlers):
+        return
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    _listeners.append(listener)
+
+
+def stop_listeners():
+    """
+    Flushes and stops all queue listeners (registered atexit).
+    """
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def configure_logging(logging_settings):
+    if logging_settings:
+        logging.config.dictConfig(logging_settings)
+    for name in QUEUED_LOGGERS:
+        _attach_queue(logging.getLogger(name))
+
+
+atexit.register(stop_listeners)
@@ -0,0 +1,153 @@
+"""
+Read/write routing between the primary database and an optional read replica.
+
+With REPLICA_DATABASE_URL set, settings add a 'replica' alias and this router.
+Reads go to the replica only inside use_replica() (analysis pages, listings,
+coupon candidates); everything else, including the scheduler and background
+threads, keeps using the primary. The primary is still used when:
+
+  * the current context has written (read-after-write in the same request/block),
+  * the request carries the pin cookie set after a write (PRIMARY_PIN_SECONDS),
+  * a transaction is open on the primary,
+  * the replica lags more than REPLICA_MAX_LAG_SECONDS or cannot be reached.
+
+Local test with two aliases: point REPLICA_DATABASE_URL at the same SQLite file
+(sqlite:///db.sqlite3) or at a copy of it.
+"""
+import contextvars
+import functools
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('automation')
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'pin_primary'
+
+# Per request (or per use_replica block): {'replica': bool, 'pinned': bool, 'wrote': bool}
+_state = contextvars.ContextVar('db_routing', default=None)
+
+# Only these apps' reads may go to the replica (sessions/auth always read the primary)
+REPLICA_APPS = ('data_manager', 'analysis', 'betting_engine')
+# Writes that do not make the user's next reads stale
+UNPINNED_APPS = ('sessions', 'admin')
+
+
+class use_replica:
+    """
+    Decorator / context manager: reads inside may go to the replica.
+    """
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with use_replica():
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        state = _state.get()
+        self._token = _state.set({
+            'replica': True,
+            'pinned': bool(state and state['pinned']),
+            'wrote': False,
+        })
+        self._outer = state
+        return self
+
+    def __exit__(self, *exc):
+        inner = _state.get()
+        _state.reset(self._token)
+        if self._outer is not None and inner['wrote']:
+            self._outer['pinned'] = self._outer['wrote'] = True
+        return False
+
+
+_lag_lock = threading.Lock()
+_lag_checked = {'at': 0.0, 'lag': None}
+
+
+def _measure_lag():
+    """
+    Replication delay in seconds; None when the replica cannot be queried.
+    """
+    conn = connections[REPLICA_ALIAS]
+    try:
+        if conn.vendor != 'postgresql':
+            return 0.0
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE WHEN pg_is_in_recovery() "
+                "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "ELSE 0 END"
+            )
+            return float(cursor.fetchone()[0])
+    except Exception as e:
+        logger.warning(f"Replica lag check failed: {e}")
+        return None
+
+
+def replica_lag():
+    """
+    Cached replica lag (re-measured every REPLICA_LAG_CHECK_SECONDS).
+    """
+    with _lag_lock:
+        if time.monotonic() - _lag_checked['at'] >= settings.REPLICA_LAG_CHECK_SECONDS:
+            _lag_checked['lag'] = _measure_lag()
+            _lag_checked['at'] = time.monotonic()
+        return _lag_checked['lag']
+
+
+def replica_available():
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return False
+    lag = replica_lag()
+    return lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if not state or not state['replica'] or state['pinned']:
+            return 'default'
+        if model._meta.app_label not in REPLICA_APPS:
+            return 'default'
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA_ALIAS if replica_available() else 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label not in UNPINNED_APPS:
+            state['pinned'] = state['wrote'] = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db != REPLICA_ALIAS
+
+
+class PrimaryPinMiddleware:
+    """
+    Keeps a user's reads on the primary for PRIMARY_PIN_SECONDS after a request that wrote,
+    so a redirect after a POST never shows replica data older than the write.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = {'replica': False, 'pinned': PIN_COOKIE in request.COOKIES, 'wrote': False}
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state['wrote']:
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.PRIMARY_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'league_system.routers.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -95,6 +97,49 @@ DATABASES = {
     )
 }
 
+# SQLite: wait for the write lock instead of failing and take it at BEGIN (see league_system/db.py)
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'timeout': SQLITE_BUSY_TIMEOUT,
+        'transaction_mode': 'IMMEDIATE',
+    })
+    # Threaded tests need a file: the in-memory test database reports table locks instead of waiting
+    DATABASES['default']['TEST'] = {'NAME': str(BASE_DIR / 'test_db.sqlite3')}
+
+# The league apps ship no migration files; the test database builds their tables from the models
+if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    MIGRATION_MODULES = {app: None for app in ('data_manager', 'analysis', 'betting_engine')}
+
+# Optional read replica for analysis/listing reads (see league_system/routers.py)
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL", "")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+PRIMARY_PIN_SECONDS = int(os.getenv("PRIMARY_PIN_SECONDS", "15"))
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(REPLICA_DATABASE_URL, conn_max_age=600)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    if DATABASES['replica']['ENGINE'] == 'django.db.backends.sqlite3':
+        DATABASES['replica'].setdefault('OPTIONS', {})['timeout'] = SQLITE_BUSY_TIMEOUT
+DATABASE_ROUTERS = ['league_system.routers.ReplicaRouter']
+
+# Connection lifecycle: health-checked reuse everywhere; on PostgreSQL a psycopg (3) pool
+# shared by requests, the scheduler and background threads (league_system.db.start_db_thread)
+DB_POOL = os.getenv("DB_POOL", "True") == "True"
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+for _db in DATABASES.values():
+    _db['CONN_HEALTH_CHECKS'] = True
+    if DB_POOL and _db['ENGINE'] == 'django.db.backends.postgresql':
+        # The pool keeps the connections; persistent per-thread connections must be off
+        _db['CONN_MAX_AGE'] = 0
+        _db.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,18 +190,56 @@ LOGIN_URL = 'login'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Detail crawler (match report / player profile pages)
+DETAIL_CRAWL_WORKERS = int(os.getenv("DETAIL_CRAWL_WORKERS", "4"))
+DETAIL_CRAWL_PER_HOST = int(os.getenv("DETAIL_CRAWL_PER_HOST", "2"))
+DETAIL_CRAWL_MAX_ERRORS = int(os.getenv("DETAIL_CRAWL_MAX_ERRORS", "3"))
+
+# Bulletin/dataset push endpoints: limits of the received body and of its gunzipped form
+SYNC_MAX_BODY_BYTES = int(os.getenv("SYNC_MAX_BODY_BYTES", str(2_621_440)))  # Django's DATA_UPLOAD_MAX_MEMORY_SIZE default
+SYNC_MAX_DECODED_BYTES = int(os.getenv("SYNC_MAX_DECODED_BYTES", str(50 * 1024 * 1024)))
+
+# Published bulletin snapshots kept for rollback (older ones are pruned by the prune_bulletin_versions task)
+BULLETIN_KEEP_VERSIONS = int(os.getenv("BULLETIN_KEEP_VERSIONS", "3"))
+
+# Standings are derived from fixture results; the scraped table is only fetched to reconcile every N hours
+STANDINGS_RECONCILE_HOURS = int(os.getenv("STANDINGS_RECONCILE_HOURS", "24"))
+
+# Streaming exports (data_manager/exports.py); the export_results task writes gzip files to EXPORT_DIR
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+EXPORT_DIR = os.getenv("EXPORT_DIR", str(BASE_DIR / "exports"))
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "csv")
+EXPORT_KEEP_FILES = int(os.getenv("EXPORT_KEEP_FILES", "5"))
+
 # Logging Configuration
 LOGS_DIR = BASE_DIR / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Scraper/automation/bot handlers are moved behind a QueueListener (non-blocking)
+LOGGING_CONFIG = "league_system.log_config.configure_logging"
+
+# Keep 1 of every N high-frequency DEBUG events (records logged with extra={"sample": ...})
+LOG_DEBUG_SAMPLE_RATE = int(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "sample_debug": {  # on the handlers, so records of child loggers are sampled too
+            "()": "league_system.log_config.SampleFilter",
+            "rate": LOG_DEBUG_SAMPLE_RATE,
+        },
+    },
     "formatters": {
         "verbose": {
             "format": "{levelname} {asctime} {module} {message}",
             "style": "{",
         },
+        "structured": {
+            "class": "league_system.log_config.StructuredFormatter",
+            "format": "{levelname} {asctime} {threadName} {module} {message}",
+            "style": "{",
+        },
         "simple": {
             "format": "{levelname} {message}",
             "style": "{",
@@ -167,6 +250,7 @@ LOGGING = {
             "level": "INFO",
             "class": "logging.StreamHandler",
             "formatter": "simple",
+            "filters": ["sample_debug"],
         },
         "scraper_file": {
             "level": "DEBUG",
@@ -174,7 +258,8 @@ LOGGING = {
             "filename": LOGS_DIR / "scraper.log",
             "maxBytes": 50 * 1024 * 1024,  # 50 MB
             "backupCount": 10,
-            "formatter": "verbose",
+            "formatter": "structured",
+            "filters": ["sample_debug"],
         },
         "django_file": {
             "level": "ERROR",
@@ -196,6 +281,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "betting_engine": {  # Bilyoner bot
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": True,
+        },
         "django": {
             "handlers": ["console", "django_file"],
             "level": "INFO",
@@ -0,0 +1,164 @@
+"""
+Standalone scraping CLI. Never imports Django.
+
+    python -m scraper --country turkey england --type standings fixtures
+    python -m scraper --country all --type all --parallel 4
+    python -m scraper --type bulletin --push https://my-server.example
+
+Each league runs its data types in order (squads need the team links written
+by the standings pass); different leagues and the bulletin run in parallel.
+Results are written as JSON snapshots and can optionally be pushed to the web
+app (analysis/api/push-dataset/; the bulletin uses the delta sync protocol of
+scraper.bulletin_sync, so only new/changed/removed matches are sent).
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scraper.engine import ScraperManager
+from scraper.storage import DATA_DIR, save_json, team_links_path
+from scraper.bulletin_sync import push_bulletin_delta, SyncError
+
+logger = logging.getLogger('scraper')
+
+COUNTRIES = ('turkey', 'england', 'spain', 'italy')
+DATA_TYPES = ('standings', 'fixtures', 'squads')
+PUSH_SECRET = os.getenv('SCRAPER_PUSH_SECRET', "WFM_PRO_2026_SECURE_SYNC")
+
+
+def run_league(country, data_types, season=2025):
+    """
+    Scrapes the requested data types of one league. Returns {data_type: rows}.
+    """
+    manager = ScraperManager()
+    results = {}
+    for data_type in sorted(data_types, key=DATA_TYPES.index):
+        if data_type == 'standings' or (data_type == 'squads' and not os.path.exists(team_links_path(country))):
+            table = manager.scrape_league_table(country)
+            if table['team_links']:
+                save_json(os.path.basename(team_links_path(country)), table['team_links'])
+                results['team_links'] = table['team_links']
+            if data_type == 'standings':
+                results['standings'] = table['standings']
+                continue
+
+        if data_type == 'fixtures':
+            results['fixtures'] = getattr(manager, f"scrape_{country}_fixtures")(season=season)
+        elif data_type == 'squads':
+            results['squads'] = getattr(manager, f"scrape_{country}_squads")()
+    return results
+
+
+def run_bulletin():
+    return {'bulletin': ScraperManager().scrape_bilyoner()}
+
+
+def push_results(base_url, country, results, secret=PUSH_SECRET):
+    """
+    Sends each data set to the web app. Returns True if every push was accepted.
+    """
+    import requests
+
+    ok = True
+    for data_type, rows in results.items():
+        if not rows:
+            continue
+        if data_type == 'bulletin':
+            try:
+                result = push_bulletin_delta(base_url, rows, secret, timeout=60)
+                logger.info(f"Pushed bulletin: {result.get('inserted', 0)} new, {result.get('changed', 0)} changed, "
+                            f"{result.get('removed', 0)} removed, {result.get('unchanged', 0)} unchanged "
+                            f"({result.get('timings', {}).get('total_ms', 0)} ms)")
+            except (SyncError, requests.RequestException) as e:
+                ok = False
+                logger.error(f"Push failed for bulletin: {e}")
+            continue
+
+        url = f"{base_url.rstrip('/')}/analysis/api/push-dataset/"
+        payload = {"secret": secret, "country": country, "data_type": data_type, "data": rows}
+        try:
+            response = requests.post(url, json=payload, timeout=60)
+            body = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
+            if response.status_code == 200 and body.get('success'):
+                logger.info(f"Pushed {country} {data_type}: {len(rows)} rows")
+            else:
+                ok = False
+                logger.error(f"Push failed for {country} {data_type}: HTTP {response.status_code} {body.get('error', '')}")
+        except Exception as e:
+            ok = False
+            logger.error(f"Push failed for {country} {data_type}: {e}")
+    return ok
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scraper", description="Django-free league scraper.")
+    parser.add_argument('--country', nargs='+', default=['all'], choices=COUNTRIES + ('all',),
+                        help="Leagues to scrape (default: all)")
+    parser.add_argument('--type', nargs='+', default=['all'], dest='data_types',
+                        choices=DATA_TYPES + ('bulletin', 'all'),
+                        help="Data types to scrape; 'all' = standings, fixtures, squads")
+    parser.add_argument('--season', type=int, default=2025, help="Fixtures season id (default: 2025)")
+    parser.add_argument('--parallel', type=int, default=2, help="Jobs (leagues / bulletin) run at the same time")
+    parser.add_argument('--out', default=os.path.join(DATA_DIR, 'snapshots'),
+                        help="Snapshot folder (default: <data dir>/snapshots)")
+    parser.add_argument('--no-snapshot', action='store_true', help="Do not write snapshot files")
+    parser.add_argument('--push', metavar='BASE_URL', help="Push results to this web app, e.g. https://example.com")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    countries = COUNTRIES if 'all' in args.country else tuple(dict.fromkeys(args.country))
+    data_types = set(DATA_TYPES if 'all' in args.data_types else args.data_types)
+
+    jobs = {}
+    league_types = data_types - {'bulletin'}
+    if league_types:
+        for country in countries:
+            jobs[country] = (run_league, (country, league_types, args.season))
+    if 'bulletin' in data_types:
+        jobs['bulletin'] = (run_bulletin, ())
+
+    started = time.time()
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as pool:
+        futures = {pool.submit(func, *func_args): name for name, (func, func_args) in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"{name} failed: {e}", exc_info=True)
+                failed.append(name)
+                continue
+
+            for data_type, rows in results.items():
+                if data_type == 'team_links':
+                    continue
+                logger.info(f"{name} {data_type}: {len(rows or [])} rows")
+                if not rows:
+                    failed.append(f"{name}:{data_type}")
+                elif not args.no_snapshot:
+                    filename = "bulletin.json" if data_type == 'bulletin' else f"{name}_{data_type}.json"
+                    logger.info(f"Snapshot written: {save_json(filename, rows, folder=args.out)}")
+
+            if args.push and not push_results(args.push, name, results):
+                failed.append(f"{name}:push")
+
+    logger.info(f"Done in {time.time() - started:.1f}s ({len(jobs)} jobs, {len(failed)} failures)")
+    if failed:
+        logger.warning(f"Failed / empty: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
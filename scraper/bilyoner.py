@@ -8,25 +8,8 @@ from playwright.sync_api import sync_playwright
 
 import logging
 
-
-
-# Enhanced Logger Setup
+# Handlers come from settings.LOGGING (queued); no module-level handlers here
 logger = logging.getLogger('scraper')
-logger.setLevel(logging.DEBUG)
-
-# File Handler (Persist logs)
-if not logger.handlers:
-    fh = logging.FileHandler('scraper_debug.log', mode='w')
-    fh.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
-
-    # Console Handler (Immediate feedback)
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
 
 class BilyonerScraper(BaseScraper):
     def start_browser(self, headless=False):
@@ -227,7 +210,7 @@ class BilyonerScraper(BaseScraper):
                 # Log progress periodically
                 if i % 50 == 0:
                     current_len = len(global_events)
-                    logger.debug(f"Scroll {i}: {current_len} raw items.")
+                    logger.debug("Scroll progress", extra={"sample": "bilyoner.scroll", "scroll": i, "raw_items": current_len})
                     if current_len == last_count:
                         no_change_count += 1
                         if no_change_count > 5: # Stop if stuck
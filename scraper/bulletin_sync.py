@@ -0,0 +1,153 @@
+"""
+Delta sync protocol for pushing a locally scraped bulletin to the web app.
+Shared by the client (CLI, scripts/scrape_local_and_push.py, the sync center)
+and the server (data_manager.bulletin, analysis.views). Never imports Django.
+
+    1. handshake: client sends {unique_key: row_hash} of its bulletin; the server
+       compares it with the current version and answers which keys it needs
+       (new or changed) and which it will drop.
+    2. apply: client sends only those rows plus the removals. The server builds the
+       next bulletin version from the current one and is idempotent per sync token.
+
+Bodies are gzip-compressed JSON (Content-Encoding: gzip).
+"""
+import io
+import gzip
+import json
+import time
+import hashlib
+import logging
+
+logger = logging.getLogger('scraper')
+
+TEXT_FIELDS = ('unique_key', 'country', 'league', 'match_date', 'match_time', 'home_team', 'away_team')
+ODDS_FIELDS = ('ms_1', 'ms_x', 'ms_2', 'under_2_5', 'over_2_5')
+ROW_FIELDS = TEXT_FIELDS + ODDS_FIELDS
+
+SYNC_PATH = "/analysis/api/sync-bulletin/"
+
+# Upper bound of a decoded (gunzipped) body; a full bulletin is a few MB
+MAX_DECODED_BYTES = 50 * 1024 * 1024
+
+
+def normalize_row(row, default_country='TURKEY'):
+    """
+    Display values of a bulletin row with the defaults the web app stores
+    (missing odds -> '-', missing time -> '00:00', ...). Idempotent.
+    """
+    fields = {
+        'unique_key': str(row.get('unique_key') or ''),
+        'country': str(row.get('country') or default_country),
+        'league': str(row.get('league') or '-'),
+        'match_date': str(row.get('match_date') or ''),
+        'match_time': str(row.get('match_time') or '00:00'),
+        'home_team': str(row.get('home_team') or 'Unknown'),
+        'away_team': str(row.get('away_team') or 'Unknown'),
+    }
+    for field in ODDS_FIELDS:
+        value = row.get(field)
+        fields[field] = str(value) if value not in (None, '') else '-'
+    return fields
+
+
+def row_hash(row):
+    """
+    Content hash of the normalized row; equal on both sides when nothing changed.
+    """
+    fields = normalize_row(row)
+    raw = "\x1f".join(fields[f] for f in ROW_FIELDS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def manifest(rows):
+    return {str(row.get('unique_key')): row_hash(row) for row in rows if row.get('unique_key')}
+
+
+def sync_token(base_version, hashes):
+    """
+    Deterministic id of one apply: the same delta on the same base version is applied once.
+    """
+    digest = hashlib.sha1(json.dumps(sorted(hashes.items())).encode('utf-8')).hexdigest()
+    return f"{base_version or 0}-{digest}"
+
+
+def encode_body(payload):
+    return gzip.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+
+class PayloadTooLarge(Exception):
+    pass
+
+
+def decode_body(body, content_encoding=None, max_size=MAX_DECODED_BYTES):
+    """
+    JSON body of a request, gunzipped when sent with Content-Encoding: gzip.
+    Raises PayloadTooLarge when the body or its decompressed form exceeds `max_size`
+    (decompression stops there, so a gzip bomb never gets expanded).
+    """
+    if len(body) > max_size:
+        raise PayloadTooLarge(f"Body larger than {max_size} bytes")
+    if (content_encoding or '').lower() == 'gzip' or body[:2] == b'\x1f\x8b':
+        with gzip.GzipFile(fileobj=io.BytesIO(body)) as f:
+            body = f.read(max_size + 1)
+        if len(body) > max_size:
+            raise PayloadTooLarge(f"Decompressed body larger than {max_size} bytes")
+    return json.loads(body or b'{}')
+
+
+class SyncError(Exception):
+    pass
+
+
+def _post(session, url, payload, timeout):
+    response = session.post(
+        url, data=encode_body(payload), timeout=timeout,
+        headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+    )
+    try:
+        body = response.json()
+    except ValueError:
+        raise SyncError(f"HTTP {response.status_code}: {response.text[:200]}")
+    if response.status_code != 200 or not body.get('success'):
+        raise SyncError(body.get('error') or f"HTTP {response.status_code}")
+    return body
+
+
+def push_bulletin_delta(base_url, rows, secret, timeout=30, retries=1):
+    """
+    Pushes `rows` to the web app with the handshake/apply protocol. `base_url` is the
+    site root; an old-style '.../analysis/api/push-bulletin/' URL is accepted as well.
+    Returns the server's apply summary, e.g.
+    {'version': 12, 'inserted': 3, 'changed': 5, 'removed': 1, 'unchanged': 240, 'timings': {...}}.
+    Raises SyncError on failure. A stale base version (another push in between) is retried.
+    """
+    import requests
+
+    url = f"{base_url.split('/analysis/api/')[0].rstrip('/')}{SYNC_PATH}"
+    by_key = {str(row['unique_key']): row for row in rows if row.get('unique_key')}
+    hashes = manifest(by_key.values())
+    session = requests.Session()
+
+    for attempt in range(retries + 1):
+        started = time.time()
+        plan = _post(session, url, {'secret': secret, 'action': 'handshake', 'manifest': hashes}, timeout)
+        need, remove = plan.get('need', []), plan.get('remove', [])
+        logger.info(f"Bulletin sync handshake: {len(hashes)} local rows, server needs {len(need)}, drops {len(remove)}")
+        if not need and not remove:
+            return {'version': plan.get('version'), 'inserted': 0, 'changed': 0, 'removed': 0,
+                    'unchanged': len(hashes), 'timings': {'total_ms': round((time.time() - started) * 1000)}}
+
+        payload = {
+            'secret': secret,
+            'action': 'apply',
+            'base_version': plan.get('version'),
+            'token': sync_token(plan.get('version'), hashes),
+            'upserts': [by_key[key] for key in need if key in by_key],
+            'removals': remove,
+        }
+        try:
+            return _post(session, url, payload, timeout)
+        except SyncError as e:
+            if 'stale' not in str(e).lower() or attempt == retries:
+                raise
+            logger.warning("Bulletin changed on the server during sync, retrying handshake")
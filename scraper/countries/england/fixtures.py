@@ -1,6 +1,7 @@
 import logging
 import time
 import re
+from urllib.parse import urljoin
 from scraper.base import BaseScraper
 
 logger = logging.getLogger('scraper')
@@ -143,6 +144,11 @@ class EnglandFixturesScraper(BaseScraper):
                         away_val = re.sub(r'\s*\(\d+\.\)$', '', away_val).strip()
 
                         if score_val == "-:-": score_val = ""
+
+                        # Match report link (used by the detail crawler)
+                        link_node = row.query_selector("a[href*='spielbericht']")
+                        match_href = link_node.get_attribute("href") if link_node else ""
+                        match_url = urljoin(url, match_href) if match_href else ""
                         
                         # Time vs Score Logic
                         if score_val and re.match(r'^\d{1,2}:\d{2}$', score_val):
@@ -160,7 +166,8 @@ class EnglandFixturesScraper(BaseScraper):
                                 "Saat": time_val,
                                 "Ev Sahibi": home_val,
                                 "Skor": score_val,
-                                "Misafir": away_val
+                                "Misafir": away_val,
+                                "Maç Linki": match_url
                             })
                         else:
                              pass
@@ -2,16 +2,16 @@ import os
 import json
 import time
 import logging
-from django.conf import settings
+from scraper.storage import DATA_DIR
 from scraper.base import BaseScraper
 
 logger = logging.getLogger('scraper')
 
 class EnglandSquadsScraper(BaseScraper):
-    def scrape(self, custom_url=None):
+    def scrape(self, custom_url=None, only_teams=None):
         try:
             links_filename = "england_team_links.json"
-            links_path = os.path.join(settings.BASE_DIR, 'data', links_filename)
+            links_path = os.path.join(DATA_DIR, links_filename)
             
             logger.info(f"Looking for England team links at: {links_path}")
             
@@ -30,6 +30,10 @@ class EnglandSquadsScraper(BaseScraper):
             
         with open(links_path, "r", encoding="utf-8") as f:
             teams = json.load(f)
+
+        # Incremental refresh: only revisit the requested teams
+        if only_teams is not None:
+            teams = [t for t in teams if t.get("team") in only_teams]
             
         logger.info(f"Loaded {len(teams)} teams. Starting squad scrape...")
         
@@ -134,7 +138,9 @@ class EnglandSquadsScraper(BaseScraper):
             print(f"Critical error during scrape: {e}")
         finally:
             self.close_browser()
-            self.save_json(flat_data)
+            # Partial runs must not overwrite the full snapshot
+            if only_teams is None:
+                self.save_json(flat_data)
             
         return flat_data
 
@@ -232,7 +238,7 @@ class EnglandSquadsScraper(BaseScraper):
         return parsed
 
     def save_json(self, data):
-        folder = "c:/Code/web_scraper_0/data"
+        folder = DATA_DIR
         if not os.path.exists(folder):
             os.makedirs(folder)
         path = os.path.join(folder, "england_squads_flat.json")
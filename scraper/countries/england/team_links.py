@@ -4,6 +4,7 @@ import time
 import re
 import traceback
 from scraper.base import BaseScraper
+from scraper.storage import DATA_DIR
 
 class EnglandTeamLinksScraper(BaseScraper):
     def scrape(self, url="https://www.mackolik.com/puan-durumu/ingiltere-premier-lig/2kwbbcootiqqgmrzs6o5inle5"):
@@ -103,7 +104,7 @@ class EnglandTeamLinksScraper(BaseScraper):
 
     def save_json(self, data):
         # Save to data/england_team_links.json
-        folder = "c:/Code/web_scraper_0/data"
+        folder = DATA_DIR
         if not os.path.exists(folder):
             os.makedirs(folder)
             
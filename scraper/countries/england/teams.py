@@ -2,12 +2,13 @@ import json
 import os
 import time
 from scraper.base import BaseScraper
+from scraper.storage import DATA_DIR
 from scraper.countries.england.team_links import EnglandTeamLinksScraper
 
 class EnglandTeamsScraper(BaseScraper):
     def scrape(self, url):
         # 1. Check/Generate Links
-        json_path = "c:/Code/web_scraper_0/data/england_team_links.json"
+        json_path = os.path.join(DATA_DIR, "england_team_links.json")
         
         if not os.path.exists(json_path):
             print("Team links not found. Extracting from Standings first...")
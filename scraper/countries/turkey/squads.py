@@ -2,25 +2,22 @@ import os
 import json
 import time
 import logging
-from django.conf import settings
+from scraper.storage import DATA_DIR
 from scraper.base import BaseScraper
 
 logger = logging.getLogger('scraper')
 
 class TurkeySquadsScraper(BaseScraper):
-    def scrape(self):
-        # Robust path finding using Django settings
+    def scrape(self, only_teams=None):
+        # SCRAPER_DATA_DIR or <repo>/data (see scraper.storage)
         try:
-            base_dir = settings.BASE_DIR
-            data_dir = os.path.join(base_dir, 'data')
+            data_dir = DATA_DIR
             links_filename = "turkey_team_links.json"
             links_path = os.path.join(data_dir, links_filename)
             
             logger.info(f"Looking for team links at: {links_path}")
             
             if not os.path.exists(links_path):
-                # Fallback: check if 'web_app' is missing from base_dir (e.g. if settings is in inner folder)
-                # But settings.BASE_DIR is usually root of project (web_app)
                 logger.error(f"Team links file NOT found at: {links_path}")
                 
                  # Emergency check current dir
@@ -36,6 +33,10 @@ class TurkeySquadsScraper(BaseScraper):
             
         with open(links_path, "r", encoding="utf-8") as f:
             teams = json.load(f)
+
+        # Incremental refresh: only revisit the requested teams
+        if only_teams is not None:
+            teams = [t for t in teams if t.get("team") in only_teams]
             
         logger.info(f"Loaded {len(teams)} teams. Starting squad scrape...")
         
@@ -138,7 +139,9 @@ class TurkeySquadsScraper(BaseScraper):
             print(f"Critical error during scrape: {e}")
         finally:
             self.close_browser()
-            self.save_json(flat_data)
+            # Partial runs must not overwrite the full snapshot
+            if only_teams is None:
+                self.save_json(flat_data)
             
         return flat_data
 
@@ -240,7 +243,7 @@ class TurkeySquadsScraper(BaseScraper):
         return parsed
 
     def save_json(self, data):
-        folder = "c:/Code/web_scraper_0/data"
+        folder = DATA_DIR
         if not os.path.exists(folder):
             os.makedirs(folder)
         path = os.path.join(folder, "turkey_squads_flat.json")
@@ -3,6 +3,7 @@ import os
 import time
 import re
 from scraper.base import BaseScraper
+from scraper.storage import DATA_DIR
 
 class TurkeyTeamLinksScraper(BaseScraper):
     def scrape(self, url="https://www.mackolik.com/puan-durumu/t%C3%BCrkiye-s%C3%BCper-lig/482ofyysbdbeoxauk19yg7tdt"):
@@ -102,7 +103,7 @@ class TurkeyTeamLinksScraper(BaseScraper):
 
     def save_json(self, data):
         # Save to data/turkey_team_links.json
-        folder = "c:/Code/web_scraper_0/data"
+        folder = DATA_DIR
         if not os.path.exists(folder):
             os.makedirs(folder)
             
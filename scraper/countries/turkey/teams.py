@@ -2,12 +2,13 @@ import json
 import os
 import time
 from scraper.base import BaseScraper
+from scraper.storage import DATA_DIR
 from scraper.countries.turkey.team_links import TurkeyTeamLinksScraper
 
 class TurkeyTeamsScraper(BaseScraper):
     def scrape(self, url):
         # 1. Check/Generate Links
-        json_path = "c:/Code/web_scraper_0/data/turkey_team_links.json"
+        json_path = os.path.join(DATA_DIR, "turkey_team_links.json")
         
         if not os.path.exists(json_path):
             print("Team links not found. Extracting from Standings first...")
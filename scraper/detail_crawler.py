@@ -0,0 +1,322 @@
+"""
+Detail-page crawler for match report and player profile pages.
+
+The frontier deduplicates URLs and keeps one FIFO per host. The crawler hands
+jobs to a fixed pool of worker threads, each of which owns its own
+BaseScraper browser (Playwright sync objects cannot be shared across threads),
+while never running more than `per_host` pages against the same host at once.
+
+Parsers are registered per page kind and turn a loaded page into a list of
+compact stat dicts. Nothing in this module touches Django; persistence and the
+"only new or changed" selection live in automation.detail_tasks.
+"""
+import re
+import json
+import queue
+import hashlib
+import logging
+import threading
+from collections import defaultdict, deque
+from urllib.parse import urlsplit, urlunsplit
+from scraper.base import BaseScraper
+
+logger = logging.getLogger('scraper')
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_HOST = 2
+
+
+def normalize_url(url):
+    """
+    Canonical form used for deduplication: lowercase scheme/host, no fragment, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(((parts.scheme or 'https').lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+def content_hash(rows):
+    """
+    Hash of the parsed rows (not the raw HTML, which changes with every ad rotation).
+    """
+    payload = json.dumps(rows, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _lower_tr(text):
+    return (text or "").replace('İ', 'i').replace('I', 'ı').lower().strip()
+
+
+def _to_int(value):
+    digits = re.sub(r'[^\d-]', '', str(value or ''))
+    try:
+        return int(digits)
+    except ValueError:
+        return None
+
+
+class UrlFrontier:
+    """
+    Deduplicating per-host FIFO of (url, kind) jobs.
+    Only used from the crawler's coordinating thread, so it needs no locking.
+    """
+    def __init__(self):
+        self._seen = set()
+        self._queues = defaultdict(deque)
+
+    def add(self, url, kind):
+        if not url:
+            return False
+        url = normalize_url(url)
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        self._queues[urlsplit(url).netloc].append((url, kind))
+        return True
+
+    def __len__(self):
+        return sum(len(q) for q in self._queues.values())
+
+    def pop_ready(self, has_capacity):
+        """
+        Round-robins over the hosts and yields (host, job) while the host has a free slot.
+        """
+        progressed = True
+        while progressed:
+            progressed = False
+            for host in list(self._queues):
+                pending = self._queues[host]
+                if pending and has_capacity(host):
+                    progressed = True
+                    yield host, pending.popleft()
+                if not pending:
+                    del self._queues[host]
+
+
+# --- PARSERS ---
+
+class DetailParser:
+    """
+    Base class for pluggable page parsers. `parse` returns a list of stat dicts;
+    an empty list means the page has no usable data yet.
+    """
+    kind = None
+
+    def page_url(self, url):
+        return url
+
+    def parse(self, page, url):
+        raise NotImplementedError
+
+
+MATCH_STATS_JS = """() => {
+    const teams = Array.from(document.querySelectorAll('.sb-team .sb-vereinslink')).map(a => a.innerText.trim());
+    const score = document.querySelector('.sb-endstand');
+    const stats = Array.from(document.querySelectorAll('.sb-statistik')).map(block => {
+        let label = '';
+        let prev = block.previousElementSibling;
+        while (prev && !label) {
+            if (prev.classList.contains('unterueberschrift')) label = prev.innerText.trim();
+            prev = prev.previousElementSibling;
+        }
+        const nums = Array.from(block.querySelectorAll('.sb-statistik-zahl')).map(n => n.innerText.trim());
+        return {label: label, home: nums[0] || '', away: nums[1] || ''};
+    });
+    return {teams: teams, score: score ? score.innerText.trim() : '', stats: stats};
+}"""
+
+# Transfermarkt statistic headings (tr / en / de) -> field suffix. Specific labels first.
+MATCH_STAT_LABELS = [
+    (('isabetsiz', 'off target', 'daneben'), 'shots_off'),
+    (('toplam şut', 'total shots', 'schüsse gesamt'), 'shots'),
+    (('kurtarış', 'saves', 'paraden'), 'saves'),
+    (('korner', 'corner', 'ecken'), 'corners'),
+    (('serbest vuruş', 'free kick', 'freistöße'), 'free_kicks'),
+    (('faul', 'foul'), 'fouls'),
+    (('ofsayt', 'offside', 'abseits'), 'offsides'),
+]
+
+
+class MatchStatParser(DetailParser):
+    """
+    Transfermarkt match report -> one row with score and team statistics.
+    """
+    kind = 'match'
+
+    def page_url(self, url):
+        return url.replace('/index/spielbericht/', '/statistik/spielbericht/')
+
+    def parse(self, page, url):
+        page.wait_for_selector('.sb-endstand', timeout=20000)
+        data = page.evaluate(MATCH_STATS_JS)
+
+        row = {}
+        teams = data.get('teams') or []
+        if len(teams) >= 2:
+            row['home_team'], row['away_team'] = teams[0], teams[1]
+
+        score = re.search(r'(\d+)\s*:\s*(\d+)', data.get('score') or '')
+        if not score:
+            return []  # Not played yet
+        row['home_goals'], row['away_goals'] = int(score.group(1)), int(score.group(2))
+
+        for stat in data.get('stats') or []:
+            label = _lower_tr(stat.get('label'))
+            for needles, field in MATCH_STAT_LABELS:
+                if any(n in label for n in needles):
+                    row[f'home_{field}'] = _to_int(stat.get('home'))
+                    row[f'away_{field}'] = _to_int(stat.get('away'))
+                    break
+        return [row]
+
+
+PLAYER_TABLES_JS = """() => Array.from(document.querySelectorAll('table')).map(t => ({
+    headers: Array.from(t.querySelectorAll('thead th, thead td')).map(h => h.innerText.trim()),
+    rows: Array.from(t.querySelectorAll('tbody tr')).map(tr => Array.from(tr.querySelectorAll('td')).map(td => td.innerText.trim())),
+}))"""
+
+# Mackolik profile table headers -> PlayerSeasonStat field
+PLAYER_STAT_HEADERS = {
+    'sezon': 'season',
+    'turnuva': 'competition',
+    'lig': 'competition',
+    'organizasyon': 'competition',
+    'takım': 'team_name',
+    'maç': 'appearances',
+    'm': 'appearances',
+    'dakika': 'minutes',
+    'dk': 'minutes',
+    'gol': 'goals',
+    'g': 'goals',
+    'asist': 'assists',
+    'a': 'assists',
+    'sarı kart': 'yellow_cards',
+    'kırmızı kart': 'red_cards',
+}
+
+SEASON_RE = re.compile(r'\d{4}\s*/\s*\d{2,4}')
+
+
+class PlayerProfileParser(DetailParser):
+    """
+    Mackolik player profile -> one row per season/competition line of the career table.
+    """
+    kind = 'player'
+
+    def parse(self, page, url):
+        page.wait_for_selector('table', timeout=20000)
+        rows = []
+        for table in page.evaluate(PLAYER_TABLES_JS):
+            columns = {}
+            for idx, header in enumerate(table.get('headers') or []):
+                field = PLAYER_STAT_HEADERS.get(_lower_tr(header))
+                if field and field not in columns.values():
+                    columns[idx] = field
+            if 'season' not in columns.values():
+                continue
+
+            for cells in table.get('rows') or []:
+                row = {field: (cells[idx] if idx < len(cells) else '') for idx, field in columns.items()}
+                season = SEASON_RE.search(row.get('season') or '')
+                if not season:
+                    continue
+                row['season'] = season.group(0).replace(' ', '')
+                for field in ('appearances', 'minutes', 'goals', 'assists', 'yellow_cards', 'red_cards'):
+                    if field in row:
+                        row[field] = _to_int(row[field]) or 0
+                row['competition'] = row.get('competition') or ''
+                rows.append(row)
+        return rows
+
+
+PARSERS = {}
+
+
+def register_parser(parser):
+    PARSERS[parser.kind] = parser
+
+
+register_parser(MatchStatParser())
+register_parser(PlayerProfileParser())
+
+
+# --- CRAWLER ---
+
+class DetailCrawler:
+    """
+    Crawls every job of a UrlFrontier and yields one result dict per page:
+        {"url", "kind", "rows", "hash", "error"}
+    Results are yielded on the calling thread, so callers can write them to the DB directly.
+    """
+    def __init__(self, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST, parsers=None, timeout=60000):
+        self.workers = max(1, int(workers))
+        self.per_host = max(1, int(per_host))
+        self.parsers = parsers or PARSERS
+        self.timeout = timeout
+
+    def _fetch(self, scraper, url, kind):
+        result = {"url": url, "kind": kind, "rows": [], "hash": "", "error": None}
+        parser = self.parsers.get(kind)
+        if not parser:
+            result["error"] = f"No parser registered for '{kind}'"
+            return result
+        try:
+            scraper.navigate(parser.page_url(url), timeout=self.timeout)
+            result["rows"] = parser.parse(scraper.page, url)
+            result["hash"] = content_hash(result["rows"])
+        except Exception as e:
+            logger.warning(f"Detail crawl failed for {url}: {e}")
+            result["error"] = str(e)
+            # Start a fresh browser for the next job
+            scraper.close_browser()
+            scraper.page = None
+        return result
+
+    def _worker(self, jobs, results):
+        scraper = BaseScraper()
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                url, kind = job
+                results.put(self._fetch(scraper, url, kind))
+        finally:
+            scraper.close_browser()
+
+    def crawl(self, frontier):
+        jobs = queue.SimpleQueue()
+        results = queue.SimpleQueue()
+        threads = [
+            threading.Thread(target=self._worker, args=(jobs, results), daemon=True, name=f"detail-crawler-{i}")
+            for i in range(min(self.workers, max(1, len(frontier))))
+        ]
+        for t in threads:
+            t.start()
+
+        in_flight = defaultdict(int)
+        pending = 0
+        logger.info(f"Detail crawl started: {len(frontier)} pages, {len(threads)} workers, {self.per_host} per host")
+        try:
+            while True:
+                for host, job in frontier.pop_ready(lambda h: in_flight[h] < self.per_host):
+                    in_flight[host] += 1
+                    pending += 1
+                    jobs.put(job)
+                if not pending:
+                    break
+                result = results.get()
+                pending -= 1
+                in_flight[urlsplit(result["url"]).netloc] -= 1
+                yield result
+        finally:
+            # Drop queued work if the caller stopped early, then stop the workers
+            try:
+                while True:
+                    jobs.get_nowait()
+            except queue.Empty:
+                pass
+            for _ in threads:
+                jobs.put(None)
+            for t in threads:
+                t.join(timeout=30)
@@ -2,20 +2,19 @@ import logging
 from scraper.countries.turkey.standings import TurkeyStandingsScraper
 from scraper.countries.turkey.fixtures import TurkeyFixturesScraper
 from scraper.countries.turkey.teams import TurkeyTeamsScraper
-from scraper.countries.turkey.team_links import TurkeyTeamLinksScraper
 from scraper.countries.turkey.squads import TurkeySquadsScraper
 
 from scraper.countries.england.standings import EnglandStandingsScraper
 from scraper.countries.england.fixtures import EnglandFixturesScraper
 from scraper.countries.england.teams import EnglandTeamsScraper
-from scraper.countries.england.team_links import EnglandTeamLinksScraper
 from scraper.countries.england.squads import EnglandSquadsScraper
 
 from scraper.countries.spain.standings import SpainStandingsScraper
 from scraper.countries.spain.fixtures import SpainFixturesScraper
-from scraper.countries.spain.team_links import SpainTeamLinksScraper
 from scraper.countries.spain.squads import SpainSquadsScraper
 
+from scraper.league_table import LeagueTableScraper
+
 logger = logging.getLogger('scraper')
 
 class ScraperManager:
@@ -27,6 +26,11 @@ class ScraperManager:
     def __init__(self):
         pass
 
+    # --- LEAGUE TABLE (standings + team links in one visit) ---
+    def scrape_league_table(self, country, url=None):
+        logger.info(f"Starting {country.title()} League Table scrape (standings + team links)...")
+        return LeagueTableScraper().scrape(country, url)
+
     # --- TURKEY ---
     def scrape_turkey_standings(self, url=None):
         logger.info("Starting Turkey Standings scrape...")
@@ -43,14 +47,9 @@ class ScraperManager:
         scraper = TurkeyTeamsScraper()
         return scraper.scrape(url) if url else scraper.scrape()
 
-    def scrape_turkey_team_links(self, url=None):
-        logger.info("Starting Turkey Team Links scrape...")
-        scraper = TurkeyTeamLinksScraper()
-        return scraper.scrape(url) if url else scraper.scrape()
-
-    def scrape_turkey_squads(self, url=None):
+    def scrape_turkey_squads(self, url=None, only_teams=None):
         logger.info("Starting Turkey Squads scrape...")
-        return TurkeySquadsScraper().scrape()
+        return TurkeySquadsScraper().scrape(only_teams=only_teams)
 
     # --- ENGLAND ---
     def scrape_england_standings(self, url=None):
@@ -68,14 +67,9 @@ class ScraperManager:
         scraper = EnglandTeamsScraper()
         return scraper.scrape(url) if url else scraper.scrape()
 
-    def scrape_england_team_links(self, url=None):
-        logger.info("Starting England Team Links scrape...")
-        scraper = EnglandTeamLinksScraper()
-        return scraper.scrape(url) if url else scraper.scrape()
-
-    def scrape_england_squads(self, url=None):
+    def scrape_england_squads(self, url=None, only_teams=None):
         logger.info("Starting England Squads scrape...")
-        return EnglandSquadsScraper().scrape()
+        return EnglandSquadsScraper().scrape(only_teams=only_teams)
 
     # --- SPAIN ---
     def scrape_spain_standings(self, url=None):
@@ -88,16 +82,10 @@ class ScraperManager:
         scraper = SpainFixturesScraper()
         return scraper.scrape(url, season=season)
         
-    def scrape_spain_squads(self, url=None):
-        # Auto-run link extractor first for reliability
-        logger.info("Ensuring Spain team links exist...")
-        try:
-            SpainTeamLinksScraper().scrape()
-        except Exception as e:
-            logger.warning(f"Warning: Link extraction failed: {e}")
-        
+    def scrape_spain_squads(self, url=None, only_teams=None):
+        # Team links come from the league table pass (see scrape_league_table)
         logger.info("Starting Spain Squads scrape...")
-        return SpainSquadsScraper().scrape()
+        return SpainSquadsScraper().scrape(only_teams=only_teams)
 
     # --- ITALY ---
     def scrape_italy_standings(self, url=None):
@@ -112,18 +100,12 @@ class ScraperManager:
         scraper = ItalyFixturesScraper()
         return scraper.scrape(url, season=season)
         
-    def scrape_italy_squads(self, url=None):
-        from scraper.countries.italy.team_links import ItalyTeamLinksScraper
+    def scrape_italy_squads(self, url=None, only_teams=None):
         from scraper.countries.italy.squads import ItalySquadsScraper
         
-        logger.info("Ensuring Italy team links exist...")
-        try:
-            ItalyTeamLinksScraper().scrape()
-        except Exception as e:
-            logger.warning(f"Warning: Link extraction failed: {e}")
-        
+        # Team links come from the league table pass (see scrape_league_table)
         logger.info("Starting Italy Squads scrape...")
-        return ItalySquadsScraper().scrape()
+        return ItalySquadsScraper().scrape(only_teams=only_teams)
 
     def scrape_bilyoner(self, url=None):
         from scraper.bilyoner import BilyonerScraper
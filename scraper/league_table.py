@@ -0,0 +1,150 @@
+import time
+import logging
+from scraper.base import BaseScraper
+
+logger = logging.getLogger('scraper')
+
+# Mackolik standings pages (same URLs the *StandingsScraper classes use)
+LEAGUE_TABLE_URLS = {
+    'turkey': "https://www.mackolik.com/puan-durumu/t%C3%BCrkiye-s%C3%BCper-lig/482ofyysbdbeoxauk19yg7tdt",
+    'england': "https://www.mackolik.com/puan-durumu/ingiltere-premier-lig/2kwbbcootiqqgmrzs6o5inle5",
+    'spain': "https://www.mackolik.com/puan-durumu/ispanya-laliga/34pl8szyvrbwcmfkuocjm3r6t",
+    'italy': "https://www.mackolik.com/puan-durumu/italya-serie-a/2025-2026/1r097lpxe0xn03ihb7wi98kao",
+}
+
+BASE_DOMAIN = "https://www.mackolik.com"
+
+# Single round-trip: finds the O/P standings table and returns every row's
+# cell texts plus the team link, instead of one locator call per cell.
+EXTRACT_TABLE_JS = """() => {
+    const tables = Array.from(document.querySelectorAll('table'));
+    let target = tables.find(t => {
+        const headers = Array.from(t.querySelectorAll('thead th')).map(h => h.innerText.trim());
+        return headers.includes('O') && headers.includes('P');
+    });
+    if (!target) target = tables[0];
+    if (!target) return [];
+    return Array.from(target.querySelectorAll('tbody tr')).map(tr => {
+        const link = tr.querySelector("a[href*='/takim/']");
+        return {
+            cells: Array.from(tr.querySelectorAll('td')).map(td => td.innerText.trim()),
+            href: link ? link.getAttribute('href') : null,
+            link_text: link ? link.innerText.trim() : null,
+        };
+    });
+}"""
+
+
+def parse_standings_row(text_cells):
+    """
+    Maps the cell texts of one Mackolik standings row to a standings dict.
+    Handles the 12-column layout and the 'ghost column' variant. Returns None for non-data rows.
+    """
+    if len(text_cells) < 8:
+        return None
+
+    rank = text_cells[0]
+    if len(text_cells) > 1 and (not text_cells[1] or text_cells[1].isdigit()):
+        team_idx = 2
+    else:
+        team_idx = 1
+    team_name = text_cells[team_idx]
+
+    if len(text_cells) == 12:
+        # 0: Rank, 1: Logo, 2: Team, 3: Played, 4: +/-, 5: Won, 6: Drawn, 7: Lost, 8: GF, 9: GA, 10: Avg, 11: Points
+        played, won, drawn, lost = text_cells[3], text_cells[5], text_cells[6], text_cells[7]
+        goals_for, goals_against, average, points = text_cells[8], text_cells[9], text_cells[10], text_cells[11]
+    elif len(text_cells) > team_idx + 8:
+        data_cells = text_cells[team_idx+1:]
+        if len(data_cells) == 9:
+            # Ghost column at [1]
+            played, won, drawn, lost = data_cells[0], data_cells[2], data_cells[3], data_cells[4]
+            goals_for, goals_against, average, points = data_cells[5], data_cells[6], data_cells[7], data_cells[8]
+        else:
+            played, won, drawn, lost = data_cells[0], data_cells[1], data_cells[2], data_cells[3]
+            goals_for, goals_against, average, points = data_cells[4], data_cells[5], data_cells[6], data_cells[7]
+    else:
+        return None
+
+    return {
+        "rank": rank,
+        "team": team_name,
+        "played": played,
+        "won": won,
+        "drawn": drawn,
+        "lost": lost,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "average": average,
+        "points": points
+    }
+
+
+def squad_url_from_href(raw_href):
+    """
+    /takim/{slug}/{id} (or /takim/{slug}/section/{id}) -> https://www.mackolik.com/takim/{slug}/kadro/{id}
+    """
+    if not raw_href:
+        return None
+    parts = raw_href.strip('/').split('/')
+    if 'takim' not in parts:
+        return None
+    takim_idx = parts.index('takim')
+    if len(parts) <= takim_idx + 1:
+        return None
+    slug = parts[takim_idx + 1]
+    team_id = parts[-1]
+    if not team_id or team_id == slug:
+        return None
+    return f"{BASE_DOMAIN}/takim/{slug}/kadro/{team_id}"
+
+
+class LeagueTableScraper(BaseScraper):
+    """
+    One navigation + one extraction of a Mackolik standings page.
+    Returns standings rows and team squad links together, replacing the
+    separate *StandingsScraper and *TeamLinksScraper visits of the same URL.
+    """
+    def scrape(self, country, url=None):
+        url = url or LEAGUE_TABLE_URLS.get(country)
+        result = {"standings": [], "team_links": []}
+        if not url:
+            logger.error(f"No league table URL for {country}")
+            return result
+
+        try:
+            self.start_browser()
+            self.navigate(url)
+
+            # Anti-popup
+            try:
+                self.page.add_style_tag(content="iframe, .ads-footer, div[class*='sticky'] { display: none !important; }")
+            except: pass
+
+            time.sleep(3)
+            self.page.wait_for_selector("table tbody tr td", timeout=30000)
+
+            rows = self.page.evaluate(EXTRACT_TABLE_JS)
+            logger.info(f"League table {country}: {len(rows)} rows extracted")
+
+            seen_links = set()
+            for i, row in enumerate(rows):
+                try:
+                    standing = parse_standings_row(row['cells'])
+                    if standing:
+                        result["standings"].append(standing)
+
+                    squad_url = squad_url_from_href(row.get('href'))
+                    if squad_url and squad_url not in seen_links:
+                        seen_links.add(squad_url)
+                        team_name = (standing or {}).get("team") or row.get('link_text') or ""
+                        result["team_links"].append({"team": team_name, "url": squad_url})
+                except Exception as row_e:
+                    logger.warning(f"League table row {i} parse error: {row_e}")
+
+        except Exception as e:
+            logger.error(f"Error in LeagueTableScraper ({country}): {e}")
+        finally:
+            self.close_browser()
+
+        return result
@@ -0,0 +1,97 @@
+"""
+Django-free location of scraper snapshots (team links, squad JSON).
+SCRAPER_DATA_DIR overrides the default <repo>/data folder.
+"""
+import os
+import re
+import json
+
+DATA_DIR = os.getenv('SCRAPER_DATA_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'
+)
+
+
+# iter_json_items: longest single item read before a file is treated as malformed
+MAX_ITEM_SIZE = 16 << 20
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_START = frozenset('-0123456789')
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+def data_path(filename):
+    return os.path.join(DATA_DIR, filename)
+
+
+def team_links_path(country):
+    return data_path(f"{country}_team_links.json")
+
+
+def save_json(filename, data, folder=None):
+    """
+    Writes `data` as pretty JSON under `folder` (default DATA_DIR) and returns the path.
+    """
+    folder = folder or DATA_DIR
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    return path
+
+
+def load_json(filename, default=None):
+    path = data_path(filename)
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_json_items(path, chunk_size=1 << 16, max_item_size=MAX_ITEM_SIZE):
+    """
+    Yields the items of a file holding one top-level JSON array, one at a time
+    (JSONDecoder.raw_decode at an offset into a buffer that is only compacted when
+    more is read), so memory stays bounded by the chunk size plus the largest item
+    instead of the whole file. An item still incomplete after `max_item_size`
+    characters raises ValueError (malformed file) instead of being re-parsed forever.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buffer, idx, eof, started = "", 0, False, False
+        # What may come next inside the array: 'first' (value or ']'), 'value' (after ','), 'separator' (',' or ']')
+        expect = 'first'
+        while True:
+            idx = _WHITESPACE.match(buffer, idx).end()
+            if idx < len(buffer):
+                char = buffer[idx]
+                if not started:
+                    if char != '[':
+                        raise ValueError(f"{path}: expected a JSON array")
+                    idx, started = idx + 1, True
+                    continue
+                if char == ']' and expect != 'value':
+                    return
+                if char == ',' and expect == 'separator':
+                    idx, expect = idx + 1, 'value'
+                    continue
+                if expect == 'separator':
+                    raise ValueError(f"{path}: expected ',' or ']' after an array item")
+                if char in '],':
+                    raise ValueError(f"{path}: expected an array item, got {char!r}")
+                try:
+                    item, end = decoder.raw_decode(buffer, idx)
+                except json.JSONDecodeError:
+                    end = None
+                # A number may be cut anywhere ('3.' of '3.5e2'): take it once a character that
+                # cannot continue it follows, or at the end of the file
+                if end is not None and (eof or end < len(buffer) and not (
+                        char in _NUMBER_START and buffer[end] in _NUMBER_CHARS)):
+                    yield item
+                    idx, expect = end, 'separator'
+                    continue
+                if len(buffer) - idx > max_item_size:
+                    raise ValueError(f"{path}: item larger than {max_item_size} characters (malformed JSON?)")
+            if eof:
+                raise ValueError(f"{path}: invalid or truncated JSON array")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, idx = buffer[idx:] + chunk, 0
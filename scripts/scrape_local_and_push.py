@@ -1,5 +1,4 @@
 
-import requests
 import json
 import logging
 import sys
@@ -10,14 +9,15 @@ sys.path.append(os.path.join(os.getcwd(), 'web_app'))
 
 try:
     from web_app.scraper.bilyoner import BilyonerScraper
+    from web_app.scraper.bulletin_sync import push_bulletin_delta, SyncError
 except ImportError:
     print("Please run this script from the root c:\\Code\\web_scraper_0 folder")
     print("Example: python scripts/scrape_local_and_push.py")
     sys.exit(1)
 
 # CONFIGURATION
-REMOTE_API_URL = "http://YOUR_AWS_IP_OR_DOMAIN/analysis/api/push-bulletin/" 
-# OR "http://localhost:8000/analysis/api/push-bulletin/" for testing
+REMOTE_API_URL = "http://YOUR_AWS_IP_OR_DOMAIN" 
+# OR "http://localhost:8000" for testing
 SECRET = "WFM_PRO_2026_SECURE_SYNC"
 
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +25,6 @@ logger = logging.getLogger('local_pusher')
 
 def main():
     print("--- HYBRID SCRAPER: LOCAL TO REMOTE ---")
-    print(f"DEBUG LOGS: {os.path.abspath('scraper_debug.log')}")
     print(f"Target API: {REMOTE_API_URL}")
     
     # 1. Scrape Locally (Using your home IP which is trusted)
@@ -39,12 +38,7 @@ def main():
 
     print(f"Captured {len(matches)} matches.")
     
-    # 2. Push to Remote Server
-    payload = {
-        "secret": SECRET,
-        "matches": matches
-    }
-    
+    # 2. Push to Remote Server (delta sync: only new/changed/removed matches are sent, gzip)
     print(" pushing to server...")
     try:
         # Check if user updated the URL
@@ -52,17 +46,13 @@ def main():
              print("ERROR: Please edit this script and update REMOTE_API_URL with your actual AWS domain/IP!")
              return
 
-        response = requests.post(REMOTE_API_URL, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            res_json = response.json()
-            if res_json.get("success"):
-                print(f"SUCCESS! Server saved {res_json.get('count')} matches.")
-            else:
-                print(f"Server Error: {res_json.get('error')}")
-        else:
-            print(f"HTTP Error: {response.status_code} - {response.text}")
-            
+        result = push_bulletin_delta(REMOTE_API_URL, matches, SECRET, timeout=30)
+        print(f"SUCCESS! Server bulletin v{result.get('version')}: "
+              f"{result.get('inserted', 0)} new, {result.get('changed', 0)} changed, "
+              f"{result.get('removed', 0)} removed, {result.get('unchanged', 0)} unchanged "
+              f"({result.get('timings', {}).get('total_ms', 0)} ms)")
+    except SyncError as e:
+        print(f"Server Error: {e}")
     except Exception as e:
         print(f"Network Error: {e}")
 